@@ -0,0 +1,117 @@
+"""Benchmark: response serialization, FastAPI default vs FastJSONRoute.
+
+Compares the two ways a handler result becomes a response body:
+
+- default: jsonable_encoder followed by JSONResponse (stdlib json), which is
+           what FastAPI does for every plain dict/list result
+- fast:    FastJSONResponse (orjson), which FastJSONRoute uses directly
+
+Payloads are built from the seed catalog: the full /exercises list, the
+list-view projection the app requests, and /workouts and /plans responses
+shaped like real ones. No database needed:
+
+    python benchmarks/json_serialization.py
+"""
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+import server  # noqa: E402
+
+MIN_SECONDS = 1.0
+LIST_VIEW_FIELDS = "name,category,difficulty,muscle_groups,is_rehabilitation"
+
+
+def make_workouts(count):
+    now = datetime.now(timezone.utc)
+    exercise_ids = [ex["id"] for ex in server.SEED_EXERCISES]
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": "bench-user",
+            "plan_id": None,
+            "date": (now - timedelta(days=i)).strftime("%Y-%m-%d"),
+            "exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "sets_completed": random.randint(2, 5),
+                    "reps_completed": random.randint(6, 15),
+                    "weight_used": random.choice([None, random.randint(10, 120)])
+                }
+                for exercise_id in random.sample(exercise_ids, 5)
+            ],
+            "duration_minutes": random.randint(20, 90),
+            "notes": None,
+            "created_at": now.isoformat()
+        }
+        for i in range(count)
+    ]
+
+
+def make_plans(count):
+    exercise_ids = [ex["id"] for ex in server.SEED_EXERCISES]
+    return [
+        server.TrainingPlan(
+            user_id="bench-user",
+            name=f"Plan {i}",
+            description="Benchmark plan",
+            goal="muscle_gain",
+            exercises=[
+                server.WorkoutExercise(exercise_id=exercise_id, sets=3, reps=10)
+                for exercise_id in random.sample(exercise_ids, 8)
+            ],
+        ).model_dump()
+        for i in range(count)
+    ]
+
+
+def default_render(payload):
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast_render(payload):
+    return server.FastJSONResponse(payload).body
+
+
+def throughput(render, payload):
+    """Renders per second, measured for at least MIN_SECONDS"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        render(payload)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return count / elapsed
+
+
+def main():
+    random.seed(42)
+    keys = server.exercise_view_keys(LIST_VIEW_FIELDS, "de")
+    payloads = {
+        "/exercises": server.SEED_EXERCISES,
+        "/exercises list view": [{key: ex[key] for key in keys if key in ex} for ex in server.SEED_EXERCISES],
+        "/workouts (50)": make_workouts(50),
+        "/plans (100)": make_plans(100),
+    }
+
+    print(f"{'payload':<22}  {'bytes':>7}  {'default/s':>10}  {'fast/s':>10}  {'speedup':>7}")
+    for name, payload in payloads.items():
+        assert server.orjson.loads(fast_render(payload)) == server.json.loads(default_render(payload))
+        default = throughput(default_render, payload)
+        fast = throughput(fast_render, payload)
+        print(f"{name:<22}  {len(fast_render(payload)):>7}  {default:>10.0f}  {fast:>10.0f}  {fast / default:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
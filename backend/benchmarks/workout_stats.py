@@ -0,0 +1,182 @@
+"""Benchmark: workout stats and exercise progress, Python loops vs MongoDB.
+
+Compares three ways each of answering /workouts/stats and
+/progress/exercise/{id} for a single user with 100, 1k and 10k logged workouts:
+
+- python:      fetch every workout and compute in Python (the original handlers)
+- aggregate:   workout_stats_pipeline / exercise_progress_pipeline in MongoDB
+- incremental: the per-user workout_stats document maintained by log_workout
+- collection:  the exercise_progress range query
+
+Needs a running MongoDB. Data goes into a scratch database that is dropped
+afterwards:
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/workout_stats.py
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+
+import server  # noqa: E402
+
+BENCH_DB_NAME = os.environ.get('BENCH_DB_NAME', 'fitgym_benchmark')
+SIZES = (100, 1000, 10000)
+ROUNDS = 20
+USER_ID = "bench-user"
+EXERCISE_IDS = ["bench-press", "squat", "deadlift", "lat-pulldown", "plank", "lunges", "rowing-machine"]
+
+
+def python_stats(workouts):
+    """The original /workouts/stats computation"""
+    if not workouts:
+        return server.empty_workout_stats()
+
+    now = datetime.now(timezone.utc)
+    week_ago = now - timedelta(days=7)
+    month_ago = now - timedelta(days=30)
+
+    total_duration = sum(w.get("duration_minutes", 0) for w in workouts)
+    workouts_this_week = len([w for w in workouts if w.get("date", "") >= week_ago.strftime("%Y-%m-%d")])
+    workouts_this_month = len([w for w in workouts if w.get("date", "") >= month_ago.strftime("%Y-%m-%d")])
+
+    dates = sorted(set(w.get("date", "")[:10] for w in workouts), reverse=True)
+    streak = 0
+    for i, date in enumerate(dates):
+        if date == (now - timedelta(days=i)).strftime("%Y-%m-%d"):
+            streak += 1
+        else:
+            break
+
+    progress_data = []
+    for i in range(30):
+        date = (now - timedelta(days=29-i)).strftime("%Y-%m-%d")
+        day_workouts = [w for w in workouts if w.get("date", "").startswith(date)]
+        progress_data.append({
+            "date": date,
+            "workouts": len(day_workouts),
+            "duration": sum(w.get("duration_minutes", 0) for w in day_workouts)
+        })
+
+    return {
+        "total_workouts": len(workouts),
+        "total_duration_minutes": total_duration,
+        "workouts_this_week": workouts_this_week,
+        "workouts_this_month": workouts_this_month,
+        "streak_days": streak,
+        "progress_data": progress_data
+    }
+
+
+def python_progress(workouts, exercise_id):
+    """The original /progress/exercise/{id} computation"""
+    progress = []
+    for workout in workouts:
+        for ex in workout.get("exercises", []):
+            if ex.get("exercise_id") == exercise_id:
+                progress.append({
+                    "date": workout.get("date"),
+                    "weight": ex.get("weight_used"),
+                    "sets": ex.get("sets_completed"),
+                    "reps": ex.get("reps_completed")
+                })
+    progress.sort(key=lambda x: x["date"])
+    return progress
+
+
+def make_workouts(count):
+    now = datetime.now(timezone.utc)
+    workouts = []
+    for _ in range(count):
+        workouts.append({
+            "id": str(uuid.uuid4()),
+            "user_id": USER_ID,
+            "plan_id": None,
+            "date": (now - timedelta(days=random.randint(0, 3 * 365))).strftime("%Y-%m-%d"),
+            "exercises": [
+                {
+                    "exercise_id": exercise_id,
+                    "sets_completed": random.randint(2, 5),
+                    "reps_completed": random.randint(6, 15),
+                    "weight_used": random.choice([None, random.randint(10, 120)])
+                }
+                for exercise_id in random.sample(EXERCISE_IDS, random.randint(3, 6))
+            ],
+            "duration_minutes": random.randint(20, 90),
+            "notes": None,
+            "created_at": now.isoformat()
+        })
+    return workouts
+
+
+async def timed(fn):
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    random.seed(42)
+    bench_db = server.client[BENCH_DB_NAME]
+    server.db = bench_db
+    await server.ensure_indexes()
+
+    print(f"{'logs':>6}  {'stats python':>13}  {'stats aggregate':>15}  {'stats incremental':>17}  "
+          f"{'progress python':>15}  {'progress aggregate':>18}  {'progress collection':>19}"
+          f"   (median ms over {ROUNDS} rounds)")
+    try:
+        for size in SIZES:
+            await bench_db.workout_logs.delete_many({})
+            await bench_db.workout_logs.insert_many(make_workouts(size))
+            await server.rebuild_workout_stats(USER_ID)
+            await server.rebuild_exercise_progress(USER_ID)
+
+            async def stats_python():
+                workouts = await bench_db.workout_logs.find({"user_id": USER_ID}, {"_id": 0}).to_list(None)
+                return python_stats(workouts)
+
+            async def stats_incremental():
+                user = {"id": USER_ID}
+                return await server.get_workout_stats(user)
+
+            async def progress_python():
+                workouts = await bench_db.workout_logs.find({"user_id": USER_ID}, {"_id": 0}).to_list(None)
+                return python_progress(workouts, "squat")
+
+            async def progress_aggregate():
+                pipeline = server.exercise_progress_pipeline(USER_ID, "squat")
+                return await bench_db.workout_logs.aggregate(pipeline).to_list(None)
+
+            async def progress_collection():
+                user = {"id": USER_ID}
+                return await server.get_exercise_progress(
+                    "squat", user, from_date=None, to_date=None, limit=None, bucket=None
+                )
+
+            results = [
+                await timed(stats_python),
+                await timed(lambda: server.aggregate_workout_stats(USER_ID)),
+                await timed(stats_incremental),
+                await timed(progress_python),
+                await timed(progress_aggregate),
+                await timed(progress_collection),
+            ]
+            print(f"{size:>6}  {results[0]:>13.2f}  {results[1]:>15.2f}  {results[2]:>17.2f}  "
+                  f"{results[3]:>15.2f}  {results[4]:>18.2f}  {results[5]:>19.2f}")
+    finally:
+        await server.client.drop_database(BENCH_DB_NAME)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
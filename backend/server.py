@@ -1,18 +1,49 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, BackgroundTasks, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from bson import ObjectId
 import os
+import sys
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, EmailStr, ValidationError
+from typing import List, Optional, Dict, Any, AsyncIterator, Callable
 import uuid
+import time
+import json
+import hashlib
+import bisect
+import itertools
+import re
+import argparse
+import functools
+import inspect
+import base64
+import codecs
+import contextlib
+import csv
+import io
+import gzip
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 import bcrypt
 import jwt
-from openai import OpenAI
+import numpy as np
+import orjson
+from openai import AsyncOpenAI
+
+try:
+    import brotli
+except ImportError:  # optional, responses fall back to gzip
+    brotli = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -27,9 +58,54 @@ JWT_SECRET = os.environ.get('JWT_SECRET', 'fitgym-secret-key-2024')
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 168  # 7 days
 
+# Password Hashing Configuration
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR', 'thread')  # thread or process
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '4'))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', '200'))  # 0 = unbounded
+
+# Cache Configuration
+CATALOG_VERSION_KEY = "exercise_catalog"
+USERS_VERSION_KEY = "users"
+CACHE_VERSION_POLL_SECONDS = float(os.environ.get('CACHE_VERSION_POLL_SECONDS', '30'))
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '10000'))
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '30'))
+PLAN_CACHE_SIZE = int(os.environ.get('PLAN_CACHE_SIZE', '512'))
+PLAN_CACHE_TTL_SECONDS = int(os.environ.get('PLAN_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+CATALOG_VIEW_CACHE_SIZE = int(os.environ.get('CATALOG_VIEW_CACHE_SIZE', '32'))
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '256'))
+RESPONSE_COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+
+# Workout Statistics Configuration
+WORKOUT_STATS_SOURCE = os.environ.get('WORKOUT_STATS_SOURCE', 'incremental')  # incremental or aggregate
+WORKOUT_PAGE_MAX_LIMIT = int(os.environ.get('WORKOUT_PAGE_MAX_LIMIT', '500'))
+
+# Bulk Import/Export Configuration
+WORKOUT_IMPORT_BATCH_SIZE = int(os.environ.get('WORKOUT_IMPORT_BATCH_SIZE', '500'))
+WORKOUT_IMPORT_MAX_ENTRIES = int(os.environ.get('WORKOUT_IMPORT_MAX_ENTRIES', '50000'))
+WORKOUT_IMPORT_MAX_ENTRY_CHARS = int(os.environ.get('WORKOUT_IMPORT_MAX_ENTRY_CHARS', '100000'))
+WORKOUT_EXPORT_BATCH_SIZE = int(os.environ.get('WORKOUT_EXPORT_BATCH_SIZE', '200'))
+
+# Plan Job Queue Configuration
+PLAN_JOB_WORKERS = int(os.environ.get('PLAN_JOB_WORKERS', '2'))
+PLAN_JOB_LEASE_SECONDS = float(os.environ.get('PLAN_JOB_LEASE_SECONDS', '60'))
+PLAN_JOB_MAX_ATTEMPTS = int(os.environ.get('PLAN_JOB_MAX_ATTEMPTS', '3'))
+PLAN_JOB_POLL_SECONDS = float(os.environ.get('PLAN_JOB_POLL_SECONDS', '1'))
+PLAN_JOB_MAX_WAIT_SECONDS = float(os.environ.get('PLAN_JOB_MAX_WAIT_SECONDS', '25'))  # below the app's 30 s timeout
+PLAN_JOB_TTL_SECONDS = int(os.environ.get('PLAN_JOB_TTL_SECONDS', str(7 * 24 * 3600)))
+
+# Plan Hedging Configuration
+PLAN_HEDGE_SLO_SECONDS = float(os.environ.get('PLAN_HEDGE_SLO_SECONDS', '3'))
+
 # OpenAI Configuration
 EMERGENT_LLM_KEY = "sk-emergent-543338e18E701109a5"
 INTEGRATION_PROXY_URL = os.environ.get('INTEGRATION_PROXY_URL', 'https://integrations.emergentagent.com')
+LLM_TIMEOUT_SECONDS = float(os.environ.get('LLM_TIMEOUT_SECONDS', '20'))
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '4'))
+LLM_BREAKER_FAILURES = int(os.environ.get('LLM_BREAKER_FAILURES', '3'))
+LLM_BREAKER_RESET_SECONDS = float(os.environ.get('LLM_BREAKER_RESET_SECONDS', '30'))
+LLM_CONTEXT_TOKEN_BUDGET = int(os.environ.get('LLM_CONTEXT_TOKEN_BUDGET', '1000'))  # catalog part of the plan prompt
+LLM_CONTEXT_CACHE_SIZE = int(os.environ.get('LLM_CONTEXT_CACHE_SIZE', '256'))
 
 # Initialize OpenAI client - will be used with proper integration
 openai_client = None
@@ -37,14 +113,71 @@ openai_client = None
 def get_openai_client():
     global openai_client
     if openai_client is None:
-        openai_client = OpenAI(
+        # Deadlines and retries are handled by the LLM gateway
+        openai_client = AsyncOpenAI(
             api_key=EMERGENT_LLM_KEY,
-            base_url=f"{INTEGRATION_PROXY_URL}/openai/v1"
+            base_url=f"{INTEGRATION_PROXY_URL}/openai/v1",
+            timeout=LLM_TIMEOUT_SECONDS,
+            max_retries=0
         )
     return openai_client
 
-app = FastAPI(title="FitGym API", version="1.0.0")
-api_router = APIRouter(prefix="/api")
+def _json_default(value):
+    # Types orjson does not know; Mongo documents may still carry an ObjectId
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dump_json(content: Any) -> bytes:
+    return orjson.dumps(
+        content, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+class FastJSONRoute(APIRoute):
+    """Sends plain dict/list results straight to FastJSONResponse.
+
+    FastAPI otherwise walks every result with jsonable_encoder before
+    rendering it, which for list endpoints costs as much as the rendering.
+    Routes with a response_model keep FastAPI's validation path. Status
+    and headers set on an injected Response (by the endpoint or one of its
+    dependencies) are merged the way FastAPI does it.
+    """
+
+    def get_route_handler(self):
+        endpoint = self.dependant.call
+        if self.response_model is None and asyncio.iscoroutinefunction(endpoint):
+            status_code = self.status_code
+            endpoint_takes_response = self.dependant.response_param_name is not None
+            if not endpoint_takes_response:
+                # Have FastAPI pass the sub-response that dependencies may have written to
+                self.dependant.response_param_name = "_fast_json_sub_response"
+            response_param = self.dependant.response_param_name
+
+            @functools.wraps(endpoint)
+            async def fast_endpoint(**kwargs):
+                sub_response = kwargs[response_param] if endpoint_takes_response else kwargs.pop(response_param)
+                result = await endpoint(**kwargs)
+                if isinstance(result, (dict, list)):
+                    response = FastJSONResponse(result, status_code=sub_response.status_code or status_code or 200)
+                    response.headers.raw.extend(sub_response.headers.raw)
+                    return response
+                return result
+
+            self.dependant.call = fast_endpoint
+        return super().get_route_handler()
+
+app = FastAPI(title="FitGym API", version="1.0.0", default_response_class=FastJSONResponse)
+api_router = APIRouter(prefix="/api", route_class=FastJSONRoute)
 security = HTTPBearer()
 
 # Configure logging
@@ -141,13 +274,388 @@ class AITrainingPlanRequest(BaseModel):
     duration_weeks: int = 4
     focus_areas: Optional[List[str]] = None  # specific muscle groups or areas
 
+# ============== DATABASE INDEXES ==============
+
+# Every query the API runs must be served by one of these
+INDEX_SPECS = {
+    "users": [
+        {"keys": [("email", ASCENDING)], "name": "email_unique", "unique": True},
+        {"keys": [("id", ASCENDING)], "name": "id_unique", "unique": True},
+    ],
+    "exercises": [
+        {"keys": [("id", ASCENDING)], "name": "id_unique", "unique": True},
+    ],
+    "training_plans": [
+        {"keys": [("id", ASCENDING)], "name": "id_unique", "unique": True},
+        {"keys": [("user_id", ASCENDING), ("created_at", DESCENDING)], "name": "user_created"},
+    ],
+    "workout_logs": [
+        {"keys": [("id", ASCENDING)], "name": "id_unique", "unique": True},
+        # Keyset pagination order for GET /workouts; the user_id+date prefix serves the rest
+        {"keys": [("user_id", ASCENDING), ("date", DESCENDING), ("id", DESCENDING)], "name": "user_date_id"},
+    ],
+    "exercise_progress": [
+        # logged_at keeps entries of one day in logging order; the trailing
+        # fields make the progress query covered by the index
+        {
+            "keys": [
+                ("user_id", ASCENDING), ("exercise_id", ASCENDING), ("date", ASCENDING), ("logged_at", ASCENDING),
+                ("weight", ASCENDING), ("sets", ASCENDING), ("reps", ASCENDING)
+            ],
+            "name": "user_exercise_date_logged",
+            "replaces": "user_exercise_date"
+        },
+    ],
+    "workout_stats": [
+        {"keys": [("user_id", ASCENDING)], "name": "user_unique", "unique": True},
+    ],
+    "progress_backfills": [
+        {"keys": [("user_id", ASCENDING)], "name": "user_unique", "unique": True},
+    ],
+    "plan_cache": [
+        {"keys": [("created_at", ASCENDING)], "name": "created_ttl", "expireAfterSeconds": PLAN_CACHE_TTL_SECONDS},
+    ],
+    "plan_jobs": [
+        {"keys": [("id", ASCENDING)], "name": "id_unique", "unique": True},
+        {"keys": [("status", ASCENDING), ("created_at", ASCENDING)], "name": "status_created"},
+        {"keys": [("finished_at", ASCENDING)], "name": "finished_ttl", "expireAfterSeconds": PLAN_JOB_TTL_SECONDS},
+    ],
+}
+
+# Representative query shapes, explained at startup to catch collection scans
+QUERY_SHAPES = [
+    {"collection": "users", "filter": {"email": "audit@example.com"}},
+    {"collection": "users", "filter": {"id": "audit"}},
+    {"collection": "exercises", "filter": {"id": "audit"}},
+    {"collection": "training_plans", "filter": {"user_id": "audit"}},
+    {"collection": "training_plans", "filter": {"id": "audit", "user_id": "audit"}},
+    {"collection": "workout_logs", "filter": {"user_id": "audit"}, "sort": [("date", DESCENDING), ("id", DESCENDING)]},
+    {"collection": "workout_stats", "filter": {"user_id": "audit"}},
+    {"collection": "exercise_progress", "filter": {"user_id": "audit", "exercise_id": "audit"}, "sort": [("date", ASCENDING), ("logged_at", ASCENDING)]},
+    {"collection": "progress_backfills", "filter": {"user_id": "audit"}},
+    {"collection": "plan_jobs", "filter": {"status": "queued"}, "sort": [("created_at", ASCENDING)]},
+]
+
+def _missing_indexes(collection: str, existing: dict) -> List[dict]:
+    existing_keys = {tuple(tuple(k) for k in info["key"]) for info in existing.values()}
+    return [spec for spec in INDEX_SPECS[collection] if tuple(spec["keys"]) not in existing_keys]
+
+def _plan_stages(plan) -> List[str]:
+    if isinstance(plan, dict):
+        stages = [plan["stage"]] if "stage" in plan else []
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+        return stages
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in _plan_stages(item)]
+    return []
+
+async def ensure_indexes():
+    """Idempotently create all indexes in INDEX_SPECS and drop the ones they replace"""
+    for collection, specs in INDEX_SPECS.items():
+        existing = await db[collection].index_information()
+        for spec in specs:
+            options = {k: v for k, v in spec.items() if k not in ("keys", "replaces")}
+            try:
+                await db[collection].create_index(spec["keys"], **options)
+                if spec.get("replaces") in existing:
+                    await db[collection].drop_index(spec["replaces"])
+            except OperationFailure as e:
+                logger.error(f"Could not create index {collection}.{spec['name']}: {str(e)}")
+
+async def audit_query_plans() -> List[dict]:
+    """Explain the known query shapes and report those not served by an index"""
+    uncovered = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        explain = await cursor.explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        if "COLLSCAN" in stages or "SORT" in stages:
+            uncovered.append({
+                "collection": shape["collection"],
+                "filter": list(shape["filter"].keys()),
+                "sort": [k for k, _ in shape.get("sort", [])],
+                "stages": stages
+            })
+            logger.warning(f"Query on {shape['collection']} {list(shape['filter'].keys())} is not covered by an index: {stages}")
+    return uncovered
+
+async def bootstrap_indexes():
+    try:
+        await ensure_indexes()
+        await audit_query_plans()
+    except Exception as e:
+        logger.error(f"Index bootstrap failed: {str(e)}")
+
+# ============== CACHING HELPERS ==============
+
+class LRUCache:
+    """Size-bounded LRU mapping with an optional per-entry TTL"""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] < time.monotonic():
+            del self._data[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+def _etag_values(header: Optional[str]) -> set:
+    # Weak validators still match for If-None-Match (RFC 9110 weak comparison)
+    values = set()
+    for tag in (header or "").split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            values.add(tag)
+    return values
+
+def _accepted_encodings(header: Optional[str]) -> set:
+    encodings = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        params = params.strip().lower()
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            quality = 1.0
+        if coding and quality > 0:
+            encodings.add(coding)
+    return encodings
+
+class RenderedResponse:
+    """JSON body serialized once, with its ETag and precomputed compressed variants.
+
+    Uses the same serializer as FastJSONResponse so cached and uncached bodies
+    are byte-identical. Each content-coding gets its own strong ETag.
+    """
+
+    def __init__(self, content: Any):
+        self.body = dump_json(content)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.variants = {"identity": (self.body, f'"{digest}"')}
+        if len(self.body) >= RESPONSE_COMPRESS_MIN_BYTES:
+            self.variants["gzip"] = (gzip.compress(self.body, compresslevel=9, mtime=0), f'"{digest}-gzip"')
+            if brotli is not None:
+                self.variants["br"] = (brotli.compress(self.body), f'"{digest}-br"')
+
+    def to_response(self, request: Request) -> Response:
+        accepted = _accepted_encodings(request.headers.get("accept-encoding"))
+        encoding = next((e for e in ("br", "gzip") if e in self.variants and e in accepted), "identity")
+        body, etag = self.variants[encoding]
+        headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = _etag_values(request.headers.get("if-none-match"))
+        if "*" in if_none_match or any(tag in if_none_match for _, tag in self.variants.values()):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+class ResponseCache:
+    """Rendered responses keyed by endpoint and normalized query parameters"""
+
+    def __init__(self, maxsize: int):
+        self.entries = LRUCache(maxsize)
+
+    def render(self, key, build) -> RenderedResponse:
+        rendered = self.entries.get(key)
+        if rendered is None:
+            rendered = RenderedResponse(build())
+            self.entries.set(key, rendered)
+        return rendered
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return self.entries.stats()
+
+catalog_responses = ResponseCache(RESPONSE_CACHE_SIZE)
+
+# ============== REQUEST COALESCING ==============
+
+class SingleFlight:
+    """Runs concurrent identical calls once and gives every caller the result.
+
+    The shared call is its own task and callers wait on it through
+    asyncio.shield, so a caller that goes away (client disconnect) neither
+    cancels it for the others nor cuts a plan insert short.
+    """
+
+    def __init__(self):
+        self._calls: Dict[tuple, asyncio.Task] = {}
+        self.endpoints: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, key: tuple, call: Callable):
+        counters = self.endpoints.setdefault(key[0], {"calls": 0, "executions": 0, "coalesced": 0})
+        counters["calls"] += 1
+        task = self._calls.get(key)
+        if task is None:
+            counters["executions"] += 1
+            task = asyncio.create_task(call())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # marks it retrieved in case every caller went away
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "endpoints": self.endpoints}
+
+request_coalescer = SingleFlight()
+
+def _coalescing_params_key(params: dict) -> bytes:
+    """Canonical form of the call parameters (key order and model defaults don't matter)"""
+    normalized = {name: value.model_dump() if isinstance(value, BaseModel) else value for name, value in params.items()}
+    return orjson.dumps(normalized, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+def single_flight(endpoint: str, unless: Optional[Callable[[dict], bool]] = None):
+    """Route opt-in for request coalescing, keyed by (endpoint, user, params).
+
+    Goes between the route decorator and the function; the signature FastAPI
+    sees is unchanged. `unless` gets the bound parameters and can exclude
+    calls whose result cannot be shared (e.g. a streaming response).
+    """
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            params = dict(signature.bind(*args, **kwargs).arguments)
+            if unless is not None and unless(params):
+                return await fn(*args, **kwargs)
+            user = params.pop("user", None) or {}
+            key = (endpoint, user.get("id"), _coalescing_params_key(params))
+            return await request_coalescer.do(key, lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorate
+
 # ============== AUTH HELPERS ==============
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# Module level so they can be pickled into a process pool
+def _bcrypt_hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+def _bcrypt_check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded executor.
+
+    bcrypt takes tens of milliseconds per call; running it inline stalls every
+    request on the worker. Callers beyond the pool size wait in a queue whose
+    depth is reported on /admin/metrics; once the queue is full new callers
+    get a 503 instead of piling up.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.waiting = 0
+        self.running = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(workers)
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                # bcrypt releases the GIL, so threads hash in parallel
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self.max_queue and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server ausgelastet, bitte später erneut versuchen")
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "running": self.running,
+            "queue_depth": self.waiting,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+password_hasher = PasswordHasher(PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+async def hash_password(password: str) -> str:
+    hashed = await password_hasher.run(_bcrypt_hash, password.encode('utf-8'), BCRYPT_ROUNDS)
+    return hashed.decode('utf-8')
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await password_hasher.run(_bcrypt_check, password.encode('utf-8'), hashed.encode('utf-8'))
+
+def password_needs_rehash(hashed: str) -> bool:
+    # bcrypt hashes look like $2b$<rounds>$<salt+hash>
+    try:
+        return int(hashed.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+async def rehash_password(user_id: str, password: str, old_hash: str):
+    """Upgrade a stored hash to the configured work factor after a successful login"""
+    new_hash = await hash_password(password)
+    # Only replace the hash we verified, in case the password changed meanwhile
+    await db.users.update_one({"id": user_id, "password": old_hash}, {"$set": {"password": new_hash}})
 
 def create_token(user_id: str, email: str) -> str:
     payload = {
@@ -157,12 +665,55 @@ def create_token(user_id: str, email: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+# Fields handlers read from the current user; never the password hash
+USER_CONTEXT_PROJECTION = {"_id": 0, "id": 1, "email": 1, "name": 1, "profile": 1, "anamnesis": 1, "created_at": 1}
+
+class UserContextCache:
+    """Short-lived cache of authenticated users, keyed by user id.
+
+    Writers call invalidate(), which drops the local entry and bumps the shared
+    `users` stamp in `cache_versions`; other workers clear their cache when
+    they see the stamp move. The TTL bounds staleness between polls.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = LRUCache(maxsize, ttl)
+        self.version: Optional[int] = None
+
+    async def invalidate(self, user_id: str):
+        self.entries.pop(user_id)
+        doc = await db.cache_versions.find_one_and_update(
+            {"_id": USERS_VERSION_KEY},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        # Somebody else bumped in between: we can't tell whom they invalidated
+        if self.version is not None and doc["version"] != self.version + 1:
+            self.entries.clear()
+        self.version = doc["version"]
+
+    async def refresh_if_stale(self):
+        doc = await db.cache_versions.find_one({"_id": USERS_VERSION_KEY})
+        version = doc["version"] if doc else 0
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def stats(self) -> dict:
+        return {**self.entries.stats(), "version": self.version}
+
+user_cache = UserContextCache(USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user = await db.users.find_one({"id": payload["user_id"]})
-        if not user:
-            raise HTTPException(status_code=401, detail="Benutzer nicht gefunden")
+        user = user_cache.entries.get(payload["user_id"])
+        if user is None:
+            user = await db.users.find_one({"id": payload["user_id"]}, USER_CONTEXT_PROJECTION)
+            if not user:
+                raise HTTPException(status_code=401, detail="Benutzer nicht gefunden")
+            user_cache.entries.set(user["id"], user)
         return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token abgelaufen")
@@ -182,7 +733,7 @@ async def register(user: UserCreate):
         "id": user_id,
         "email": user.email,
         "name": user.name,
-        "password": hash_password(user.password),
+        "password": await hash_password(user.password),
         "profile": {},
         "anamnesis": {},
         "created_at": datetime.now(timezone.utc).isoformat()
@@ -193,11 +744,14 @@ async def register(user: UserCreate):
     return {"token": token, "user": {"id": user_id, "email": user.email, "name": user.name}}
 
 @api_router.post("/auth/login")
-async def login(credentials: UserLogin):
+async def login(credentials: UserLogin, background_tasks: BackgroundTasks):
     user = await db.users.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password"]):
+    if not user or not await verify_password(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Ungültige Anmeldedaten")
     
+    if password_needs_rehash(user["password"]):
+        background_tasks.add_task(rehash_password, user["id"], credentials.password, user["password"])
+    
     token = create_token(user["id"], user["email"])
     return {
         "token": token,
@@ -231,45 +785,311 @@ async def update_profile(profile: UserProfile, user: dict = Depends(get_current_
         profile_data["bmi"] = round(profile.weight / (height_m * height_m), 1)
     
     await db.users.update_one({"id": user["id"]}, {"$set": {"profile": profile_data}})
+    await user_cache.invalidate(user["id"])
     return {"message": "Profil aktualisiert", "profile": profile_data}
 
 @api_router.put("/auth/anamnesis")
 async def update_anamnesis(anamnesis: UserAnamnesis, user: dict = Depends(get_current_user)):
     anamnesis_data = anamnesis.model_dump()
     await db.users.update_one({"id": user["id"]}, {"$set": {"anamnesis": anamnesis_data}})
+    await user_cache.invalidate(user["id"])
     return {"message": "Anamnese aktualisiert", "anamnesis": anamnesis_data}
 
+# ============== EXERCISE CATALOG ==============
+
+EXERCISE_FACETS = ("category", "muscle_group", "difficulty", "is_rehabilitation")
+EXERCISE_FIELDS = tuple(Exercise.model_fields)
+# English field -> German twin; lang= keeps only one of each pair
+EXERCISE_TRANSLATED_FIELDS = {"name": "name_de", "description": "description_de", "instructions": "instructions_de"}
+
+def exercise_view_keys(fields: Optional[str] = None, lang: Optional[str] = None) -> Optional[tuple]:
+    """Normalize fields=/lang= into the keys a catalog view keeps; None means full documents.
+
+    With lang set, a translated field may be requested by its English name
+    (fields=name&lang=de returns name_de).
+    """
+    if not fields and not lang:
+        return None
+    if fields:
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(EXERCISE_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unbekannte Felder: {', '.join(sorted(unknown))}")
+        requested.add("id")
+    else:
+        requested = set(EXERCISE_FIELDS)
+    if lang:
+        for english, german in EXERCISE_TRANSLATED_FIELDS.items():
+            if english in requested or german in requested:
+                requested.discard(english)
+                requested.discard(german)
+                requested.add(german if lang == "de" else english)
+    return tuple(field for field in EXERCISE_FIELDS if field in requested)
+
+def _facet_values(exercise: dict, facet: str) -> list:
+    if facet == "muscle_group":
+        return exercise.get("muscle_groups", [])
+    value = exercise.get(facet)
+    return [] if value is None else [value]
+
+class FacetIndex:
+    """Inverted index over the catalog: every facet value maps to a boolean
+    mask in catalog order, so filter combinations are answered by ANDing masks"""
+
+    def __init__(self, exercises: List[dict]):
+        self.size = len(exercises)
+        self.values: Dict[str, list] = {}
+        self.rows: Dict[str, Dict[Any, int]] = {}
+        self.masks: Dict[str, np.ndarray] = {}
+        for facet in EXERCISE_FACETS:
+            positions: Dict[Any, List[int]] = {}
+            for i, ex in enumerate(exercises):
+                for value in _facet_values(ex, facet):
+                    positions.setdefault(value, []).append(i)
+            matrix = np.zeros((len(positions), self.size), dtype=bool)
+            for row, indices in enumerate(positions.values()):
+                matrix[row, indices] = True
+            self.values[facet] = list(positions.keys())
+            self.rows[facet] = {value: row for row, value in enumerate(positions)}
+            self.masks[facet] = matrix
+
+    def match(self, filters: Dict[str, Any]) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        for facet, value in filters.items():
+            row = self.rows[facet].get(value)
+            if row is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= self.masks[facet][row]
+        return mask
+
+    def counts(self, filters: Dict[str, Any]) -> Dict[str, Dict[Any, int]]:
+        """Per-facet value counts; each facet ignores its own filter so the
+        client can still show the alternatives to the selected value"""
+        counts = {}
+        for facet in EXERCISE_FACETS:
+            mask = self.match({f: v for f, v in filters.items() if f != facet})
+            totals = np.count_nonzero(self.masks[facet] & mask, axis=1)
+            counts[facet] = {value: int(total) for value, total in zip(self.values[facet], totals)}
+        return counts
+
+DIFFICULTY_RANKS = {"beginner": 0, "intermediate": 1, "advanced": 2}
+UNKNOWN_DIFFICULTY_RANK = len(DIFFICULTY_RANKS)  # never allowed
+
+class ExerciseArrays:
+    """Columnar NumPy view of the catalog for the rule-based plan generator.
+
+    Rows are in catalog order. Contraindications keep one boolean mask per
+    value, like FacetIndex, because their vocabulary is open-ended.
+    """
+
+    def __init__(self, exercises: List[dict]):
+        self.size = len(exercises)
+        self.ids = [ex["id"] for ex in exercises]
+        self.category_codes = {value: code for code, value in enumerate(dict.fromkeys(ex.get("category") for ex in exercises))}
+        self.category = np.array([self.category_codes[ex.get("category")] for ex in exercises], dtype=np.int32)
+        self.difficulty = np.array(
+            [DIFFICULTY_RANKS.get(ex.get("difficulty"), UNKNOWN_DIFFICULTY_RANK) for ex in exercises], dtype=np.int8
+        )
+        self.is_rehabilitation = np.array([bool(ex.get("is_rehabilitation")) for ex in exercises], dtype=bool)
+        self.contraindications = self._value_masks(exercises, "contraindications")
+        self.muscle_groups = self._value_masks(exercises, "muscle_groups")
+
+    def _value_masks(self, exercises: List[dict], field: str) -> Dict[str, np.ndarray]:
+        masks: Dict[str, np.ndarray] = {}
+        for i, ex in enumerate(exercises):
+            for value in ex.get(field) or []:
+                mask = masks.get(value)
+                if mask is None:
+                    mask = masks[value] = np.zeros(self.size, dtype=bool)
+                mask[i] = True
+        return masks
+
+    def category_mask(self, category: str) -> np.ndarray:
+        code = self.category_codes.get(category)
+        return np.zeros(self.size, dtype=bool) if code is None else self.category == code
+
+    def contraindicated(self, conditions: List[str]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for condition in conditions:
+            if condition in self.contraindications:
+                mask |= self.contraindications[condition]
+        return mask
+
+    def trains(self, muscle_groups) -> np.ndarray:
+        """Exercises working any of the given muscle groups"""
+        mask = np.zeros(self.size, dtype=bool)
+        for group in muscle_groups:
+            if group in self.muscle_groups:
+                mask |= self.muscle_groups[group]
+        return mask
+
+class ExerciseCatalog:
+    """Process-local copy of the exercise catalog.
+
+    The catalog only changes when /admin/seed-exercises runs, so every worker
+    keeps it in memory and reloads it when the shared version stamp in
+    `cache_versions` moves. Documents are shared between requests and must be
+    treated as read-only.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.exercises: List[dict] = []
+        self.by_id: Dict[str, dict] = {}
+        self.positions: Dict[str, int] = {}
+        self.facets = FacetIndex([])
+        self.arrays = ExerciseArrays([])
+        # Bounded: fields= accepts any subset of the exercise fields
+        self._views = LRUCache(CATALOG_VIEW_CACHE_SIZE)
+        self._lock = asyncio.Lock()
+        self._reload_listeners = []
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
+    async def fetch_version(self) -> int:
+        doc = await db.cache_versions.find_one({"_id": CATALOG_VERSION_KEY})
+        return doc["version"] if doc else 0
+
+    async def load(self):
+        async with self._lock:
+            # Read the stamp before the documents: if a seed races with us we end
+            # up with new documents and an old stamp, which just triggers one more reload
+            version = await self.fetch_version()
+            exercises = await db.exercises.find({}, {"_id": 0}).to_list(None)
+
+            self.exercises = exercises
+            self.by_id = {ex["id"]: ex for ex in exercises}
+            self.positions = {ex["id"]: i for i, ex in enumerate(exercises)}
+            self.facets = FacetIndex(exercises)
+            self.arrays = ExerciseArrays(exercises)
+            self._views.clear()
+            self.version = version
+            logger.info(f"Exercise catalog loaded: {len(exercises)} exercises (version {version})")
+            for listener in self._reload_listeners:
+                listener(self)
+
+    def on_reload(self, listener):
+        """Register a callback for caches derived from the catalog"""
+        self._reload_listeners.append(listener)
+
+    async def refresh_if_stale(self):
+        if not self.loaded or await self.fetch_version() != self.version:
+            await self.load()
+
+    async def bump_version(self) -> int:
+        doc = await db.cache_versions.find_one_and_update(
+            {"_id": CATALOG_VERSION_KEY},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["version"]
+
+    @staticmethod
+    def facet_filters(
+        category: Optional[str] = None,
+        muscle_group: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        is_rehabilitation: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        filters = {
+            "category": category or None,
+            "muscle_group": muscle_group or None,
+            "difficulty": difficulty or None,
+            "is_rehabilitation": is_rehabilitation
+        }
+        return {facet: value for facet, value in filters.items() if value is not None}
+
+    def view(self, keys: Optional[tuple]) -> List[dict]:
+        """Projected copies of the catalog in catalog order, memoized per key set"""
+        if keys is None:
+            return self.exercises
+        view = self._views.get(keys)
+        if view is None:
+            view = [{key: ex[key] for key in keys if key in ex} for ex in self.exercises]
+            self._views.set(keys, view)
+        return view
+
+    def get(self, exercise_id: str, keys: Optional[tuple] = None) -> Optional[dict]:
+        position = self.positions.get(exercise_id)
+        return None if position is None else self.view(keys)[position]
+
+    def filter(self, filters: Dict[str, Any], keys: Optional[tuple] = None) -> List[dict]:
+        exercises = self.view(keys)
+        return [exercises[i] for i in np.flatnonzero(self.facets.match(filters))]
+
+exercise_catalog = ExerciseCatalog()
+exercise_catalog.on_reload(lambda catalog: catalog_responses.clear())
+
+async def get_catalog() -> ExerciseCatalog:
+    # Covers workers that started before Mongo was reachable
+    if not exercise_catalog.loaded:
+        await exercise_catalog.load()
+    return exercise_catalog
+
+async def poll_cache_versions():
+    """Background task: pick up catalog and user changes made by other workers"""
+    while True:
+        await asyncio.sleep(CACHE_VERSION_POLL_SECONDS)
+        try:
+            await exercise_catalog.refresh_if_stale()
+            await user_cache.refresh_if_stale()
+        except Exception as e:
+            logger.warning(f"Cache version poll failed: {str(e)}")
+
 # ============== EXERCISES ROUTES ==============
 
 @api_router.get("/exercises")
 async def get_exercises(
+    request: Request,
     category: Optional[str] = None,
     muscle_group: Optional[str] = None,
     difficulty: Optional[str] = None,
-    is_rehabilitation: Optional[bool] = None
+    is_rehabilitation: Optional[bool] = None,
+    facets: bool = False,
+    fields: Optional[str] = None,
+    lang: Optional[str] = Query(None, pattern="^(de|en)$")
 ):
-    query = {}
-    if category:
-        query["category"] = category
-    if muscle_group:
-        query["muscle_groups"] = muscle_group
-    if difficulty:
-        query["difficulty"] = difficulty
-    if is_rehabilitation is not None:
-        query["is_rehabilitation"] = is_rehabilitation
-    
-    exercises = await db.exercises.find(query, {"_id": 0}).to_list(500)
-    return exercises
+    catalog = await get_catalog()
+    filters = catalog.facet_filters(category, muscle_group, difficulty, is_rehabilitation)
+    keys = exercise_view_keys(fields, lang)
+
+    def build():
+        exercises = catalog.filter(filters, keys)
+        if not facets:
+            return exercises
+        # Opt-in envelope so older app builds keep receiving a plain list
+        return {
+            "exercises": exercises,
+            "total": len(exercises),
+            "facets": catalog.facets.counts(filters)
+        }
+
+    key = ("exercises", catalog.version, tuple(sorted(filters.items())), facets, keys)
+    return catalog_responses.render(key, build).to_response(request)
 
 @api_router.get("/exercises/{exercise_id}")
-async def get_exercise(exercise_id: str):
-    exercise = await db.exercises.find_one({"id": exercise_id}, {"_id": 0})
+async def get_exercise(
+    exercise_id: str,
+    request: Request,
+    fields: Optional[str] = None,
+    lang: Optional[str] = Query(None, pattern="^(de|en)$")
+):
+    catalog = await get_catalog()
+    keys = exercise_view_keys(fields, lang)
+    exercise = catalog.get(exercise_id, keys)
     if not exercise:
         raise HTTPException(status_code=404, detail="Übung nicht gefunden")
-    return exercise
+    key = ("exercise", catalog.version, exercise_id, keys)
+    return catalog_responses.render(key, lambda: exercise).to_response(request)
 
 @api_router.get("/exercises/categories/list")
-async def get_categories():
+async def get_categories(request: Request):
+    return catalog_responses.render(("categories",), exercise_categories).to_response(request)
+
+def exercise_categories() -> dict:
     return {
         "categories": [
             {"id": "strength", "name": "Krafttraining", "icon": "dumbbell"},
@@ -303,13 +1123,29 @@ async def create_plan(plan: TrainingPlan, user: dict = Depends(get_current_user)
     plan_data["id"] = str(uuid.uuid4())
     plan_data["created_at"] = datetime.now(timezone.utc).isoformat()
     await db.training_plans.insert_one(plan_data)
+    plan_data.pop("_id", None)
     return plan_data
 
 @api_router.get("/plans/{plan_id}")
-async def get_plan(plan_id: str, user: dict = Depends(get_current_user)):
+async def get_plan(
+    plan_id: str,
+    user: dict = Depends(get_current_user),
+    include_exercises: bool = False,
+    fields: Optional[str] = None,
+    lang: Optional[str] = Query(None, pattern="^(de|en)$")
+):
     plan = await db.training_plans.find_one({"id": plan_id, "user_id": user["id"]}, {"_id": 0})
     if not plan:
         raise HTTPException(status_code=404, detail="Trainingsplan nicht gefunden")
+    
+    if include_exercises:
+        # Embed the catalog document of every exercise so the app needs no follow-up requests
+        catalog = await get_catalog()
+        keys = exercise_view_keys(fields, lang)
+        plan["exercises"] = [
+            {**ex, "exercise": catalog.get(ex.get("exercise_id"), keys)}
+            for ex in plan.get("exercises", [])
+        ]
     return plan
 
 @api_router.put("/plans/{plan_id}")
@@ -331,45 +1167,271 @@ async def delete_plan(plan_id: str, user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=404, detail="Trainingsplan nicht gefunden")
     return {"message": "Trainingsplan gelöscht"}
 
-# ============== AI TRAINING PLAN GENERATION ==============
+# ============== LLM GATEWAY ==============
 
-async def generate_smart_plan(request: AITrainingPlanRequest, profile: dict, anamnesis: dict) -> dict:
-    """Generate a training plan based on user profile and goals using smart rule-based logic"""
-    
-    # Get exercises from database
-    exercises = await db.exercises.find({}, {"_id": 0}).to_list(500)
-    
-    # Filter exercises based on contraindications
-    joint_problems = anamnesis.get('joint_problems', [])
-    heart_conditions = anamnesis.get('heart_conditions', False)
-    high_blood_pressure = anamnesis.get('high_blood_pressure', False)
-    
-    safe_exercises = []
-    for ex in exercises:
-        # Check contraindications
-        contra = ex.get('contraindications', [])
-        has_contra = any(jp in contra for jp in joint_problems)
-        
-        # Skip high intensity for heart conditions
-        if heart_conditions and ex.get('category') == 'cardio' and ex.get('difficulty') == 'advanced':
-            continue
-        
-        if not has_contra:
-            safe_exercises.append(ex)
-    
-    # Filter by difficulty based on experience level
-    experience_level = profile.get('experience_level', 'beginner')
-    difficulty_map = {
-        'beginner': ['beginner'],
-        'intermediate': ['beginner', 'intermediate'],
-        'advanced': ['beginner', 'intermediate', 'advanced']
+class LLMUnavailableError(Exception):
+    """The LLM could not produce an answer; callers fall back to the rule-based generator"""
+
+class CircuitBreaker:
+    """Stops calling a failing dependency.
+
+    closed: calls pass, consecutive failures are counted.
+    open: calls are rejected immediately until reset_seconds have passed.
+    half_open: a single probe call is let through; its outcome closes or reopens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.state = "half_open"
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """Call was abandoned without an outcome (e.g. client disconnected)"""
+        self._probe_in_flight = False
+
+class LLMGateway:
+    """Async access to the completion API with a per-call deadline, a cap on
+    concurrent completions and a circuit breaker in front of the proxy"""
+
+    def __init__(self, timeout: float, max_concurrency: int, breaker: CircuitBreaker):
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.short_circuited = 0
+        self.streams = 0
+
+    async def _create(self, kwargs: dict):
+        # The deadline covers waiting for a slot as well as the completion itself
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                return await get_openai_client().chat.completions.create(**kwargs)
+            finally:
+                self.in_flight -= 1
+
+    async def complete(self, **kwargs) -> str:
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise LLMUnavailableError("Circuit breaker open")
+
+        self.calls += 1
+        try:
+            response = await asyncio.wait_for(self._create(kwargs), timeout=self.timeout)
+            content = response.choices[0].message.content
+            if not content:
+                raise ValueError("Empty completion")
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            self.breaker.record_failure()
+            raise LLMUnavailableError(f"No completion within {self.timeout}s")
+        except Exception as e:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise LLMUnavailableError(str(e)) from e
+
+        self.breaker.record_success()
+        return content
+
+    async def stream(self, **kwargs) -> AsyncIterator[str]:
+        """Yield the content deltas of a streamed completion.
+
+        Same slot, breaker and deadline rules as complete(); the deadline
+        covers the whole stream, not just the first chunk. Consume it inside
+        contextlib.aclosing() so an abandoned stream gives its slot back.
+        """
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise LLMUnavailableError("Circuit breaker open")
+
+        self.calls += 1
+        self.streams += 1
+        deadline = time.monotonic() + self.timeout
+
+        def remaining() -> float:
+            return max(deadline - time.monotonic(), 0)
+
+        acquired = False
+        response = None
+        received = False
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=remaining())
+            acquired = True
+            self.in_flight += 1
+            response = await asyncio.wait_for(
+                get_openai_client().chat.completions.create(**kwargs, stream=True),
+                timeout=remaining()
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+                except StopAsyncIteration:
+                    break
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    received = True
+                    yield delta
+            if not received:
+                raise ValueError("Empty completion")
+        except (asyncio.CancelledError, GeneratorExit):
+            self.breaker.release()
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            self.breaker.record_failure()
+            raise LLMUnavailableError(f"No completion within {self.timeout}s")
+        except Exception as e:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise LLMUnavailableError(str(e)) from e
+        finally:
+            if response is not None:
+                await response.close()
+            if acquired:
+                self.in_flight -= 1
+                self._slots.release()
+
+        self.breaker.record_success()
+
+    def stats(self) -> dict:
+        return {
+            "breaker_state": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "streams": self.streams,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "short_circuited": self.short_circuited
+        }
+
+llm_gateway = LLMGateway(
+    LLM_TIMEOUT_SECONDS,
+    LLM_MAX_CONCURRENCY,
+    CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS)
+)
+
+# ============== PLAN GENERATION CACHE ==============
+
+BMI_BUCKETS = (18.5, 25, 30, 35)
+AGE_BUCKETS = (30, 40, 50, 60, 70)
+
+def _bucket(value, bounds) -> Optional[int]:
+    return bisect.bisect_right(bounds, value) if isinstance(value, (int, float)) else None
+
+def plan_fingerprint(request: AITrainingPlanRequest, profile: dict, anamnesis: dict, catalog_version: Optional[int]) -> str:
+    """Normalized hash of everything that shapes a generated plan"""
+    goals = request.goals if request.goals else [request.goal]
+    key = {
+        "goals": goals[:3],
+        "days_per_week": request.days_per_week,
+        "duration_weeks": request.duration_weeks,
+        "focus_areas": sorted({area.strip().lower() for area in request.focus_areas or []}),
+        "experience_level": profile.get("experience_level", "beginner"),
+        "bmi_bucket": _bucket(profile.get("bmi"), BMI_BUCKETS),
+        "age_bucket": _bucket(profile.get("age"), AGE_BUCKETS),
+        "heart_conditions": bool(anamnesis.get("heart_conditions")),
+        "high_blood_pressure": bool(anamnesis.get("high_blood_pressure")),
+        "diabetes": bool(anamnesis.get("diabetes")),
+        "joint_problems": sorted(set(anamnesis.get("joint_problems") or [])),
+        "physical_limitations": " ".join((anamnesis.get("physical_limitations") or "").lower().split()),
+        "catalog_version": catalog_version
     }
-    allowed_difficulties = difficulty_map.get(experience_level, ['beginner', 'intermediate'])
-    
-    # Get all goals (support both single goal and multiple goals)
-    all_goals = request.goals if request.goals else [request.goal]
-    all_goals = all_goals[:3]  # Limit to 3 goals max
-    
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+class PlanCache:
+    """Generated plans by fingerprint: in-memory LRU in front of the
+    `plan_cache` collection, whose TTL index expires old entries"""
+
+    def __init__(self, maxsize: int):
+        self.memory = LRUCache(maxsize)
+        self.db_hits = 0
+
+    async def get(self, fingerprint: str) -> Optional[dict]:
+        plan_data = self.memory.get(fingerprint)
+        if plan_data is not None:
+            return plan_data
+        doc = await db.plan_cache.find_one({"_id": fingerprint}, {"plan": 1})
+        if not doc:
+            return None
+        self.db_hits += 1
+        self.memory.set(fingerprint, doc["plan"])
+        return doc["plan"]
+
+    async def set(self, fingerprint: str, plan_data: dict, catalog_version: Optional[int]):
+        plan_data = {
+            "name": plan_data.get("name"),
+            "description": plan_data.get("description", ""),
+            "exercises": plan_data.get("exercises", [])
+        }
+        self.memory.set(fingerprint, plan_data)
+        await db.plan_cache.replace_one(
+            {"_id": fingerprint},
+            {
+                "plan": plan_data,
+                "catalog_version": catalog_version,
+                "created_at": datetime.now(timezone.utc)
+            },
+            upsert=True
+        )
+
+    def stats(self) -> dict:
+        return {**self.memory.stats(), "db_hits": self.db_hits}
+
+plan_cache = PlanCache(PLAN_CACHE_SIZE)
+
+# Fingerprints include the catalog version, so old entries can never match again
+exercise_catalog.on_reload(lambda catalog: plan_cache.memory.clear())
+
+# ============== AI TRAINING PLAN GENERATION ==============
+
+PLAN_GOALS = ("weight_loss", "muscle_gain", "mobility", "endurance", "rehabilitation")
+EXPERIENCE_LEVELS = ("beginner", "intermediate", "advanced")
+JOINT_PROBLEMS = ("knee", "hip", "shoulder", "back", "ankle")
+
+def smart_plan_categories(all_goals: List[str]) -> List[str]:
+    """Exercise categories in priority order for the given goals"""
     # Goal-specific category mapping
     goal_categories = {
         'weight_loss': ['cardio', 'bodyweight', 'strength'],
@@ -389,73 +1451,102 @@ async def generate_smart_plan(request: AITrainingPlanRequest, profile: dict, ana
     # Always add flexibility at the end for balance
     if 'flexibility' not in combined_categories:
         combined_categories.append('flexibility')
+    return combined_categories
+
+def smart_plan_eligible(
+    arrays: ExerciseArrays,
+    experience_level: Optional[str],
+    joint_problems: List[str],
+    heart_conditions: bool
+) -> np.ndarray:
+    """Mask of the exercises that are safe and suitable for the user"""
+    # Filter exercises based on contraindications
+    safe = ~arrays.contraindicated(joint_problems)
+    if heart_conditions:
+        # Skip high intensity for heart conditions
+        safe &= ~(arrays.category_mask('cardio') & (arrays.difficulty == DIFFICULTY_RANKS['advanced']))
+    
+    # Filter by difficulty based on experience level
+    difficulty_map = {
+        'beginner': ['beginner'],
+        'intermediate': ['beginner', 'intermediate'],
+        'advanced': ['beginner', 'intermediate', 'advanced']
+    }
+    allowed_difficulties = difficulty_map.get(experience_level, ['beginner', 'intermediate'])
+    return safe & (arrays.difficulty <= max(DIFFICULTY_RANKS[d] for d in allowed_difficulties))
+
+def smart_plan_selection(
+    arrays: ExerciseArrays,
+    combined_categories: List[str],
+    goal_count: int,
+    experience_level: Optional[str],
+    joint_problems: List[str],
+    heart_conditions: bool
+) -> List[int]:
+    """Catalog rows of the rule-based plan, in plan order"""
+    eligible = smart_plan_eligible(arrays, experience_level, joint_problems, heart_conditions)
+    
+    selected: List[int] = []
+    available = eligible.copy()  # eligible and not selected yet
     
-    selected = []
+    def take(mask: np.ndarray, count: int):
+        rows = np.flatnonzero(mask)[:count]
+        selected.extend(rows.tolist())
+        available[rows] = False
     
     # Add rehabilitation exercises if user has joint problems
     if joint_problems:
-        for ex in safe_exercises:
-            if ex.get('is_rehabilitation') and ex.get('difficulty') in allowed_difficulties:
-                if len(selected) < 3:
-                    selected.append(ex)
+        take(eligible & arrays.is_rehabilitation, 3)
     
     # Calculate exercises per category based on number of goals
     # More goals = more exercises (8-12 based on goal count)
-    max_exercises = 8 + (len(all_goals) - 1) * 2  # 8, 10, or 12 exercises
+    max_exercises = 8 + (goal_count - 1) * 2  # 8, 10, or 12 exercises
     exercises_per_category = max(2, max_exercises // len(combined_categories))
     
     # Fill exercises from priority categories
     for category in combined_categories:
-        cat_count = 0
-        for ex in safe_exercises:
-            if (ex.get('category') == category and 
-                ex.get('difficulty') in allowed_difficulties and
-                ex not in selected):
-                selected.append(ex)
-                cat_count += 1
-                if cat_count >= exercises_per_category or len(selected) >= max_exercises:
-                    break
+        take(available & arrays.category_mask(category), min(exercises_per_category, max_exercises - len(selected)))
         if len(selected) >= max_exercises:
             break
     
     # Ensure we have at least 6 exercises
     if len(selected) < 6:
-        for ex in safe_exercises:
-            if ex not in selected and ex.get('difficulty') in allowed_difficulties:
-                selected.append(ex)
-                if len(selected) >= 6:
-                    break
-    
+        take(available, 6 - len(selected))
+    return selected
+
+def smart_plan_document(exercise_ids: List[str], all_goals: List[str], experience_level: Optional[str]) -> dict:
+    """Plan name, description and sets/reps for the selected exercises"""
     # Determine primary goal characteristics for sets/reps
     primary_goal = all_goals[0] if all_goals else 'general'
     
+    # Adjust based on primary goal
+    if primary_goal == 'muscle_gain':
+        sets, reps = (4, 8) if experience_level != 'beginner' else (3, 10)
+        rest = 90
+    elif primary_goal == 'endurance':
+        sets, reps = (3, 15)
+        rest = 45
+    elif primary_goal == 'rehabilitation':
+        sets, reps = (2, 12)
+        rest = 60
+    elif primary_goal == 'weight_loss':
+        sets, reps = (3, 12)
+        rest = 30
+    else:
+        sets, reps = (3, 10)
+        rest = 60
+    
     # Create workout exercises with appropriate sets/reps
-    workout_exercises = []
-    for ex in selected:
-        # Adjust based on primary goal
-        if primary_goal == 'muscle_gain':
-            sets, reps = (4, 8) if experience_level != 'beginner' else (3, 10)
-            rest = 90
-        elif primary_goal == 'endurance':
-            sets, reps = (3, 15)
-            rest = 45
-        elif primary_goal == 'rehabilitation':
-            sets, reps = (2, 12)
-            rest = 60
-        elif primary_goal == 'weight_loss':
-            sets, reps = (3, 12)
-            rest = 30
-        else:
-            sets, reps = (3, 10)
-            rest = 60
-        
-        workout_exercises.append({
-            "exercise_id": ex['id'],
+    workout_exercises = [
+        {
+            "exercise_id": exercise_id,
             "sets": sets,
             "reps": reps,
             "rest_seconds": rest,
-            "notes": f"Achte auf korrekte Ausführung"
-        })
+            "notes": "Achte auf korrekte Ausführung"
+        }
+        for exercise_id in exercise_ids
+    ]
     
     # Generate plan name based on goals
     goal_names = {
@@ -480,50 +1571,269 @@ async def generate_smart_plan(request: AITrainingPlanRequest, profile: dict, ana
         "exercises": workout_exercises
     }
 
-@api_router.post("/plans/generate")
-async def generate_ai_plan(request: AITrainingPlanRequest, user: dict = Depends(get_current_user)):
-    try:
-        profile = user.get("profile", {})
-        anamnesis = user.get("anamnesis", {})
-        
-        # Get all goals (support both single goal and multiple goals)
-        all_goals = request.goals if request.goals else [request.goal]
-        all_goals = all_goals[:3]  # Limit to 3 goals max
-        
-        goal_names = {
-            'weight_loss': 'Fettverbrennung',
-            'muscle_gain': 'Muskelaufbau',
-            'mobility': 'Mobilität',
-            'endurance': 'Ausdauer',
-            'rehabilitation': 'Rehabilitation'
-        }
-        
-        # Try AI generation first, fallback to smart rules
-        plan_data = None
-        
-        try:
-            # Get available exercises
-            exercises = await db.exercises.find({}, {"_id": 0}).to_list(500)
-            exercise_names = [f"{e['name_de']} (ID: {e['id']}, Kategorie: {e['category']}, Muskelgruppen: {', '.join(e['muscle_groups'])}, Schwierigkeit: {e['difficulty']})" for e in exercises[:50]]
-            
-            # Format goals for prompt
-            goals_text = ', '.join([goal_names.get(g, g) for g in all_goals])
-            goals_instruction = f"Kombiniere Übungen für folgende Ziele: {goals_text}" if len(all_goals) > 1 else f"Ziel: {goal_names.get(all_goals[0], all_goals[0])}"
-            
-            # Build context about user
-            user_context = f"""
-Benutzerprofil:
-- Gewicht: {profile.get('weight', 'unbekannt')} kg
-- Größe: {profile.get('height', 'unbekannt')} cm
-- BMI: {profile.get('bmi', 'unbekannt')}
-- Alter: {profile.get('age', 'unbekannt')}
-- Geschlecht: {profile.get('gender', 'unbekannt')}
-- Fitnessziel: {profile.get('fitness_goal', request.goal)}
-- Erfahrungslevel: {profile.get('experience_level', 'beginner')}
+def plan_template_key(
+    all_goals: List[str], experience_level: Optional[str], joint_problems: Any, heart_conditions: Any
+) -> Optional[tuple]:
+    """Table key for canonical inputs; None when the input is outside the precomputed space"""
+    if not all_goals or len(set(all_goals)) != len(all_goals) or not set(all_goals) <= set(PLAN_GOALS):
+        return None
+    if experience_level not in EXPERIENCE_LEVELS:
+        return None
+    if not isinstance(joint_problems, list) or not all(jp in JOINT_PROBLEMS for jp in joint_problems):
+        return None
+    joints = tuple(jp for jp in JOINT_PROBLEMS if jp in joint_problems)
+    return (tuple(all_goals), experience_level, joints, bool(heart_conditions))
 
-Gesundheitliche Anamnese:
-- Herzprobleme: {'Ja' if anamnesis.get('heart_conditions') else 'Nein'}
-- Bluthochdruck: {'Ja' if anamnesis.get('high_blood_pressure') else 'Nein'}
+def plan_template_label(key: tuple) -> str:
+    goals, experience_level, joints, heart_conditions = key
+    return f"{'+'.join(goals)}|{experience_level}|{','.join(joints) or '-'}|{'heart' if heart_conditions else '-'}"
+
+def build_plan_table(arrays: ExerciseArrays) -> Dict[tuple, tuple]:
+    """Selected rows for every canonical input (85 goal sequences x 3 levels x 32 joint sets x 2)"""
+    table = {}
+    selections = {}  # goal sequences that share categories and count share a selection
+    for goal_count in range(1, 4):
+        for goals in itertools.permutations(PLAN_GOALS, goal_count):
+            categories = tuple(smart_plan_categories(list(goals)))
+            for experience_level in EXPERIENCE_LEVELS:
+                for size in range(len(JOINT_PROBLEMS) + 1):
+                    for joints in itertools.combinations(JOINT_PROBLEMS, size):
+                        for heart_conditions in (False, True):
+                            selection_key = (categories, goal_count, experience_level, joints, heart_conditions)
+                            rows = selections.get(selection_key)
+                            if rows is None:
+                                rows = tuple(smart_plan_selection(
+                                    arrays, list(categories), goal_count, experience_level, list(joints), heart_conditions
+                                ))
+                                selections[selection_key] = rows
+                            table[(goals, experience_level, joints, heart_conditions)] = rows
+    return table
+
+class PlanTemplateTable:
+    """Precomputed rule-based plans for the current catalog.
+
+    Rebuilt off the event loop whenever the catalog reloads and swapped in as
+    one reference; until then lookups miss and callers compute directly.
+    """
+
+    def __init__(self):
+        self.state: Optional[tuple] = None  # (arrays, table, build seconds)
+        self.hits = 0
+        self.misses = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, catalog: ExerciseCatalog):
+        self._task = asyncio.get_running_loop().create_task(self._rebuild(catalog.arrays))
+
+    async def _rebuild(self, arrays: ExerciseArrays):
+        started = time.perf_counter()
+        try:
+            table = await asyncio.to_thread(build_plan_table, arrays)
+        except Exception as e:
+            logger.error(f"Plan template table build failed: {str(e)}")
+            return
+        if arrays is not exercise_catalog.arrays:
+            return  # superseded by a newer reload
+        self.state = (arrays, table, time.perf_counter() - started)
+        logger.info(f"Plan template table built: {len(table)} entries in {self.state[2]:.2f}s")
+
+    async def ready(self):
+        if self._task is not None:
+            await self._task
+
+    def lookup(self, arrays: ExerciseArrays, all_goals, experience_level, joint_problems, heart_conditions) -> Optional[dict]:
+        state = self.state
+        key = plan_template_key(all_goals, experience_level, joint_problems, heart_conditions)
+        if key is None or state is None or state[0] is not arrays:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return smart_plan_document([arrays.ids[row] for row in state[1][key]], all_goals, experience_level)
+
+    def export(self) -> Dict[str, List[str]]:
+        """Exercise ids per input, for dumping and diffing"""
+        if self.state is None:
+            return {}
+        arrays, table, _ = self.state
+        return {plan_template_label(key): [arrays.ids[row] for row in rows] for key, rows in table.items()}
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.state[1]) if self.state else 0,
+            "build_seconds": round(self.state[2], 3) if self.state else None,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+plan_templates = PlanTemplateTable()
+exercise_catalog.on_reload(plan_templates.schedule)
+
+async def generate_smart_plan(request: AITrainingPlanRequest, profile: dict, anamnesis: dict) -> dict:
+    """Generate a training plan based on user profile and goals using smart rule-based logic"""
+    arrays = (await get_catalog()).arrays
+    
+    # Get all goals (support both single goal and multiple goals)
+    all_goals = request.goals if request.goals else [request.goal]
+    all_goals = all_goals[:3]  # Limit to 3 goals max
+    experience_level = profile.get('experience_level', 'beginner')
+    joint_problems = anamnesis.get('joint_problems', [])
+    heart_conditions = anamnesis.get('heart_conditions', False)
+    
+    # Canonical inputs are a table lookup; anything else is computed directly
+    plan = plan_templates.lookup(arrays, all_goals, experience_level, joint_problems, heart_conditions)
+    if plan is not None:
+        return plan
+    rows = smart_plan_selection(
+        arrays, smart_plan_categories(all_goals), len(all_goals), experience_level, joint_problems, heart_conditions
+    )
+    return smart_plan_document([arrays.ids[row] for row in rows], all_goals, experience_level)
+
+# Focus areas offered by the app that are not muscle groups themselves
+FOCUS_AREA_MUSCLE_GROUPS = {
+    'arme': ('Bizeps', 'Trizeps', 'Unterarme'),
+}
+
+PROMPT_CONTEXT_LEGEND = "Format: ID|Name|Kategorie|Muskelgruppen|Schwierigkeit"
+
+def prompt_context_line(exercise: dict) -> str:
+    return "|".join([
+        exercise["id"], exercise.get("name_de") or exercise.get("name", ""), exercise.get("category", ""),
+        "/".join(exercise.get("muscle_groups") or []), exercise.get("difficulty", "")
+    ])
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for this mix of German words and ids
+    return len(text) // 4 + 1
+
+class PlanPromptContext:
+    """The exercise list for the LLM plan prompt.
+
+    The catalog is filtered with the rule-based generator's safety and
+    difficulty rules, ranked by how well each exercise fits the goals and
+    focus areas, and encoded one line per exercise until token_budget is
+    spent. Fragments are cached per filter signature and dropped when the
+    catalog reloads.
+    """
+
+    def __init__(self, token_budget: int, maxsize: int):
+        self.token_budget = token_budget
+        self._fragments = LRUCache(maxsize)
+
+    def build(
+        self,
+        catalog: ExerciseCatalog,
+        all_goals: List[str],
+        experience_level: Optional[str],
+        joint_problems: List[str],
+        heart_conditions: bool,
+        focus_areas: List[str]
+    ) -> str:
+        key = (
+            catalog.version, tuple(all_goals), experience_level, tuple(sorted(set(joint_problems))),
+            bool(heart_conditions), tuple(sorted({area.strip().lower() for area in focus_areas}))
+        )
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            rows = self.ranked_rows(catalog.arrays, all_goals, experience_level, joint_problems, heart_conditions, focus_areas)
+            lines = [PROMPT_CONTEXT_LEGEND]
+            budget = self.token_budget - estimate_tokens(PROMPT_CONTEXT_LEGEND)
+            for row in rows:
+                line = prompt_context_line(catalog.exercises[row])
+                budget -= estimate_tokens(line)
+                if budget < 0 and len(lines) > 1:
+                    break
+                lines.append(line)
+            fragment = "\n".join(lines)
+            self._fragments.set(key, fragment)
+        return fragment
+
+    def for_plan(self, catalog: ExerciseCatalog, request: AITrainingPlanRequest, profile: dict, anamnesis: dict) -> str:
+        all_goals = request.goals if request.goals else [request.goal]
+        return self.build(
+            catalog,
+            all_goals[:3],
+            profile.get('experience_level', 'beginner'),
+            anamnesis.get('joint_problems', []),
+            anamnesis.get('heart_conditions', False),
+            request.focus_areas or []
+        )
+
+    @staticmethod
+    def ranked_rows(
+        arrays: ExerciseArrays,
+        all_goals: List[str],
+        experience_level: Optional[str],
+        joint_problems: List[str],
+        heart_conditions: bool,
+        focus_areas: List[str]
+    ) -> List[int]:
+        """Eligible catalog rows, most relevant first (catalog order among equals)"""
+        eligible = smart_plan_eligible(arrays, experience_level, joint_problems, heart_conditions)
+        
+        # The goals' first category counts most, like in the rule-based plan
+        categories = smart_plan_categories(all_goals)
+        score = np.zeros(arrays.size, dtype=np.int32)
+        for rank, category in enumerate(categories):
+            score += arrays.category_mask(category) * (len(categories) - rank)
+        
+        # A focus area match is worth two category ranks
+        groups_by_name = {group.lower(): group for group in arrays.muscle_groups}
+        muscle_groups = set()
+        for area in focus_areas:
+            area = area.strip().lower()
+            muscle_groups.update(FOCUS_AREA_MUSCLE_GROUPS.get(area, ()))
+            if area in groups_by_name:
+                muscle_groups.add(groups_by_name[area])
+        score += arrays.trains(muscle_groups) * 2
+        
+        if joint_problems:
+            score += arrays.is_rehabilitation * 2
+        
+        rows = np.flatnonzero(eligible)
+        return rows[np.argsort(-score[rows], kind="stable")].tolist()
+
+    def clear(self):
+        self._fragments.clear()
+
+    def stats(self) -> dict:
+        return {**self._fragments.stats(), "token_budget": self.token_budget}
+
+plan_prompt_context = PlanPromptContext(LLM_CONTEXT_TOKEN_BUDGET, LLM_CONTEXT_CACHE_SIZE)
+exercise_catalog.on_reload(lambda catalog: plan_prompt_context.clear())
+
+def llm_plan_completion_args(request: AITrainingPlanRequest, profile: dict, anamnesis: dict, exercise_context: str) -> dict:
+    """Chat completion arguments for a plan request"""
+    
+    # Get all goals (support both single goal and multiple goals)
+    all_goals = request.goals if request.goals else [request.goal]
+    all_goals = all_goals[:3]  # Limit to 3 goals max
+    
+    goal_names = {
+        'weight_loss': 'Fettverbrennung',
+        'muscle_gain': 'Muskelaufbau',
+        'mobility': 'Mobilität',
+        'endurance': 'Ausdauer',
+        'rehabilitation': 'Rehabilitation'
+    }
+    
+    # Format goals for prompt
+    goals_text = ', '.join([goal_names.get(g, g) for g in all_goals])
+    goals_instruction = f"Kombiniere Übungen für folgende Ziele: {goals_text}" if len(all_goals) > 1 else f"Ziel: {goal_names.get(all_goals[0], all_goals[0])}"
+    
+    # Build context about user
+    user_context = f"""
+Benutzerprofil:
+- Gewicht: {profile.get('weight', 'unbekannt')} kg
+- Größe: {profile.get('height', 'unbekannt')} cm
+- BMI: {profile.get('bmi', 'unbekannt')}
+- Alter: {profile.get('age', 'unbekannt')}
+- Geschlecht: {profile.get('gender', 'unbekannt')}
+- Fitnessziel: {profile.get('fitness_goal', request.goal)}
+- Erfahrungslevel: {profile.get('experience_level', 'beginner')}
+
+Gesundheitliche Anamnese:
+- Herzprobleme: {'Ja' if anamnesis.get('heart_conditions') else 'Nein'}
+- Bluthochdruck: {'Ja' if anamnesis.get('high_blood_pressure') else 'Nein'}
 - Diabetes: {'Ja' if anamnesis.get('diabetes') else 'Nein'}
 - Gelenkprobleme: {', '.join(anamnesis.get('joint_problems', [])) or 'Keine'}
 - Andere Einschränkungen: {anamnesis.get('physical_limitations', 'Keine')}
@@ -535,16 +1845,16 @@ Trainingsplan-Anforderung:
 - Dauer: {request.duration_weeks} Wochen
 - Fokus-Bereiche: {', '.join(request.focus_areas) if request.focus_areas else 'Allgemein'}
 """
-            
-            # Adjust exercise count based on number of goals
-            exercise_count = 8 + (len(all_goals) - 1) * 2  # 8, 10, or 12 exercises
-            
-            prompt = f"""Du bist ein professioneller Fitness-Trainer. Erstelle einen personalisierten Trainingsplan:
+    
+    # Adjust exercise count based on number of goals
+    exercise_count = 8 + (len(all_goals) - 1) * 2  # 8, 10, or 12 exercises
+    
+    prompt = f"""Du bist ein professioneller Fitness-Trainer. Erstelle einen personalisierten Trainingsplan:
 
 {user_context}
 
 Verfügbare Übungen (verwende NUR diese IDs):
-{chr(10).join(exercise_names)}
+{exercise_context}
 
 WICHTIG: 
 - Berücksichtige alle gesundheitlichen Einschränkungen
@@ -555,62 +1865,803 @@ WICHTIG:
 Antworte NUR mit JSON:
 {{"name": "Planname", "description": "Beschreibung", "exercises": [{{"exercise_id": "ID", "sets": 3, "reps": 10, "rest_seconds": 60, "notes": ""}}]}}"""
 
-            client = get_openai_client()
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Du bist ein Fitness-Experte. Antworte NUR mit validem JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            content = response.choices[0].message.content.strip()
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            content = content.strip()
-            
-            import json
-            plan_data = json.loads(content)
-            logger.info("AI plan generated successfully")
-            
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": "Du bist ein Fitness-Experte. Antworte NUR mit validem JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.7,
+        "max_tokens": 2000
+    }
+
+def parse_llm_plan(content: str) -> dict:
+    """Decode the plan JSON from a completion, with or without a code fence"""
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.split("```")[1]
+        if content.startswith("json"):
+            content = content[4:]
+    content = content.strip()
+    return json.loads(content)
+
+def plan_exercise_or_none(value: Any, catalog: ExerciseCatalog) -> Optional[dict]:
+    """An exercise from the LLM as a WorkoutExercise dict, or None if it is unusable"""
+    if not isinstance(value, dict):
+        return None
+    try:
+        exercise = WorkoutExercise(**value).model_dump()
+    except ValidationError:
+        return None
+    return exercise if exercise["exercise_id"] in catalog.positions else None
+
+def validate_llm_plan(plan_data: Any, catalog: ExerciseCatalog) -> dict:
+    """The usable part of an LLM plan; raises ValueError if no exercise is usable.
+
+    Nothing else checks the completion before it is cached for every user
+    with the same fingerprint, so unknown ids and malformed entries stop here.
+    """
+    if not isinstance(plan_data, dict) or not isinstance(plan_data.get("exercises"), list):
+        raise ValueError("Completion is not a plan object")
+    exercises = [plan_exercise_or_none(value, catalog) for value in plan_data["exercises"]]
+    exercises = [exercise for exercise in exercises if exercise is not None]
+    if not exercises:
+        raise ValueError("No usable exercises in completion")
+    plan = {key: plan_data[key] for key in ("name", "description") if isinstance(plan_data.get(key), str)}
+    plan["exercises"] = exercises
+    return plan
+
+async def generate_llm_plan(request: AITrainingPlanRequest, profile: dict, anamnesis: dict) -> dict:
+    """Generate a training plan with the LLM; raises if no valid plan comes back"""
+    catalog = await get_catalog()
+    exercise_context = plan_prompt_context.for_plan(catalog, request, profile, anamnesis)
+    content = await llm_gateway.complete(**llm_plan_completion_args(request, profile, anamnesis, exercise_context))
+    plan_data = validate_llm_plan(parse_llm_plan(content), catalog)
+    logger.info("AI plan generated successfully")
+    return plan_data
+
+async def create_ai_plan(
+    request: AITrainingPlanRequest,
+    user_id: str,
+    profile: dict,
+    anamnesis: dict,
+    plan_id: Optional[str] = None
+) -> dict:
+    """Generate and store a plan: plan cache, then the LLM, then the rule-based fallback.
+
+    With a preassigned plan_id the insert is idempotent (training_plans.id is
+    unique), so a repeated run returns the stored plan instead of a second one.
+    """
+    # Get all goals (support both single goal and multiple goals)
+    all_goals = request.goals if request.goals else [request.goal]
+    all_goals = all_goals[:3]  # Limit to 3 goals max
+    
+    # Try the plan cache first, then AI generation, fallback to smart rules
+    catalog = await get_catalog()
+    fingerprint = plan_fingerprint(request, profile, anamnesis, catalog.version)
+    plan_data = await plan_cache.get(fingerprint)
+    
+    if plan_data is None:
+        try:
+            plan_data = await generate_llm_plan(request, profile, anamnesis)
+            await plan_cache.set(fingerprint, plan_data, catalog.version)
         except Exception as ai_error:
             logger.warning(f"AI generation failed, using smart fallback: {str(ai_error)}")
             # Fallback to smart rule-based generation
             plan_data = await generate_smart_plan(request, profile, anamnesis)
-        
-        # Create the plan - store all goals
-        plan_id = str(uuid.uuid4())
-        
-        # Generate combined goal string for storage
-        combined_goal = ', '.join(all_goals) if len(all_goals) > 1 else all_goals[0]
-        
-        final_plan = {
-            "id": plan_id,
-            "user_id": user["id"],
-            "name": plan_data.get("name", f"Trainingsplan - {combined_goal}"),
-            "description": plan_data.get("description", ""),
-            "goal": combined_goal,
-            "goals": all_goals,
-            "exercises": plan_data.get("exercises", []),
-            "days_per_week": request.days_per_week,
-            "duration_weeks": request.duration_weeks,
-            "is_ai_generated": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        
+    
+    return await store_ai_plan(request, user_id, plan_data, plan_id)
+
+async def store_ai_plan(
+    request: AITrainingPlanRequest,
+    user_id: str,
+    plan_data: dict,
+    plan_id: Optional[str] = None,
+    is_ai_generated: bool = True
+) -> dict:
+    """Store a generated plan; a duplicate plan_id returns the stored plan"""
+    all_goals = request.goals if request.goals else [request.goal]
+    all_goals = all_goals[:3]
+    
+    # Generate combined goal string for storage
+    combined_goal = ', '.join(all_goals) if len(all_goals) > 1 else all_goals[0]
+    
+    # Create the plan - store all goals
+    final_plan = {
+        "id": plan_id or str(uuid.uuid4()),
+        "user_id": user_id,
+        "name": plan_data.get("name", f"Trainingsplan - {combined_goal}"),
+        "description": plan_data.get("description", ""),
+        "goal": combined_goal,
+        "goals": all_goals,
+        "exercises": plan_data.get("exercises", []),
+        "days_per_week": request.days_per_week,
+        "duration_weeks": request.duration_weeks,
+        "is_ai_generated": is_ai_generated,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    try:
         await db.training_plans.insert_one(final_plan)
-        # Remove _id before returning
-        final_plan.pop('_id', None)
-        return final_plan
-        
+    except DuplicateKeyError:
+        return await db.training_plans.find_one({"id": final_plan["id"]}, {"_id": 0})
+    # Remove _id before returning
+    final_plan.pop('_id', None)
+    return final_plan
+
+HEALTH_CONTEXT_PROJECTION = {"_id": 0, "profile": 1, "anamnesis": 1}
+
+async def load_health_context(user_id: str) -> dict:
+    """profile and anamnesis straight from the database.
+
+    The user cache may lag another worker's PUT /auth/anamnesis by up to
+    USER_CACHE_TTL_SECONDS, and plan generation filters contraindications
+    on this data, so it never uses the cached copy.
+    """
+    doc = await db.users.find_one({"id": user_id}, HEALTH_CONTEXT_PROJECTION) or {}
+    return {"profile": doc.get("profile") or {}, "anamnesis": doc.get("anamnesis") or {}}
+
+@api_router.post("/plans/generate")
+@single_flight("plans.generate", unless=lambda params: params.get("mode") == "stream")
+async def generate_ai_plan(
+    request: AITrainingPlanRequest,
+    user: dict = Depends(get_current_user),
+    mode: str = Query("sync", pattern="^(sync|job|stream|hedged)$")
+):
+    user = {**user, **await load_health_context(user["id"])}
+    if mode == "job":
+        # Returns at once; the client polls GET /plans/jobs/{id}
+        job = await plan_jobs.enqueue(request, user)
+        return FastJSONResponse(plan_job_view(job), status_code=status.HTTP_202_ACCEPTED)
+    if mode == "stream":
+        return StreamingResponse(
+            stream_ai_plan(request, user["id"], user.get("profile", {}), user.get("anamnesis", {})),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    create = plan_hedger.create if mode == "hedged" else create_ai_plan
+    try:
+        return await create(request, user["id"], user.get("profile", {}), user.get("anamnesis", {}))
     except Exception as e:
         logger.error(f"AI Plan generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Fehler bei der Plan-Generierung: {str(e)}")
 
+# ============== PLAN GENERATION STREAM ==============
+
+class LLMPlanStreamParser:
+    """Picks the exercises out of a plan completion while it streams in.
+
+    Everything up to the "exercises" key is skipped; from its opening bracket
+    on the text goes through a JSONArrayStreamParser, so each exercise object
+    comes out as soon as its closing brace has arrived. The whole completion
+    is kept as well (it is at most max_tokens long) for name and description.
+    """
+
+    EXERCISES_KEY = re.compile(r'"exercises"\s*:\s*(?=\[)')
+    MAX_EXERCISE_CHARS = 4000
+
+    def __init__(self):
+        self.content = ""
+        self.array = None
+
+    def feed(self, text: str):
+        """Yield the exercise objects completed by this chunk"""
+        self.content += text
+        if self.array is None:
+            match = self.EXERCISES_KEY.search(self.content)
+            if match is None:
+                return
+            self.array = JSONArrayStreamParser(self.MAX_EXERCISE_CHARS)
+            text = self.content[match.end():]
+        if not self.array.finished:
+            yield from self.array.feed(text)
+
+    def finish(self) -> dict:
+        """Name and description of the finished plan; raises if the exercises array never closed"""
+        if self.array is None or not self.array.finished:
+            raise ValueError("Completion ended inside the exercises array")
+        try:
+            plan_data = parse_llm_plan(self.content)
+        except json.JSONDecodeError:
+            plan_data = {}  # the exercises are complete, only the surrounding object is broken
+        return {key: plan_data[key] for key in ("name", "description") if isinstance(plan_data.get(key), str)}
+
+def sse_event(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dump_json(data) + b"\n\n"
+
+async def stream_ai_plan(request: AITrainingPlanRequest, user_id: str, profile: dict, anamnesis: dict):
+    """Server-sent events for POST /plans/generate?mode=stream.
+
+    exercise: one validated WorkoutExercise, sent as soon as the LLM finishes it
+    reset:    the LLM failed after sending exercises; discard them, the
+              rule-based ones follow
+    plan:     the stored plan, last event of a successful stream
+    error:    the plan could not be stored
+    """
+    catalog = await get_catalog()
+    fingerprint = plan_fingerprint(request, profile, anamnesis, catalog.version)
+    plan_data = await plan_cache.get(fingerprint)
+    streamed = False
+    
+    if plan_data is None:
+        exercises = []
+        try:
+            parser = LLMPlanStreamParser()
+            exercise_context = plan_prompt_context.for_plan(catalog, request, profile, anamnesis)
+            completion = llm_gateway.stream(**llm_plan_completion_args(request, profile, anamnesis, exercise_context))
+            async with contextlib.aclosing(completion) as deltas:
+                async for delta in deltas:
+                    for value in parser.feed(delta):
+                        exercise = plan_exercise_or_none(value, catalog)
+                        if exercise is not None:
+                            exercises.append(exercise)
+                            yield sse_event("exercise", exercise)
+            plan_data = {**parser.finish(), "exercises": exercises}
+            if not exercises:
+                raise ValueError("No usable exercises in completion")
+            await plan_cache.set(fingerprint, plan_data, catalog.version)
+            streamed = True
+            logger.info("AI plan streamed successfully")
+        except Exception as ai_error:
+            logger.warning(f"AI stream failed, using smart fallback: {str(ai_error)}")
+            if exercises:
+                yield sse_event("reset", {})
+            plan_data = await generate_smart_plan(request, profile, anamnesis)
+    
+    if not streamed:
+        for exercise in plan_data.get("exercises", []):
+            yield sse_event("exercise", exercise)
+    
+    try:
+        plan = await store_ai_plan(request, user_id, plan_data)
+    except Exception as e:
+        logger.error(f"AI Plan stream error: {str(e)}")
+        yield sse_event("error", {"detail": f"Fehler bei der Plan-Generierung: {str(e)}"})
+        return
+    yield sse_event("plan", plan)
+
+# ============== PLAN GENERATION HEDGING ==============
+
+class PlanHedger:
+    """Bounds plan generation latency by PLAN_HEDGE_SLO_SECONDS (mode=hedged).
+
+    The LLM call starts first and the rule-based plan is built while it runs.
+    If the LLM has not answered by the deadline, the rule-based plan is
+    stored with is_ai_generated False and returned. The LLM call keeps
+    running in the background; when it answers, the stored plan is upgraded
+    in place, unless the user has changed it in the meantime.
+    """
+
+    def __init__(self, slo_seconds: float):
+        self.slo_seconds = slo_seconds
+        self._upgrades = set()
+        self.requests = 0
+        self.llm_in_time = 0
+        self.rule_based_served = 0
+        self.upgraded = 0
+        self.upgrade_failed = 0
+        self.upgrade_skipped = 0
+
+    async def create(self, request: AITrainingPlanRequest, user_id: str, profile: dict, anamnesis: dict) -> dict:
+        self.requests += 1
+        deadline = time.monotonic() + self.slo_seconds
+        catalog = await get_catalog()
+        fingerprint = plan_fingerprint(request, profile, anamnesis, catalog.version)
+        plan_data = await plan_cache.get(fingerprint)
+        if plan_data is not None:
+            return await store_ai_plan(request, user_id, plan_data)
+
+        llm = asyncio.create_task(generate_llm_plan(request, profile, anamnesis))
+        # Marks a failure retrieved even if nobody gets to await the task
+        llm.add_done_callback(lambda task: task.cancelled() or task.exception())
+        try:
+            smart_data = await generate_smart_plan(request, profile, anamnesis)
+            await asyncio.wait({llm}, timeout=max(deadline - time.monotonic(), 0))
+            # Decided here: an answer arriving during the insert below still goes to _upgrade
+            late = not llm.done()
+            if not late:
+                if llm.exception() is None:
+                    self.llm_in_time += 1
+                    await plan_cache.set(fingerprint, llm.result(), catalog.version)
+                    return await store_ai_plan(request, user_id, llm.result())
+                logger.warning(f"AI generation failed, using smart fallback: {str(llm.exception())}")
+            self.rule_based_served += 1
+            plan = await store_ai_plan(request, user_id, smart_data, is_ai_generated=False)
+        except BaseException:
+            llm.cancel()
+            raise
+
+        if late:
+            task = asyncio.create_task(self._upgrade(llm, plan, fingerprint, catalog.version))
+            self._upgrades.add(task)
+            task.add_done_callback(self._upgrades.discard)
+        return plan
+
+    async def _upgrade(self, llm: asyncio.Task, plan: dict, fingerprint: str, catalog_version: Optional[int]):
+        try:
+            plan_data = await llm
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.upgrade_failed += 1
+            logger.warning(f"Late AI plan failed, keeping rule-based plan {plan['id']}: {str(e)}")
+            return
+        await plan_cache.set(fingerprint, plan_data, catalog_version)
+
+        # Only replace the plan as it was stored; an edited or deleted plan is left alone
+        result = await db.training_plans.update_one(
+            {"id": plan["id"], "is_ai_generated": False, "name": plan["name"], "exercises": plan["exercises"]},
+            {"$set": {
+                "name": plan_data.get("name", plan["name"]),
+                "description": plan_data.get("description", ""),
+                "exercises": plan_data.get("exercises", []),
+                "is_ai_generated": True
+            }}
+        )
+        if result.modified_count:
+            self.upgraded += 1
+        else:
+            self.upgrade_skipped += 1
+
+    async def stop(self):
+        for task in list(self._upgrades):
+            task.cancel()
+        await asyncio.gather(*self._upgrades, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "slo_seconds": self.slo_seconds,
+            "requests": self.requests,
+            "llm_in_time": self.llm_in_time,
+            "rule_based_served": self.rule_based_served,
+            "pending_upgrades": len(self._upgrades),
+            "upgraded": self.upgraded,
+            "upgrade_failed": self.upgrade_failed,
+            "upgrade_skipped": self.upgrade_skipped
+        }
+
+plan_hedger = PlanHedger(PLAN_HEDGE_SLO_SECONDS)
+
+# ============== PLAN GENERATION JOBS ==============
+
+PLAN_JOB_ACTIVE = ("queued", "running")
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    # Motor returns naive UTC datetimes
+    if value is None:
+        return None
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).isoformat()
+
+def plan_job_view(job: dict, plan: Optional[dict] = None) -> dict:
+    view = {
+        "id": job["id"],
+        "status": job["status"],
+        "plan_id": job["plan_id"],
+        "attempts": job.get("attempts", 0),
+        "error": job.get("error"),
+        "created_at": _iso(job.get("created_at")),
+        "finished_at": _iso(job.get("finished_at"))
+    }
+    if plan is not None:
+        view["plan"] = plan
+    return view
+
+class PlanJobQueue:
+    """Mongo-backed queue for plan generation, worked by in-process async workers.
+
+    Jobs are claimed atomically with find_one_and_update and held under a
+    lease that the worker renews; a job whose worker died is reclaimed once
+    its lease runs out. The plan id is fixed at enqueue time, so a reclaimed
+    job can never store a second plan.
+    """
+
+    def __init__(self, workers: int):
+        self.worker_count = workers
+        self.process_id = uuid.uuid4().hex[:8]
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.abandoned = 0
+        self.in_flight = 0
+        self._workers: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._finished = asyncio.Event()
+
+    async def enqueue(self, request: AITrainingPlanRequest, user: dict) -> dict:
+        now = datetime.now(timezone.utc)
+        job = {
+            "id": str(uuid.uuid4()),
+            "plan_id": str(uuid.uuid4()),
+            "user_id": user["id"],
+            "status": "queued",
+            "request": request.model_dump(),
+            # Snapshot, so the plan matches the profile at request time
+            "profile": user.get("profile") or {},
+            "anamnesis": user.get("anamnesis") or {},
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now
+        }
+        await db.plan_jobs.insert_one(job)
+        job.pop("_id", None)
+        self._wakeup.set()
+        return job
+
+    async def claim(self, worker_id: str) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        lease = {
+            "status": "running",
+            "worker": worker_id,
+            "lease_until": now + timedelta(seconds=PLAN_JOB_LEASE_SECONDS),
+            "updated_at": now
+        }
+        for query in ({"status": "queued"}, {"status": "running", "lease_until": {"$lt": now}}):
+            job = await db.plan_jobs.find_one_and_update(
+                query,
+                {"$set": lease, "$inc": {"attempts": 1}},
+                sort=[("created_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+            if job is not None:
+                job.pop("_id", None)
+                return job
+        return None
+
+    async def _finish(self, job: dict, worker_id: str, changes: dict) -> bool:
+        result = await db.plan_jobs.update_one(
+            {"id": job["id"], "worker": worker_id, "status": "running"},
+            {"$set": {**changes, "updated_at": datetime.now(timezone.utc)}, "$unset": {"lease_until": ""}}
+        )
+        event, self._finished = self._finished, asyncio.Event()
+        event.set()
+        return result.modified_count == 1
+
+    async def _heartbeat(self, job: dict, worker_id: str):
+        """Renew the lease until cancelled; returns once the lease is lost.
+
+        A failed renewal is retried while the current lease still outlasts the
+        next attempt. After that another worker may reclaim the job at any
+        moment, so the lease counts as lost.
+        """
+        interval = PLAN_JOB_LEASE_SECONDS / 3
+        lease_expires = time.monotonic() + PLAN_JOB_LEASE_SECONDS  # no later than the lease set by claim
+        while True:
+            await asyncio.sleep(interval)
+            attempted = time.monotonic()
+            try:
+                result = await asyncio.wait_for(db.plan_jobs.update_one(
+                    {"id": job["id"], "worker": worker_id, "status": "running"},
+                    {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=PLAN_JOB_LEASE_SECONDS)}}
+                ), interval)
+            except Exception as e:
+                if time.monotonic() + interval >= lease_expires:
+                    logger.error(f"Plan job {job['id']} lease could not be renewed, abandoning it: {str(e)}")
+                    return
+                logger.warning(f"Plan job {job['id']} lease renewal failed, retrying: {str(e)}")
+                continue
+            if result.matched_count == 0:
+                logger.warning(f"Plan job {job['id']} lease lost, abandoning it")
+                return
+            lease_expires = attempted + PLAN_JOB_LEASE_SECONDS
+
+    async def _generate(self, job: dict):
+        if await db.training_plans.find_one({"id": job["plan_id"]}, {"_id": 1}) is not None:
+            return  # an earlier attempt stored the plan but died before finishing the job
+        request = AITrainingPlanRequest(**job["request"])
+        await create_ai_plan(request, job["user_id"], job["profile"], job["anamnesis"], plan_id=job["plan_id"])
+
+    async def _run(self, job: dict, worker_id: str):
+        if job["attempts"] > PLAN_JOB_MAX_ATTEMPTS:
+            self.failed += 1
+            await self._finish(job, worker_id, {
+                "status": "failed", "error": "Zu viele Versuche", "finished_at": datetime.now(timezone.utc)
+            })
+            return
+
+        self.in_flight += 1
+        generation = asyncio.create_task(self._generate(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, worker_id))
+        try:
+            await asyncio.wait({generation, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if not generation.done():
+                # The heartbeat only stops on its own when the lease is lost (or
+                # it crashed); stop generating before another worker takes over
+                if heartbeat.exception() is not None:
+                    logger.error(f"Plan job {job['id']} heartbeat failed, abandoning it: {str(heartbeat.exception())}")
+                generation.cancel()
+                await asyncio.wait({generation})
+                self.abandoned += 1
+                return
+            generation.result()
+            self.processed += 1
+            await self._finish(job, worker_id, {"status": "done", "error": None, "finished_at": datetime.now(timezone.utc)})
+        except asyncio.CancelledError:
+            # Shutdown: hand the job back without spending an attempt
+            generation.cancel()
+            await db.plan_jobs.update_one(
+                {"id": job["id"], "worker": worker_id, "status": "running"},
+                {"$set": {"status": "queued"}, "$unset": {"lease_until": "", "worker": ""}, "$inc": {"attempts": -1}}
+            )
+            raise
+        except Exception as e:
+            logger.error(f"Plan job {job['id']} failed (attempt {job['attempts']}): {str(e)}")
+            if job["attempts"] < PLAN_JOB_MAX_ATTEMPTS:
+                self.retried += 1
+                await self._finish(job, worker_id, {"status": "queued", "error": str(e)})
+            else:
+                self.failed += 1
+                await self._finish(job, worker_id, {
+                    "status": "failed", "error": str(e), "finished_at": datetime.now(timezone.utc)
+                })
+        finally:
+            heartbeat.cancel()
+            if heartbeat.done() and not heartbeat.cancelled():
+                heartbeat.exception()  # retrieved, even when the generation finished first
+            self.in_flight -= 1
+
+    async def _work(self, worker_id: str):
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await self.claim(worker_id)
+            except Exception as e:
+                logger.error(f"Plan job claim failed: {str(e)}")
+                job = None
+            if job is None:
+                # Jobs enqueued by other processes are picked up on the next poll
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), PLAN_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job, worker_id)
+
+    def start(self):
+        self._workers = [
+            asyncio.create_task(self._work(f"{self.process_id}-{n}")) for n in range(self.worker_count)
+        ]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def wait_finished(self, timeout: float):
+        """Wait until any local job finishes, or the timeout passes"""
+        try:
+            await asyncio.wait_for(self._finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "abandoned": self.abandoned
+        }
+
+plan_jobs = PlanJobQueue(PLAN_JOB_WORKERS)
+
+@api_router.get("/plans/jobs/{job_id}")
+async def get_plan_job(
+    job_id: str,
+    user: dict = Depends(get_current_user),
+    wait: float = Query(0, ge=0, le=PLAN_JOB_MAX_WAIT_SECONDS)
+):
+    """Job status; with wait > 0, long-poll until the job finishes or wait seconds pass"""
+    query = {"id": job_id, "user_id": user["id"]}
+    projection = {"_id": 0, "request": 0, "profile": 0, "anamnesis": 0}
+    job = await db.plan_jobs.find_one(query, projection)
+    if not job:
+        raise HTTPException(status_code=404, detail="Auftrag nicht gefunden")
+    
+    deadline = time.monotonic() + wait
+    while job["status"] in PLAN_JOB_ACTIVE and deadline > time.monotonic():
+        await plan_jobs.wait_finished(min(deadline - time.monotonic(), PLAN_JOB_POLL_SECONDS))
+        job = await db.plan_jobs.find_one(query, projection)
+    
+    plan = None
+    if job["status"] == "done":
+        plan = await db.training_plans.find_one({"id": job["plan_id"]}, {"_id": 0})
+    return plan_job_view(job, plan)
+
+# ============== WORKOUT STATISTICS ==============
+
+# Per-user document in `workout_stats`, maintained by log_workout:
+# {"user_id", "total_workouts", "total_duration_minutes",
+#  "days": {"YYYY-MM-DD": {"workouts": n, "duration": minutes}}}
+
+DAY_KEY_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+STATS_WINDOW_DAYS = 31  # covers this week, this month and the 30-day series
+STREAK_CHUNK_DAYS = 365
+
+def workout_day(date_value) -> Optional[str]:
+    """Day bucket of a workout date; None if it can't be used as a field name"""
+    day = str(date_value or "")[:10]
+    return day if DAY_KEY_PATTERN.match(day) else None
+
+def workout_stats_update(workouts: List[dict]) -> dict:
+    """$inc update folding the given workouts of one user into their stats"""
+    inc = {"total_workouts": 0, "total_duration_minutes": 0}
+    for workout in workouts:
+        duration = workout.get("duration_minutes") or 0
+        inc["total_workouts"] += 1
+        inc["total_duration_minutes"] += duration
+        day = workout_day(workout.get("date"))
+        if day:
+            inc[f"days.{day}.workouts"] = inc.get(f"days.{day}.workouts", 0) + 1
+            inc[f"days.{day}.duration"] = inc.get(f"days.{day}.duration", 0) + duration
+    return {"$inc": inc}
+
+async def rebuild_workout_stats(user_id: Optional[str] = None, only_missing: bool = False) -> int:
+    """Recompute stats documents from workout_logs (all users, or one); returns users written.
+
+    only_missing creates the document with $setOnInsert and leaves an
+    existing one alone, so a lazy backfill can't overwrite $inc updates
+    that landed after its snapshot.
+    """
+    pipeline = [
+        {"$match": {"user_id": user_id} if user_id else {}},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "day": {"$substrCP": ["$date", 0, 10]}},
+            "workouts": {"$sum": 1},
+            "duration": {"$sum": {"$ifNull": ["$duration_minutes", 0]}}
+        }},
+        {"$sort": {"_id.user_id": 1}}
+    ]
+
+    async def store(doc):
+        if only_missing:
+            fields = {key: value for key, value in doc.items() if key != "user_id"}
+            await db.workout_stats.update_one({"user_id": doc["user_id"]}, {"$setOnInsert": fields}, upsert=True)
+        else:
+            await db.workout_stats.replace_one({"user_id": doc["user_id"]}, doc, upsert=True)
+
+    written = 0
+    doc = None
+    async for row in db.workout_logs.aggregate(pipeline, allowDiskUse=True):
+        if doc is None or doc["user_id"] != row["_id"]["user_id"]:
+            if doc is not None:
+                await store(doc)
+                written += 1
+            doc = {"user_id": row["_id"]["user_id"], "total_workouts": 0, "total_duration_minutes": 0, "days": {}}
+        doc["total_workouts"] += row["workouts"]
+        doc["total_duration_minutes"] += row["duration"]
+        day = workout_day(row["_id"]["day"])
+        if day:
+            doc["days"][day] = {"workouts": row["workouts"], "duration": row["duration"]}
+
+    if doc is None and user_id:
+        # Remember that this user has no history yet
+        doc = {"user_id": user_id, "total_workouts": 0, "total_duration_minutes": 0, "days": {}}
+    if doc is not None:
+        await store(doc)
+        written += 1
+    return written
+
+def empty_workout_stats() -> dict:
+    return {
+        "total_workouts": 0,
+        "total_duration_minutes": 0,
+        "workouts_this_week": 0,
+        "workouts_this_month": 0,
+        "streak_days": 0,
+        "progress_data": []
+    }
+
+def progress_series(now: datetime, days: Dict[str, dict]) -> List[dict]:
+    """Last 30 days, oldest first, from per-day {workouts, duration} buckets"""
+    progress_data = []
+    for i in range(30):
+        date = (now - timedelta(days=29-i)).strftime("%Y-%m-%d")
+        day = days.get(date, {})
+        progress_data.append({
+            "date": date,
+            "workouts": day.get("workouts", 0),
+            "duration": day.get("duration", 0)
+        })
+    return progress_data
+
+def workout_stats_pipeline(user_id: str, now: datetime) -> List[dict]:
+    """Everything /workouts/stats needs in one round trip; only counters leave the server"""
+    today = now.strftime("%Y-%m-%d")
+    today_start = datetime.strptime(today, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    week_ago = (now - timedelta(days=7)).strftime("%Y-%m-%d")
+    month_ago = (now - timedelta(days=30)).strftime("%Y-%m-%d")
+    series_start = (now - timedelta(days=29)).strftime("%Y-%m-%d")
+    return [
+        {"$match": {"user_id": user_id}},
+        {"$project": {
+            "_id": 0,
+            "day": {"$substrCP": ["$date", 0, 10]},
+            "duration": {"$ifNull": ["$duration_minutes", 0]}
+        }},
+        {"$facet": {
+            "totals": [
+                {"$group": {"_id": None, "workouts": {"$sum": 1}, "duration": {"$sum": "$duration"}}}
+            ],
+            "windows": [
+                {"$match": {"day": {"$gte": month_ago, "$lte": today}}},
+                {"$group": {
+                    "_id": None,
+                    "month": {"$sum": 1},
+                    "week": {"$sum": {"$cond": [{"$gte": ["$day", week_ago]}, 1, 0]}}
+                }}
+            ],
+            "series": [
+                {"$match": {"day": {"$gte": series_start, "$lte": today}}},
+                {"$group": {"_id": "$day", "workouts": {"$sum": 1}, "duration": {"$sum": "$duration"}}}
+            ],
+            # Days since each training day, ascending; the streak is the length
+            # of the run 0, 1, 2, ... at the start of that list
+            "streak": [
+                {"$match": {"day": {"$lte": today}}},
+                {"$group": {"_id": "$day"}},
+                {"$project": {"offset": {"$divide": [
+                    {"$subtract": [
+                        today_start,
+                        {"$dateFromString": {"dateString": "$_id", "format": "%Y-%m-%d", "onError": None}}
+                    ]},
+                    86400000
+                ]}}},
+                {"$match": {"offset": {"$ne": None}}},
+                {"$sort": {"offset": 1}},
+                {"$group": {"_id": None, "offsets": {"$push": "$offset"}}},
+                {"$project": {"_id": 0, "days": {"$reduce": {
+                    "input": "$offsets",
+                    "initialValue": 0,
+                    "in": {"$cond": [{"$eq": ["$$this", "$$value"]}, {"$add": ["$$value", 1]}, "$$value"]}
+                }}}}
+            ]
+        }}
+    ]
+
+async def aggregate_workout_stats(user_id: str) -> dict:
+    """Alternative to the stats documents: compute /workouts/stats from workout_logs in MongoDB"""
+    now = datetime.now(timezone.utc)
+    result = (await db.workout_logs.aggregate(workout_stats_pipeline(user_id, now)).to_list(1))[0]
+    if not result["totals"]:
+        return empty_workout_stats()
+    
+    totals = result["totals"][0]
+    windows = result["windows"][0] if result["windows"] else {"week": 0, "month": 0}
+    days = {row["_id"]: row for row in result["series"]}
+    return {
+        "total_workouts": totals["workouts"],
+        "total_duration_minutes": totals["duration"],
+        "workouts_this_week": windows["week"],
+        "workouts_this_month": windows["month"],
+        "streak_days": int(result["streak"][0]["days"]) if result["streak"] else 0,
+        "progress_data": progress_series(now, days)
+    }
+
+def exercise_progress_pipeline(user_id: str, exercise_id: str) -> List[dict]:
+    """Progress straight from workout_logs; superseded by the exercise_progress
+    collection and kept as the baseline in benchmarks/workout_stats.py"""
+    return [
+        {"$match": {"user_id": user_id, "exercises.exercise_id": exercise_id}},
+        {"$unwind": "$exercises"},
+        {"$match": {"exercises.exercise_id": exercise_id}},
+        # created_at keeps entries of the same day in logging order
+        {"$sort": {"date": 1, "created_at": 1}},
+        {"$project": {
+            "_id": 0,
+            "date": 1,
+            "weight": {"$ifNull": ["$exercises.weight_used", None]},
+            "sets": {"$ifNull": ["$exercises.sets_completed", None]},
+            "reps": {"$ifNull": ["$exercises.reps_completed", None]}
+        }}
+    ]
+
+async def load_workout_stats(user_id: str, days: List[str]) -> Optional[dict]:
+    projection = {"_id": 0, "total_workouts": 1, "total_duration_minutes": 1}
+    projection.update({f"days.{day}": 1 for day in days})
+    return await db.workout_stats.find_one({"user_id": user_id}, projection)
+
 # ============== WORKOUT LOGGING ==============
 
 @api_router.post("/workouts")
@@ -619,944 +2670,1478 @@ async def log_workout(workout: WorkoutLog, user: dict = Depends(get_current_user
     workout_data["id"] = str(uuid.uuid4())
     workout_data["user_id"] = user["id"]
     workout_data["created_at"] = datetime.now(timezone.utc).isoformat()
+    await prepare_workout_side_effects(user["id"])
     await db.workout_logs.insert_one(workout_data)
+    await apply_workout_side_effects(user["id"], [workout_data])
+    # Remove _id before returning
+    workout_data.pop('_id', None)
     return workout_data
 
+workout_stats_ready = LRUCache(USER_CACHE_SIZE)  # users known to have a stats document
+
+async def prepare_workout_side_effects(user_id: str):
+    """Backfill the user's stats and progress before new workouts are inserted.
+
+    Any stats snapshot that could contain a live workout is then taken after the
+    document exists, and its $setOnInsert is a no-op, so the workout is
+    counted exactly once: by its own $inc.
+    """
+    await progress_backfill.ensure(user_id)
+    if workout_stats_ready.get(user_id):
+        return
+    if await db.workout_stats.find_one({"user_id": user_id}, {"_id": 1}) is None:
+        await rebuild_workout_stats(user_id, only_missing=True)
+    workout_stats_ready.set(user_id, True)
+
+async def apply_workout_side_effects(user_id: str, workouts: List[dict]):
+    """Fold newly stored workouts of one user into workout_stats and exercise_progress.
+
+    Call prepare_workout_side_effects before inserting the workouts.
+    """
+    if not workouts:
+        return
+    await db.workout_stats.update_one({"user_id": user_id}, workout_stats_update(workouts))
+    progress_entries = [entry for workout in workouts for entry in exercise_progress_entries(workout)]
+    if progress_entries:
+        await insert_progress_entries(progress_entries)
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+    """The [date, id] pair of a cursor; anything else is rejected so it can't reach the query as an operator"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not (isinstance(values, list) and len(values) == 2 and all(isinstance(value, str) for value in values)):
+        raise HTTPException(status_code=400, detail="Ungültiger Cursor")
+    return values
+
 @api_router.get("/workouts")
 async def get_workouts(
     user: dict = Depends(get_current_user),
-    limit: int = 50,
-    skip: int = 0
+    limit: int = Query(50, ge=1, le=WORKOUT_PAGE_MAX_LIMIT),
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None
 ):
-    workouts = await db.workout_logs.find(
-        {"user_id": user["id"]}, 
-        {"_id": 0}
-    ).sort("date", -1).skip(skip).limit(limit).to_list(limit)
-    return workouts
+    sort = [("date", DESCENDING), ("id", DESCENDING)]
+    
+    if cursor is None:
+        # Offset paging for app builds without cursor support
+        workouts = await db.workout_logs.find(
+            {"user_id": user["id"]}, 
+            {"_id": 0}
+        ).sort(sort).skip(skip).limit(limit).to_list(limit)
+        return workouts
+    
+    # Keyset paging on (date, id): an empty cursor requests the first page
+    query = {"user_id": user["id"]}
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"date": {"$lt": last_date}},
+            {"date": last_date, "id": {"$lt": last_id}}
+        ]
+    workouts = await db.workout_logs.find(query, {"_id": 0}).sort(sort).limit(limit + 1).to_list(limit + 1)
+    
+    next_cursor = None
+    if len(workouts) > limit:
+        workouts = workouts[:limit]
+        next_cursor = encode_cursor([workouts[-1]["date"], workouts[-1]["id"]])
+    return {"items": workouts, "next_cursor": next_cursor}
 
 @api_router.get("/workouts/stats")
+@single_flight("workouts.stats")
 async def get_workout_stats(user: dict = Depends(get_current_user)):
-    # Get all workouts
-    workouts = await db.workout_logs.find({"user_id": user["id"]}, {"_id": 0}).to_list(1000)
-    
-    if not workouts:
-        return {
-            "total_workouts": 0,
-            "total_duration_minutes": 0,
-            "workouts_this_week": 0,
-            "workouts_this_month": 0,
-            "streak_days": 0,
-            "progress_data": []
-        }
+    if WORKOUT_STATS_SOURCE == "aggregate":
+        return await aggregate_workout_stats(user["id"])
     
     now = datetime.now(timezone.utc)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
+    window = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(STATS_WINDOW_DAYS)]
     
-    total_duration = sum(w.get("duration_minutes", 0) for w in workouts)
+    # Single indexed read, projected to the days we need
+    stats = await load_workout_stats(user["id"], window)
+    if stats is None:
+        # Users from before the stats documents existed
+        await rebuild_workout_stats(user["id"], only_missing=True)
+        stats = await load_workout_stats(user["id"], window)
     
-    workouts_this_week = len([w for w in workouts if w.get("date", "") >= week_ago.strftime("%Y-%m-%d")])
-    workouts_this_month = len([w for w in workouts if w.get("date", "") >= month_ago.strftime("%Y-%m-%d")])
+    if not stats or not stats.get("total_workouts"):
+        return empty_workout_stats()
     
-    # Calculate streak
-    dates = sorted(set(w.get("date", "")[:10] for w in workouts), reverse=True)
+    days = stats.get("days", {})
+    week_ago = (now - timedelta(days=7)).strftime("%Y-%m-%d")
+    month_ago = (now - timedelta(days=30)).strftime("%Y-%m-%d")
+    
+    workouts_this_week = sum(d["workouts"] for day, d in days.items() if day >= week_ago)
+    workouts_this_month = sum(d["workouts"] for day, d in days.items() if day >= month_ago)
+    
+    # Calculate streak, reading further back only while it continues
     streak = 0
-    today = now.strftime("%Y-%m-%d")
-    for i, date in enumerate(dates):
-        expected = (now - timedelta(days=i)).strftime("%Y-%m-%d")
-        if date == expected:
+    while streak < len(window) and window[streak] in days:
+        streak += 1
+    while streak == len(window):
+        older = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(len(window), len(window) + STREAK_CHUNK_DAYS)]
+        older_days = (await load_workout_stats(user["id"], older) or {}).get("days", {})
+        window += older
+        while streak < len(window) and window[streak] in older_days:
             streak += 1
-        else:
-            break
-    
-    # Progress data (last 30 days)
-    progress_data = []
-    for i in range(30):
-        date = (now - timedelta(days=29-i)).strftime("%Y-%m-%d")
-        day_workouts = [w for w in workouts if w.get("date", "").startswith(date)]
-        progress_data.append({
-            "date": date,
-            "workouts": len(day_workouts),
-            "duration": sum(w.get("duration_minutes", 0) for w in day_workouts)
-        })
     
     return {
-        "total_workouts": len(workouts),
-        "total_duration_minutes": total_duration,
+        "total_workouts": stats["total_workouts"],
+        "total_duration_minutes": stats.get("total_duration_minutes", 0),
         "workouts_this_week": workouts_this_week,
         "workouts_this_month": workouts_this_month,
         "streak_days": streak,
-        "progress_data": progress_data
+        "progress_data": progress_series(now, days)
     }
 
 # ============== EXERCISE PROGRESS TRACKING ==============
 
+# One compact document per logged exercise in `exercise_progress`, written by
+# log_workout, so charting one lift is an index range scan
+PROGRESS_PROJECTION = {"_id": 0, "date": 1, "weight": 1, "sets": 1, "reps": 1}
+PROGRESS_BATCH_SIZE = 1000
+
+def exercise_progress_entries(workout: dict) -> List[dict]:
+    # The _id is derived from the workout, so writing an entry twice (a live
+    # insert racing a rebuild) hits the unique _id instead of duplicating it
+    return [
+        {
+            "_id": f"{workout['id']}:{i}",
+            "user_id": workout["user_id"],
+            "exercise_id": ex["exercise_id"],
+            "date": workout["date"],
+            "logged_at": workout.get("created_at"),
+            "workout_id": workout["id"],
+            "weight": ex.get("weight_used"),
+            "sets": ex.get("sets_completed"),
+            "reps": ex.get("reps_completed")
+        }
+        for i, ex in enumerate(workout.get("exercises", []))
+        if isinstance(ex, dict) and isinstance(ex.get("exercise_id"), str)
+    ]
+
+async def insert_progress_entries(entries: List[dict]):
+    """insert_many that skips entries which are already stored"""
+    try:
+        await db.exercise_progress.insert_many(entries, ordered=False)
+    except BulkWriteError as e:
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])) or e.details.get("writeConcernErrors"):
+            raise
+
+async def rebuild_exercise_progress(user_id: Optional[str] = None) -> int:
+    """Recreate exercise_progress from workout_logs (all users, or one); returns entries written"""
+    match = {"user_id": user_id} if user_id else {}
+    await db.exercise_progress.delete_many(match)
+    
+    written = 0
+    batch = []
+    user_ids = {user_id} if user_id else set()
+    async for workout in db.workout_logs.find(match, {"_id": 0, "id": 1, "user_id": 1, "date": 1, "created_at": 1, "exercises": 1}):
+        user_ids.add(workout["user_id"])
+        batch.extend(exercise_progress_entries(workout))
+        if len(batch) >= PROGRESS_BATCH_SIZE:
+            await insert_progress_entries(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        await insert_progress_entries(batch)
+        written += len(batch)
+    await progress_backfill.mark(user_ids)
+    return written
+
+class ProgressBackfill:
+    """Which users' workout history has been copied into exercise_progress.
+
+    Users from before exercise_progress existed have workout_logs but no
+    entries. Their first progress read rebuilds them once and leaves a
+    marker in progress_backfills; each worker remembers marked users, so
+    later reads cost no extra query. Concurrent calls for one user share
+    a single run; different users don't wait for each other.
+    """
+
+    def __init__(self, maxsize: int):
+        self.known = LRUCache(maxsize)
+        self.backfilled = 0
+        self._runs = SingleFlight()
+
+    async def ensure(self, user_id: str):
+        if self.known.get(user_id):
+            return
+        await self._runs.do(("progress.backfill", user_id), functools.partial(self._backfill, user_id))
+
+    async def _backfill(self, user_id: str):
+        if await db.progress_backfills.find_one({"user_id": user_id}, {"_id": 1}) is None:
+            await rebuild_exercise_progress(user_id)
+            self.backfilled += 1
+        self.known.set(user_id, True)
+
+    async def mark(self, user_ids):
+        if not user_ids:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        await db.progress_backfills.bulk_write([
+            UpdateOne({"user_id": uid}, {"$setOnInsert": {"user_id": uid, "created_at": now}}, upsert=True)
+            for uid in user_ids
+        ], ordered=False)
+
+    def stats(self) -> dict:
+        return {**self.known.stats(), "backfilled": self.backfilled}
+
+progress_backfill = ProgressBackfill(USER_CACHE_SIZE)
+
+def _numeric_or_null(field: str) -> dict:
+    return {"$cond": [{"$isNumber": f"${field}"}, f"${field}", None]}
+
+def progress_buckets_pipeline(query: dict, bucket: str, limit: Optional[int]) -> List[dict]:
+    """Week/month points holding the maximum of each value, oldest first.
+
+    Mongo 4.4 has no $dateTrunc: weeks start on the Monday found through
+    $isoDayOfWeek, months on the first. Dates that don't parse are their own
+    bucket.
+    """
+    day = {"$dateFromString": {"dateString": {"$substrCP": ["$date", 0, 10]}, "format": "%Y-%m-%d", "onError": None}}
+    if bucket == "month":
+        start = {"$dateToString": {"format": "%Y-%m-01", "date": "$$day"}}
+    else:
+        start = {"$dateToString": {"format": "%Y-%m-%d", "date": {"$subtract": [
+            "$$day", {"$multiply": [{"$subtract": [{"$isoDayOfWeek": "$$day"}, 1]}, 86400000]}
+        ]}}}
+    pipeline = [
+        {"$match": query},
+        {"$group": {
+            "_id": {"$let": {"vars": {"day": day}, "in": {"$cond": [{"$eq": ["$$day", None]}, "$date", start]}}},
+            "weight": {"$max": _numeric_or_null("weight")},
+            "sets": {"$max": _numeric_or_null("sets")},
+            "reps": {"$max": _numeric_or_null("reps")},
+            "entries": {"$sum": 1}
+        }},
+        {"$sort": {"_id": -1}},
+    ]
+    if limit:
+        pipeline.append({"$limit": limit})
+    pipeline += [
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "date": "$_id", "weight": 1, "sets": 1, "reps": 1, "entries": 1}}
+    ]
+    return pipeline
+
 @api_router.get("/progress/exercise/{exercise_id}")
-async def get_exercise_progress(exercise_id: str, user: dict = Depends(get_current_user)):
-    workouts = await db.workout_logs.find({"user_id": user["id"]}, {"_id": 0}).to_list(1000)
+@single_flight("progress.exercise")
+async def get_exercise_progress(
+    exercise_id: str,
+    user: dict = Depends(get_current_user),
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1),
+    bucket: Optional[str] = Query(None, pattern="^(week|month)$")
+):
+    await progress_backfill.ensure(user["id"])
+    query = {"user_id": user["id"], "exercise_id": exercise_id}
+    if from_date or to_date:
+        query["date"] = {}
+        if from_date:
+            query["date"]["$gte"] = from_date
+        if to_date:
+            # A bare day also includes that day's timestamped entries
+            query["date"]["$lte"] = to_date + "\uffff" if DAY_KEY_PATTERN.match(to_date) else to_date
     
-    progress = []
-    for workout in workouts:
-        for ex in workout.get("exercises", []):
-            if ex.get("exercise_id") == exercise_id:
-                progress.append({
-                    "date": workout.get("date"),
-                    "weight": ex.get("weight_used"),
-                    "sets": ex.get("sets_completed"),
-                    "reps": ex.get("reps_completed")
-                })
+    if bucket:
+        return await db.exercise_progress.aggregate(progress_buckets_pipeline(query, bucket, limit)).to_list(None)
     
-    progress.sort(key=lambda x: x["date"])
-    return progress
+    order = [("date", ASCENDING), ("logged_at", ASCENDING)]
+    if limit:
+        # Most recent points, returned oldest first like the full history
+        newest_first = [(field, DESCENDING) for field, _ in order]
+        entries = await db.exercise_progress.find(query, PROGRESS_PROJECTION).sort(newest_first).limit(limit).to_list(limit)
+        entries.reverse()
+        return entries
+    return await db.exercise_progress.find(query, PROGRESS_PROJECTION).sort(order).to_list(None)
+
+# ============== WORKOUT IMPORT ==============
+
+class ImportFormatError(ValueError):
+    """The upload cannot be parsed any further"""
+
+class JSONArrayStreamParser:
+    """Incremental parser for a JSON array that arrives in chunks.
+
+    Elements are decoded one at a time with raw_decode, so only the element
+    currently being received is buffered.
+    """
+
+    def __init__(self, max_element_chars: int):
+        self.max_element_chars = max_element_chars
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.count = 0
+        self.started = False
+        self.finished = False
+        self.expect_value = True
+
+    def feed(self, text: str, final: bool = False):
+        """Yield the elements completed by this chunk"""
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        while not self.finished:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos >= len(self.buffer):
+                break
+            char = self.buffer[self.pos]
+            if not self.started:
+                if char != "[":
+                    raise ImportFormatError("JSON-Array erwartet")
+                self.started = True
+                self.pos += 1
+            elif char == "]" and (not self.expect_value or self.count == 0):
+                self.finished = True
+                self.pos += 1
+            elif not self.expect_value:
+                if char != ",":
+                    raise ImportFormatError("',' oder ']' erwartet")
+                self.expect_value = True
+                self.pos += 1
+            else:
+                try:
+                    value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                except json.JSONDecodeError as e:
+                    if final or len(self.buffer) - self.pos > self.max_element_chars:
+                        raise ImportFormatError(f"Ungültiges JSON: {e.msg}")
+                    break  # element continues in the next chunk
+                if not final and not isinstance(value, (dict, list, str)):
+                    # A number split across chunks ("2." | "5") decodes early:
+                    # hold scalars back until the delimiter after them is here
+                    after = end
+                    while after < len(self.buffer) and self.buffer[after].isspace():
+                        after += 1
+                    if after == len(self.buffer) or self.buffer[after] not in ",]":
+                        if len(self.buffer) - self.pos > self.max_element_chars:
+                            raise ImportFormatError("Eintrag ist zu groß")
+                        break
+                self.count += 1
+                self.expect_value = False
+                self.pos = end
+                yield value
+        if final and not self.finished:
+            raise ImportFormatError("Unvollständiges JSON-Array")
+
+async def iter_import_entries(request: Request, max_entry_chars: int):
+    """Yield (line, value, error) from an NDJSON or JSON array upload.
+
+    NDJSON errors only affect their own line. A JSON array cannot be resynced
+    after a syntax error, so the parser reports it once and stops.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    array_parser = None
+    detected = False
+    pending = ""
+    line = 0
+
+    async def chunks():
+        async for chunk in request.stream():
+            yield text_decoder.decode(chunk), False
+        yield text_decoder.decode(b"", final=True), True
+
+    try:
+        async for text, final in chunks():
+            if not detected:
+                # The first non-whitespace character decides the format
+                pending += text
+                if not pending.strip() and not final:
+                    continue
+                detected = True
+                text, pending = pending, ""
+                if text.lstrip().startswith("["):
+                    array_parser = JSONArrayStreamParser(max_entry_chars)
+            if array_parser is not None:
+                for value in array_parser.feed(text, final):
+                    line += 1
+                    yield line, value, None
+                continue
+
+            pending += text
+            *lines, pending = pending.split("\n")
+            if final:
+                lines.append(pending)
+            for raw in lines:
+                line += 1
+                if not raw.strip():
+                    continue
+                try:
+                    yield line, json.loads(raw), None
+                except json.JSONDecodeError as e:
+                    yield line, None, f"Ungültiges JSON: {e.msg}"
+            if len(pending) > max_entry_chars:
+                yield line + 1, None, "Eintrag ist zu groß"
+                return
+    except ImportFormatError as e:
+        yield line + 1, None, str(e)
+    except UnicodeDecodeError:
+        yield line + 1, None, "Upload ist nicht UTF-8-kodiert"
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors())
+
+@api_router.post("/workouts/import")
+async def import_workouts(request: Request, user: dict = Depends(get_current_user)):
+    """Bulk import from a streamed NDJSON or JSON array upload.
+
+    Entries are validated like POST /workouts and written in unordered
+    batches; the response has one result per entry (line number or array
+    position).
+    """
+    results = []
+    batch = []
+    imported = 0
+    await prepare_workout_side_effects(user["id"])
+
+    async def flush():
+        nonlocal imported
+        docs = [workout for _, workout in batch]
+        failed = {}
+        try:
+            await db.workout_logs.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {err["index"]: err.get("errmsg", "Schreibfehler") for err in e.details.get("writeErrors", [])}
+        stored = [doc for i, doc in enumerate(docs) if i not in failed]
+        await apply_workout_side_effects(user["id"], stored)
+        for i, (line, workout) in enumerate(batch):
+            if i in failed:
+                results.append({"line": line, "status": "error", "error": failed[i]})
+            else:
+                results.append({"line": line, "status": "ok", "id": workout["id"]})
+        imported += len(stored)
+        batch.clear()
+
+    entries = 0
+    async for line, value, error in iter_import_entries(request, WORKOUT_IMPORT_MAX_ENTRY_CHARS):
+        entries += 1
+        if entries > WORKOUT_IMPORT_MAX_ENTRIES:
+            results.append({"line": line, "status": "error", "error": f"Maximal {WORKOUT_IMPORT_MAX_ENTRIES} Einträge pro Import"})
+            break
+        if error is None and not isinstance(value, dict):
+            error = "Eintrag ist kein JSON-Objekt"
+        if error is None:
+            try:
+                workout = WorkoutLog(**{**value, "user_id": user["id"]})
+            except ValidationError as e:
+                error = _validation_message(e)
+        if error is not None:
+            results.append({"line": line, "status": "error", "error": error})
+            continue
+
+        workout_data = workout.model_dump()
+        workout_data["id"] = str(uuid.uuid4())
+        workout_data["created_at"] = datetime.now(timezone.utc).isoformat()
+        batch.append((line, workout_data))
+        if len(batch) >= WORKOUT_IMPORT_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+    results.sort(key=lambda result: result["line"])
+    return {"imported": imported, "failed": len(results) - imported, "results": results}
+
+# ============== WORKOUT EXPORT ==============
+
+WORKOUT_EXPORT_CSV_COLUMNS = [
+    "workout_id", "date", "duration_minutes", "plan_id", "notes",
+    "exercise_id", "exercise_name", "set", "reps", "weight_kg"
+]
+
+def workout_csv_rows(workout: dict, names: Dict[str, str]) -> List[list]:
+    """One row per completed set; workouts and exercises without sets still get a row"""
+    base = [
+        workout.get("id"), workout.get("date"), workout.get("duration_minutes"),
+        workout.get("plan_id"), workout.get("notes")
+    ]
+    rows = []
+    for ex in workout.get("exercises", []):
+        if not isinstance(ex, dict):
+            continue
+        exercise_id = ex.get("exercise_id")
+        exercise = [exercise_id, names.get(exercise_id)]
+        sets = ex.get("sets_completed")
+        if isinstance(sets, int) and sets > 0:
+            rows.extend(base + exercise + [number, ex.get("reps_completed"), ex.get("weight_used")] for number in range(1, sets + 1))
+        else:
+            rows.append(base + exercise + [None, ex.get("reps_completed"), ex.get("weight_used")])
+    return rows or [base + [None] * 5]
+
+@api_router.get("/workouts/export")
+async def export_workouts(
+    user: dict = Depends(get_current_user),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    lang: str = Query("de", pattern="^(de|en)$")
+):
+    """Stream the user's complete history, oldest first, straight from a cursor"""
+    catalog = await get_catalog()
+    name_key = "name_de" if lang == "de" else "name"
+    names = {exercise_id: ex.get(name_key) for exercise_id, ex in catalog.by_id.items()}
+    cursor = db.workout_logs.find(
+        {"user_id": user["id"]}, {"_id": 0}
+    ).sort([("date", ASCENDING), ("id", ASCENDING)]).batch_size(WORKOUT_EXPORT_BATCH_SIZE)
+
+    async def ndjson():
+        chunk = []
+        async for workout in cursor:
+            for ex in workout.get("exercises", []):
+                if isinstance(ex, dict):
+                    ex["exercise_name"] = names.get(ex.get("exercise_id"))
+            chunk.append(dump_json(workout))
+            if len(chunk) >= WORKOUT_EXPORT_BATCH_SIZE:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+    async def csv_rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(WORKOUT_EXPORT_CSV_COLUMNS)
+        count = 0
+        async for workout in cursor:
+            writer.writerows(workout_csv_rows(workout, names))
+            count += 1
+            if count % WORKOUT_EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    filename = f"workouts-{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.{export_format}"
+    return StreamingResponse(
+        ndjson() if export_format == "ndjson" else csv_rows(),
+        media_type="application/x-ndjson" if export_format == "ndjson" else "text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# ============== DASHBOARD ==============
+
+DASHBOARD_SECTIONS = ("me", "stats", "workouts", "plans")
+
+@api_router.get("/dashboard")
+async def get_dashboard(
+    user: dict = Depends(get_current_user),
+    sections: Optional[str] = None,
+    workouts_limit: int = Query(10, ge=1, le=WORKOUT_PAGE_MAX_LIMIT)
+):
+    """Everything the home tab needs in one request; `sections` selects a comma-separated subset"""
+    requested = list(DASHBOARD_SECTIONS)
+    if sections:
+        requested = list(dict.fromkeys(name.strip() for name in sections.split(",") if name.strip()))
+        unknown = [name for name in requested if name not in DASHBOARD_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unbekannte Bereiche: {', '.join(unknown)}")
+    
+    # The user is authenticated once and shared by all sections
+    loaders = {
+        "me": lambda: get_me(user),
+        "stats": lambda: get_workout_stats(user),
+        "workouts": lambda: get_workouts(user, limit=workouts_limit, skip=0, cursor=None),
+        "plans": lambda: get_plans(user)
+    }
+    results = await asyncio.gather(*(loaders[name]() for name in requested))
+    return dict(zip(requested, results))
+
+# ============== ADMIN ==============
+
+@api_router.get("/admin/metrics")
+async def get_metrics():
+    return {
+        "password_hasher": password_hasher.stats(),
+        "llm": llm_gateway.stats(),
+        "plan_cache": plan_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "catalog_responses": catalog_responses.stats(),
+        "plan_templates": plan_templates.stats(),
+        "plan_prompt_context": plan_prompt_context.stats(),
+        "progress_backfill": progress_backfill.stats(),
+        "plan_jobs": plan_jobs.stats(),
+        "plan_hedger": plan_hedger.stats(),
+        "request_coalescing": request_coalescer.stats()
+    }
+
+@api_router.get("/admin/indexes")
+async def get_index_report():
+    """Index usage ($indexStats), missing indexes and query shapes that scan"""
+    collections = {}
+    for collection in INDEX_SPECS:
+        existing = await db[collection].index_information()
+        usage = await db[collection].aggregate([{"$indexStats": {}}]).to_list(None)
+        collections[collection] = {
+            "indexes": [
+                {
+                    "name": u["name"],
+                    "key": dict(u["key"]),
+                    "ops": u["accesses"]["ops"],
+                    "since": u["accesses"]["since"].isoformat()
+                }
+                for u in usage
+            ],
+            "missing": [spec["name"] for spec in _missing_indexes(collection, existing)]
+        }
+    return {"collections": collections, "uncovered_queries": await audit_query_plans()}
 
 # ============== SEED EXERCISES ==============
 
+SEED_EXERCISES = [
+    # STRENGTH - CHEST
+    {
+        "id": "bench-press",
+        "name": "Bench Press",
+        "name_de": "Bankdrücken",
+        "category": "strength",
+        "muscle_groups": ["Brust", "Trizeps", "Schultern"],
+        "equipment": "Langhantel, Flachbank",
+        "difficulty": "intermediate",
+        "description": "Classic chest exercise for building upper body strength",
+        "description_de": "Klassische Brustübung für den Aufbau von Oberkörperkraft",
+        "instructions": ["Lie on bench", "Grip bar slightly wider than shoulders", "Lower to chest", "Press up"],
+        "instructions_de": ["Auf Bank legen", "Stange etwas breiter als schulterbreit greifen", "Zur Brust absenken", "Nach oben drücken"],
+        "contraindications": ["shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 8
+    },
+    {
+        "id": "incline-bench-press",
+        "name": "Incline Bench Press",
+        "name_de": "Schrägbankdrücken",
+        "category": "strength",
+        "muscle_groups": ["Brust", "Schultern", "Trizeps"],
+        "equipment": "Langhantel, Schrägbank",
+        "difficulty": "intermediate",
+        "description": "Targets upper chest muscles",
+        "description_de": "Zielt auf die obere Brustmuskulatur",
+        "instructions": ["Set bench to 30-45 degrees", "Grip bar", "Lower to upper chest", "Press up"],
+        "instructions_de": ["Bank auf 30-45 Grad einstellen", "Stange greifen", "Zur oberen Brust absenken", "Nach oben drücken"],
+        "contraindications": ["shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 8
+    },
+    {
+        "id": "dumbbell-flyes",
+        "name": "Dumbbell Flyes",
+        "name_de": "Kurzhantel-Fliegende",
+        "category": "strength",
+        "muscle_groups": ["Brust"],
+        "equipment": "Kurzhanteln, Flachbank",
+        "difficulty": "intermediate",
+        "description": "Isolation exercise for chest",
+        "description_de": "Isolationsübung für die Brust",
+        "instructions": ["Lie on bench with dumbbells", "Arms slightly bent", "Lower to sides", "Squeeze back up"],
+        "instructions_de": ["Mit Kurzhanteln auf Bank legen", "Arme leicht gebeugt", "Zu den Seiten absenken", "Zusammendrücken"],
+        "contraindications": ["shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 6
+    },
+    {
+        "id": "cable-crossover",
+        "name": "Cable Crossover",
+        "name_de": "Kabelzug-Crossover",
+        "category": "strength",
+        "muscle_groups": ["Brust"],
+        "equipment": "Kabelzug",
+        "difficulty": "intermediate",
+        "description": "Cable exercise for chest definition",
+        "description_de": "Kabelübung für Brustdefinition",
+        "instructions": ["Stand between cables", "Grip handles", "Bring arms together in front", "Control return"],
+        "instructions_de": ["Zwischen Kabelzügen stehen", "Griffe fassen", "Arme vor dem Körper zusammenführen", "Kontrolliert zurück"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 5
+    },
+    
+    # STRENGTH - BACK
+    {
+        "id": "lat-pulldown",
+        "name": "Lat Pulldown",
+        "name_de": "Latzug",
+        "category": "strength",
+        "muscle_groups": ["Rücken", "Bizeps"],
+        "equipment": "Latzugmaschine",
+        "difficulty": "beginner",
+        "description": "Machine exercise for back width",
+        "description_de": "Maschinenübung für Rückenbreite",
+        "instructions": ["Sit at machine", "Grip bar wide", "Pull to chest", "Slowly release"],
+        "instructions_de": ["An Maschine setzen", "Stange breit greifen", "Zur Brust ziehen", "Langsam zurück"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 6
+    },
+    {
+        "id": "barbell-row",
+        "name": "Barbell Row",
+        "name_de": "Langhantel-Rudern",
+        "category": "strength",
+        "muscle_groups": ["Rücken", "Bizeps"],
+        "equipment": "Langhantel",
+        "difficulty": "intermediate",
+        "description": "Compound back exercise",
+        "description_de": "Komplexe Rückenübung",
+        "instructions": ["Bend at hips", "Grip bar", "Row to lower chest", "Lower controlled"],
+        "instructions_de": ["In der Hüfte beugen", "Stange greifen", "Zur unteren Brust rudern", "Kontrolliert absenken"],
+        "contraindications": ["back"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 7
+    },
+    {
+        "id": "seated-cable-row",
+        "name": "Seated Cable Row",
+        "name_de": "Sitzendes Kabelrudern",
+        "category": "strength",
+        "muscle_groups": ["Rücken", "Bizeps"],
+        "equipment": "Kabelzug",
+        "difficulty": "beginner",
+        "description": "Seated rowing exercise",
+        "description_de": "Sitzende Ruderübung",
+        "instructions": ["Sit at cable machine", "Grip handle", "Pull to abdomen", "Extend arms"],
+        "instructions_de": ["Am Kabelzug sitzen", "Griff fassen", "Zum Bauch ziehen", "Arme strecken"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 5
+    },
+    {
+        "id": "deadlift",
+        "name": "Deadlift",
+        "name_de": "Kreuzheben",
+        "category": "strength",
+        "muscle_groups": ["Rücken", "Beine", "Gesäß"],
+        "equipment": "Langhantel",
+        "difficulty": "advanced",
+        "description": "Full body compound lift",
+        "description_de": "Ganzkörper-Verbundübung",
+        "instructions": ["Stand with feet hip-width", "Grip bar", "Lift by extending hips and knees", "Lower controlled"],
+        "instructions_de": ["Füße hüftbreit", "Stange greifen", "Durch Hüft- und Kniestreckung heben", "Kontrolliert absenken"],
+        "contraindications": ["back", "knee"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 10
+    },
+    
+    # STRENGTH - SHOULDERS
+    {
+        "id": "overhead-press",
+        "name": "Overhead Press",
+        "name_de": "Schulterdrücken",
+        "category": "strength",
+        "muscle_groups": ["Schultern", "Trizeps"],
+        "equipment": "Langhantel",
+        "difficulty": "intermediate",
+        "description": "Standing shoulder press",
+        "description_de": "Stehendes Schulterdrücken",
+        "instructions": ["Stand with bar at shoulders", "Press overhead", "Lock out arms", "Lower to shoulders"],
+        "instructions_de": ["Mit Stange an Schultern stehen", "Über Kopf drücken", "Arme strecken", "Zu Schultern senken"],
+        "contraindications": ["shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 7
+    },
+    {
+        "id": "lateral-raises",
+        "name": "Lateral Raises",
+        "name_de": "Seitheben",
+        "category": "strength",
+        "muscle_groups": ["Schultern"],
+        "equipment": "Kurzhanteln",
+        "difficulty": "beginner",
+        "description": "Isolation exercise for side delts",
+        "description_de": "Isolationsübung für seitliche Schultern",
+        "instructions": ["Stand with dumbbells", "Raise to sides", "Stop at shoulder height", "Lower slowly"],
+        "instructions_de": ["Mit Kurzhanteln stehen", "Zu den Seiten heben", "Auf Schulterhöhe stoppen", "Langsam senken"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 4
+    },
+    {
+        "id": "face-pulls",
+        "name": "Face Pulls",
+        "name_de": "Face Pulls",
+        "category": "strength",
+        "muscle_groups": ["Schultern", "Rücken"],
+        "equipment": "Kabelzug",
+        "difficulty": "beginner",
+        "description": "Rear delt and rotator cuff exercise",
+        "description_de": "Übung für hintere Schulter und Rotatorenmanschette",
+        "instructions": ["Set cable at face height", "Pull rope to face", "Squeeze shoulder blades", "Return controlled"],
+        "instructions_de": ["Kabel auf Gesichtshöhe", "Seil zum Gesicht ziehen", "Schulterblätter zusammen", "Kontrolliert zurück"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 4
+    },
+    
+    # STRENGTH - ARMS
+    {
+        "id": "bicep-curls",
+        "name": "Bicep Curls",
+        "name_de": "Bizeps-Curls",
+        "category": "strength",
+        "muscle_groups": ["Bizeps"],
+        "equipment": "Kurzhanteln",
+        "difficulty": "beginner",
+        "description": "Basic bicep exercise",
+        "description_de": "Grundlegende Bizepsübung",
+        "instructions": ["Stand with dumbbells", "Curl up", "Squeeze at top", "Lower controlled"],
+        "instructions_de": ["Mit Kurzhanteln stehen", "Nach oben curlen", "Oben anspannen", "Kontrolliert senken"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 4
+    },
+    {
+        "id": "tricep-pushdown",
+        "name": "Tricep Pushdown",
+        "name_de": "Trizeps-Pushdown",
+        "category": "strength",
+        "muscle_groups": ["Trizeps"],
+        "equipment": "Kabelzug",
+        "difficulty": "beginner",
+        "description": "Cable exercise for triceps",
+        "description_de": "Kabelübung für Trizeps",
+        "instructions": ["Stand at cable", "Grip bar or rope", "Push down", "Extend fully"],
+        "instructions_de": ["Am Kabel stehen", "Stange oder Seil greifen", "Nach unten drücken", "Vollständig strecken"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 4
+    },
+    {
+        "id": "hammer-curls",
+        "name": "Hammer Curls",
+        "name_de": "Hammer-Curls",
+        "category": "strength",
+        "muscle_groups": ["Bizeps", "Unterarme"],
+        "equipment": "Kurzhanteln",
+        "difficulty": "beginner",
+        "description": "Neutral grip bicep curl",
+        "description_de": "Bizeps-Curl mit neutralem Griff",
+        "instructions": ["Hold dumbbells with neutral grip", "Curl up", "Keep wrists straight", "Lower controlled"],
+        "instructions_de": ["Kurzhanteln mit neutralem Griff halten", "Nach oben curlen", "Handgelenke gerade", "Kontrolliert senken"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 4
+    },
+    
+    # STRENGTH - LEGS
+    {
+        "id": "squats",
+        "name": "Barbell Squats",
+        "name_de": "Kniebeugen",
+        "category": "strength",
+        "muscle_groups": ["Beine", "Gesäß"],
+        "equipment": "Langhantel, Squat-Rack",
+        "difficulty": "intermediate",
+        "description": "King of leg exercises",
+        "description_de": "König der Beinübungen",
+        "instructions": ["Bar on upper back", "Feet shoulder-width", "Squat down", "Push through heels"],
+        "instructions_de": ["Stange auf oberem Rücken", "Füße schulterbreit", "In die Hocke gehen", "Durch die Fersen drücken"],
+        "contraindications": ["knee", "back"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 9
+    },
+    {
+        "id": "leg-press",
+        "name": "Leg Press",
+        "name_de": "Beinpresse",
+        "category": "strength",
+        "muscle_groups": ["Beine", "Gesäß"],
+        "equipment": "Beinpresse",
+        "difficulty": "beginner",
+        "description": "Machine leg exercise",
+        "description_de": "Maschinelle Beinübung",
+        "instructions": ["Sit in machine", "Feet on platform", "Lower weight", "Press up"],
+        "instructions_de": ["In Maschine setzen", "Füße auf Plattform", "Gewicht absenken", "Nach oben drücken"],
+        "contraindications": ["knee"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 7
+    },
+    {
+        "id": "leg-extension",
+        "name": "Leg Extension",
+        "name_de": "Beinstrecker",
+        "category": "strength",
+        "muscle_groups": ["Beine"],
+        "equipment": "Beinstrecker-Maschine",
+        "difficulty": "beginner",
+        "description": "Quadriceps isolation",
+        "description_de": "Quadrizeps-Isolation",
+        "instructions": ["Sit in machine", "Extend legs", "Squeeze quads", "Lower controlled"],
+        "instructions_de": ["In Maschine setzen", "Beine strecken", "Quadrizeps anspannen", "Kontrolliert senken"],
+        "contraindications": ["knee"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 5
+    },
+    {
+        "id": "leg-curl",
+        "name": "Leg Curl",
+        "name_de": "Beincurl",
+        "category": "strength",
+        "muscle_groups": ["Beine"],
+        "equipment": "Beincurl-Maschine",
+        "difficulty": "beginner",
+        "description": "Hamstring isolation",
+        "description_de": "Beinbeuger-Isolation",
+        "instructions": ["Lie on machine", "Curl heels to glutes", "Squeeze hamstrings", "Lower controlled"],
+        "instructions_de": ["Auf Maschine legen", "Fersen zum Gesäß curlen", "Beinbeuger anspannen", "Kontrolliert senken"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 5
+    },
+    {
+        "id": "lunges",
+        "name": "Lunges",
+        "name_de": "Ausfallschritte",
+        "category": "strength",
+        "muscle_groups": ["Beine", "Gesäß"],
+        "equipment": "Kurzhanteln (optional)",
+        "difficulty": "beginner",
+        "description": "Single leg exercise",
+        "description_de": "Einbeinige Übung",
+        "instructions": ["Step forward", "Lower back knee", "Push back up", "Alternate legs"],
+        "instructions_de": ["Nach vorne treten", "Hinteres Knie senken", "Zurück drücken", "Beine wechseln"],
+        "contraindications": ["knee"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 6
+    },
+    {
+        "id": "calf-raises",
+        "name": "Calf Raises",
+        "name_de": "Wadenheben",
+        "category": "strength",
+        "muscle_groups": ["Waden"],
+        "equipment": "Langhantel oder Maschine",
+        "difficulty": "beginner",
+        "description": "Calf exercise",
+        "description_de": "Wadenübung",
+        "instructions": ["Stand on edge", "Rise on toes", "Squeeze calves", "Lower controlled"],
+        "instructions_de": ["Auf Kante stehen", "Auf Zehenspitzen heben", "Waden anspannen", "Kontrolliert senken"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 4
+    },
+    
+    # STRENGTH - CORE
+    {
+        "id": "cable-crunches",
+        "name": "Cable Crunches",
+        "name_de": "Kabel-Crunches",
+        "category": "strength",
+        "muscle_groups": ["Bauch"],
+        "equipment": "Kabelzug",
+        "difficulty": "intermediate",
+        "description": "Weighted ab exercise",
+        "description_de": "Gewichtete Bauchübung",
+        "instructions": ["Kneel at cable", "Hold rope behind head", "Crunch down", "Return controlled"],
+        "instructions_de": ["Am Kabel knien", "Seil hinter Kopf halten", "Nach unten crunchen", "Kontrolliert zurück"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 5
+    },
+    
+    # BODYWEIGHT
+    {
+        "id": "pushups",
+        "name": "Push-Ups",
+        "name_de": "Liegestütze",
+        "category": "bodyweight",
+        "muscle_groups": ["Brust", "Trizeps", "Schultern"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Classic bodyweight exercise",
+        "description_de": "Klassische Körpergewichtsübung",
+        "instructions": ["Plank position", "Lower chest to floor", "Push up", "Keep core tight"],
+        "instructions_de": ["Plank-Position", "Brust zum Boden senken", "Nach oben drücken", "Rumpf anspannen"],
+        "contraindications": ["shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 7
+    },
+    {
+        "id": "pullups",
+        "name": "Pull-Ups",
+        "name_de": "Klimmzüge",
+        "category": "bodyweight",
+        "muscle_groups": ["Rücken", "Bizeps"],
+        "equipment": "Klimmzugstange",
+        "difficulty": "intermediate",
+        "description": "Upper body pulling exercise",
+        "description_de": "Oberkörper-Zugübung",
+        "instructions": ["Grip bar overhand", "Pull chin over bar", "Lower controlled", "Full extension"],
+        "instructions_de": ["Stange im Obergriff", "Kinn über Stange", "Kontrolliert senken", "Volle Streckung"],
+        "contraindications": ["shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 8
+    },
+    {
+        "id": "dips",
+        "name": "Dips",
+        "name_de": "Dips",
+        "category": "bodyweight",
+        "muscle_groups": ["Brust", "Trizeps", "Schultern"],
+        "equipment": "Dipstation",
+        "difficulty": "intermediate",
+        "description": "Tricep and chest exercise",
+        "description_de": "Trizeps- und Brustübung",
+        "instructions": ["Grip bars", "Lower body", "Elbows back", "Push up"],
+        "instructions_de": ["Stangen greifen", "Körper senken", "Ellbogen nach hinten", "Nach oben drücken"],
+        "contraindications": ["shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 7
+    },
+    {
+        "id": "plank",
+        "name": "Plank",
+        "name_de": "Plank",
+        "category": "bodyweight",
+        "muscle_groups": ["Bauch", "Rücken"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Core stability exercise",
+        "description_de": "Rumpfstabilitätsübung",
+        "instructions": ["Forearms on floor", "Body straight", "Hold position", "Breathe steadily"],
+        "instructions_de": ["Unterarme auf Boden", "Körper gerade", "Position halten", "Gleichmäßig atmen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 4
+    },
+    {
+        "id": "mountain-climbers",
+        "name": "Mountain Climbers",
+        "name_de": "Mountain Climbers",
+        "category": "bodyweight",
+        "muscle_groups": ["Bauch", "Beine", "Ganzkörper"],
+        "equipment": None,
+        "difficulty": "intermediate",
+        "description": "Cardio and core exercise",
+        "description_de": "Cardio- und Rumpfübung",
+        "instructions": ["Plank position", "Drive knees to chest", "Alternate quickly", "Keep hips low"],
+        "instructions_de": ["Plank-Position", "Knie zur Brust", "Schnell wechseln", "Hüfte tief halten"],
+        "contraindications": [],
+        "is_rehabilitation": False,
+        "calories_per_minute": 10
+    },
+    {
+        "id": "burpees",
+        "name": "Burpees",
+        "name_de": "Burpees",
+        "category": "bodyweight",
+        "muscle_groups": ["Ganzkörper"],
+        "equipment": None,
+        "difficulty": "intermediate",
+        "description": "Full body cardio exercise",
+        "description_de": "Ganzkörper-Cardio-Übung",
+        "instructions": ["Squat down", "Jump feet back", "Push-up", "Jump up"],
+        "instructions_de": ["In Hocke gehen", "Füße nach hinten springen", "Liegestütz", "Nach oben springen"],
+        "contraindications": ["knee", "back", "shoulder"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 12
+    },
+    {
+        "id": "bodyweight-squats",
+        "name": "Bodyweight Squats",
+        "name_de": "Kniebeugen ohne Gewicht",
+        "category": "bodyweight",
+        "muscle_groups": ["Beine", "Gesäß"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Basic squat movement",
+        "description_de": "Grundlegende Kniebeugebewegung",
+        "instructions": ["Feet shoulder-width", "Squat down", "Knees over toes", "Stand up"],
+        "instructions_de": ["Füße schulterbreit", "In die Hocke", "Knie über Zehen", "Aufstehen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 6
+    },
+    
+    # CARDIO
+    {
+        "id": "treadmill-run",
+        "name": "Treadmill Running",
+        "name_de": "Laufband",
+        "category": "cardio",
+        "muscle_groups": ["Beine", "Ganzkörper"],
+        "equipment": "Laufband",
+        "difficulty": "beginner",
+        "description": "Cardiovascular exercise",
+        "description_de": "Herz-Kreislauf-Training",
+        "instructions": ["Set speed", "Run at steady pace", "Maintain form", "Cool down"],
+        "instructions_de": ["Geschwindigkeit einstellen", "Gleichmäßig laufen", "Form beibehalten", "Abkühlen"],
+        "contraindications": ["knee", "ankle"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 11
+    },
+    {
+        "id": "cycling",
+        "name": "Stationary Cycling",
+        "name_de": "Fahrrad-Ergometer",
+        "category": "cardio",
+        "muscle_groups": ["Beine"],
+        "equipment": "Fahrrad-Ergometer",
+        "difficulty": "beginner",
+        "description": "Low-impact cardio",
+        "description_de": "Gelenkschonendes Cardio",
+        "instructions": ["Adjust seat height", "Pedal at steady pace", "Vary resistance", "Maintain posture"],
+        "instructions_de": ["Sitzhöhe anpassen", "Gleichmäßig treten", "Widerstand variieren", "Haltung bewahren"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 8
+    },
+    {
+        "id": "rowing-machine",
+        "name": "Rowing Machine",
+        "name_de": "Rudergerät",
+        "category": "cardio",
+        "muscle_groups": ["Rücken", "Beine", "Ganzkörper"],
+        "equipment": "Rudergerät",
+        "difficulty": "beginner",
+        "description": "Full body cardio",
+        "description_de": "Ganzkörper-Cardio",
+        "instructions": ["Sit on machine", "Push with legs", "Pull with arms", "Return controlled"],
+        "instructions_de": ["Auf Gerät setzen", "Mit Beinen drücken", "Mit Armen ziehen", "Kontrolliert zurück"],
+        "contraindications": ["back"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 9
+    },
+    {
+        "id": "elliptical",
+        "name": "Elliptical Trainer",
+        "name_de": "Crosstrainer",
+        "category": "cardio",
+        "muscle_groups": ["Beine", "Ganzkörper"],
+        "equipment": "Crosstrainer",
+        "difficulty": "beginner",
+        "description": "Low-impact full body cardio",
+        "description_de": "Gelenkschonendes Ganzkörper-Cardio",
+        "instructions": ["Step on machine", "Hold handles", "Move in elliptical motion", "Vary resistance"],
+        "instructions_de": ["Auf Gerät steigen", "Griffe halten", "Elliptische Bewegung", "Widerstand variieren"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 7
+    },
+    {
+        "id": "jumping-jacks",
+        "name": "Jumping Jacks",
+        "name_de": "Hampelmänner",
+        "category": "cardio",
+        "muscle_groups": ["Ganzkörper"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Classic cardio exercise",
+        "description_de": "Klassische Cardio-Übung",
+        "instructions": ["Stand straight", "Jump feet out", "Raise arms", "Return to start"],
+        "instructions_de": ["Gerade stehen", "Füße auseinander springen", "Arme heben", "Zurück zur Ausgangsposition"],
+        "contraindications": ["knee", "ankle"],
+        "is_rehabilitation": False,
+        "calories_per_minute": 8
+    },
+    
+    # FLEXIBILITY / STRETCHING
+    {
+        "id": "hamstring-stretch",
+        "name": "Hamstring Stretch",
+        "name_de": "Beinbeuger-Dehnung",
+        "category": "flexibility",
+        "muscle_groups": ["Beine"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Stretches back of legs",
+        "description_de": "Dehnt die Beinrückseite",
+        "instructions": ["Sit on floor", "Extend one leg", "Reach for toes", "Hold 30 seconds"],
+        "instructions_de": ["Auf Boden setzen", "Ein Bein strecken", "Zu Zehen greifen", "30 Sekunden halten"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "quad-stretch",
+        "name": "Quadriceps Stretch",
+        "name_de": "Quadrizeps-Dehnung",
+        "category": "flexibility",
+        "muscle_groups": ["Beine"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Stretches front of thigh",
+        "description_de": "Dehnt die Oberschenkelvorderseite",
+        "instructions": ["Stand on one leg", "Pull heel to glute", "Keep knees together", "Hold 30 seconds"],
+        "instructions_de": ["Auf einem Bein stehen", "Ferse zum Gesäß", "Knie zusammen", "30 Sekunden halten"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "hip-flexor-stretch",
+        "name": "Hip Flexor Stretch",
+        "name_de": "Hüftbeuger-Dehnung",
+        "category": "flexibility",
+        "muscle_groups": ["Beine", "Gesäß"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Opens hip flexors",
+        "description_de": "Öffnet die Hüftbeuger",
+        "instructions": ["Lunge position", "Back knee down", "Push hips forward", "Hold 30 seconds"],
+        "instructions_de": ["Ausfallschritt-Position", "Hinteres Knie unten", "Hüfte nach vorne", "30 Sekunden halten"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "chest-stretch",
+        "name": "Chest Stretch",
+        "name_de": "Brust-Dehnung",
+        "category": "flexibility",
+        "muscle_groups": ["Brust"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Opens chest and shoulders",
+        "description_de": "Öffnet Brust und Schultern",
+        "instructions": ["Stand in doorway", "Arms on frame", "Lean forward", "Hold 30 seconds"],
+        "instructions_de": ["Im Türrahmen stehen", "Arme am Rahmen", "Nach vorne lehnen", "30 Sekunden halten"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "shoulder-stretch",
+        "name": "Shoulder Stretch",
+        "name_de": "Schulter-Dehnung",
+        "category": "flexibility",
+        "muscle_groups": ["Schultern"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Stretches shoulder muscles",
+        "description_de": "Dehnt die Schultermuskulatur",
+        "instructions": ["Cross arm over chest", "Pull with other arm", "Keep shoulders down", "Hold 30 seconds"],
+        "instructions_de": ["Arm vor Brust kreuzen", "Mit anderem Arm ziehen", "Schultern unten", "30 Sekunden halten"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "cat-cow-stretch",
+        "name": "Cat-Cow Stretch",
+        "name_de": "Katze-Kuh-Dehnung",
+        "category": "flexibility",
+        "muscle_groups": ["Rücken"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Spinal mobility exercise",
+        "description_de": "Wirbelsäulen-Mobilisation",
+        "instructions": ["On all fours", "Arch back up (cat)", "Drop belly down (cow)", "Repeat slowly"],
+        "instructions_de": ["Auf allen Vieren", "Rücken nach oben wölben (Katze)", "Bauch nach unten (Kuh)", "Langsam wiederholen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "child-pose",
+        "name": "Child's Pose",
+        "name_de": "Kind-Position",
+        "category": "flexibility",
+        "muscle_groups": ["Rücken", "Schultern"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Relaxation and back stretch",
+        "description_de": "Entspannung und Rückendehnung",
+        "instructions": ["Kneel on floor", "Sit back on heels", "Reach arms forward", "Rest forehead on floor"],
+        "instructions_de": ["Auf Boden knien", "Auf Fersen setzen", "Arme nach vorne", "Stirn auf Boden"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "piriformis-stretch",
+        "name": "Piriformis Stretch",
+        "name_de": "Piriformis-Dehnung",
+        "category": "flexibility",
+        "muscle_groups": ["Gesäß"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Deep glute stretch",
+        "description_de": "Tiefe Gesäß-Dehnung",
+        "instructions": ["Lie on back", "Cross ankle over knee", "Pull thigh toward chest", "Hold 30 seconds"],
+        "instructions_de": ["Auf Rücken liegen", "Knöchel über Knie", "Oberschenkel zur Brust", "30 Sekunden halten"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    
+    # REHABILITATION
+    {
+        "id": "knee-circles",
+        "name": "Knee Circles",
+        "name_de": "Knie-Kreise",
+        "category": "rehabilitation",
+        "muscle_groups": ["Beine"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Gentle knee mobility",
+        "description_de": "Sanfte Knie-Mobilisation",
+        "instructions": ["Stand with feet together", "Hands on knees", "Circle knees slowly", "Both directions"],
+        "instructions_de": ["Füße zusammen stehen", "Hände auf Knie", "Knie langsam kreisen", "Beide Richtungen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "ankle-circles",
+        "name": "Ankle Circles",
+        "name_de": "Fußgelenk-Kreise",
+        "category": "rehabilitation",
+        "muscle_groups": ["Waden"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Ankle mobility exercise",
+        "description_de": "Fußgelenk-Mobilisation",
+        "instructions": ["Sit or stand on one leg", "Rotate ankle", "Full circles", "Both directions"],
+        "instructions_de": ["Sitzen oder auf einem Bein stehen", "Fußgelenk rotieren", "Volle Kreise", "Beide Richtungen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 1
+    },
+    {
+        "id": "wall-slides",
+        "name": "Wall Slides",
+        "name_de": "Wand-Gleiten",
+        "category": "rehabilitation",
+        "muscle_groups": ["Schultern", "Rücken"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Shoulder mobility and posture",
+        "description_de": "Schulter-Mobilität und Haltung",
+        "instructions": ["Back against wall", "Arms in W position", "Slide up to Y", "Lower back down"],
+        "instructions_de": ["Rücken an Wand", "Arme in W-Position", "Nach oben zu Y gleiten", "Wieder runter"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "glute-bridge",
+        "name": "Glute Bridge",
+        "name_de": "Glute Bridge",
+        "category": "rehabilitation",
+        "muscle_groups": ["Gesäß", "Rücken"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Hip and glute strengthening",
+        "description_de": "Hüft- und Gesäß-Kräftigung",
+        "instructions": ["Lie on back", "Feet flat, knees bent", "Lift hips up", "Squeeze glutes at top"],
+        "instructions_de": ["Auf Rücken liegen", "Füße flach, Knie gebeugt", "Hüfte heben", "Gesäß oben anspannen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 4
+    },
+    {
+        "id": "bird-dog",
+        "name": "Bird Dog",
+        "name_de": "Vogel-Hund",
+        "category": "rehabilitation",
+        "muscle_groups": ["Rücken", "Bauch"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Core stability exercise",
+        "description_de": "Rumpfstabilitätsübung",
+        "instructions": ["On all fours", "Extend opposite arm and leg", "Hold briefly", "Return and switch"],
+        "instructions_de": ["Auf allen Vieren", "Gegenüberliegenden Arm und Bein strecken", "Kurz halten", "Zurück und wechseln"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 3
+    },
+    {
+        "id": "dead-bug",
+        "name": "Dead Bug",
+        "name_de": "Toter Käfer",
+        "category": "rehabilitation",
+        "muscle_groups": ["Bauch", "Rücken"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Core stability without back strain",
+        "description_de": "Rumpfstabilität ohne Rückenbelastung",
+        "instructions": ["Lie on back", "Arms up, knees 90 degrees", "Lower opposite arm/leg", "Keep back flat"],
+        "instructions_de": ["Auf Rücken liegen", "Arme hoch, Knie 90 Grad", "Gegenüberliegenden Arm/Bein senken", "Rücken flach halten"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 3
+    },
+    {
+        "id": "clamshells",
+        "name": "Clamshells",
+        "name_de": "Muscheln",
+        "category": "rehabilitation",
+        "muscle_groups": ["Gesäß"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Hip abductor strengthening",
+        "description_de": "Hüftabduktoren-Kräftigung",
+        "instructions": ["Lie on side", "Knees bent, feet together", "Open top knee", "Keep feet together"],
+        "instructions_de": ["Auf Seite liegen", "Knie gebeugt, Füße zusammen", "Oberes Knie öffnen", "Füße zusammen lassen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 3
+    },
+    {
+        "id": "single-leg-balance",
+        "name": "Single Leg Balance",
+        "name_de": "Einbein-Stand",
+        "category": "rehabilitation",
+        "muscle_groups": ["Beine"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Balance and stability training",
+        "description_de": "Balance- und Stabilitätstraining",
+        "instructions": ["Stand on one foot", "Hold position", "Keep hips level", "Progress by closing eyes"],
+        "instructions_de": ["Auf einem Fuß stehen", "Position halten", "Hüfte gerade", "Fortschritt: Augen schließen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "seated-knee-extension",
+        "name": "Seated Knee Extension",
+        "name_de": "Sitzendes Kniestrecken",
+        "category": "rehabilitation",
+        "muscle_groups": ["Beine"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Gentle quad activation",
+        "description_de": "Sanfte Quadrizeps-Aktivierung",
+        "instructions": ["Sit on chair", "Straighten one leg", "Hold briefly", "Lower controlled"],
+        "instructions_de": ["Auf Stuhl sitzen", "Ein Bein strecken", "Kurz halten", "Kontrolliert senken"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    },
+    {
+        "id": "standing-hip-circles",
+        "name": "Standing Hip Circles",
+        "name_de": "Stehende Hüftkreise",
+        "category": "rehabilitation",
+        "muscle_groups": ["Gesäß", "Beine"],
+        "equipment": None,
+        "difficulty": "beginner",
+        "description": "Hip mobility exercise",
+        "description_de": "Hüft-Mobilitätsübung",
+        "instructions": ["Stand on one leg", "Circle other leg", "Small controlled circles", "Both directions"],
+        "instructions_de": ["Auf einem Bein stehen", "Anderes Bein kreisen", "Kleine kontrollierte Kreise", "Beide Richtungen"],
+        "contraindications": [],
+        "is_rehabilitation": True,
+        "calories_per_minute": 2
+    }
+]
+
 @api_router.post("/admin/seed-exercises")
 async def seed_exercises():
     """Seed the database with comprehensive exercise data"""
-    
-    exercises = [
-        # STRENGTH - CHEST
-        {
-            "id": "bench-press",
-            "name": "Bench Press",
-            "name_de": "Bankdrücken",
-            "category": "strength",
-            "muscle_groups": ["Brust", "Trizeps", "Schultern"],
-            "equipment": "Langhantel, Flachbank",
-            "difficulty": "intermediate",
-            "description": "Classic chest exercise for building upper body strength",
-            "description_de": "Klassische Brustübung für den Aufbau von Oberkörperkraft",
-            "instructions": ["Lie on bench", "Grip bar slightly wider than shoulders", "Lower to chest", "Press up"],
-            "instructions_de": ["Auf Bank legen", "Stange etwas breiter als schulterbreit greifen", "Zur Brust absenken", "Nach oben drücken"],
-            "contraindications": ["shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 8
-        },
-        {
-            "id": "incline-bench-press",
-            "name": "Incline Bench Press",
-            "name_de": "Schrägbankdrücken",
-            "category": "strength",
-            "muscle_groups": ["Brust", "Schultern", "Trizeps"],
-            "equipment": "Langhantel, Schrägbank",
-            "difficulty": "intermediate",
-            "description": "Targets upper chest muscles",
-            "description_de": "Zielt auf die obere Brustmuskulatur",
-            "instructions": ["Set bench to 30-45 degrees", "Grip bar", "Lower to upper chest", "Press up"],
-            "instructions_de": ["Bank auf 30-45 Grad einstellen", "Stange greifen", "Zur oberen Brust absenken", "Nach oben drücken"],
-            "contraindications": ["shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 8
-        },
-        {
-            "id": "dumbbell-flyes",
-            "name": "Dumbbell Flyes",
-            "name_de": "Kurzhantel-Fliegende",
-            "category": "strength",
-            "muscle_groups": ["Brust"],
-            "equipment": "Kurzhanteln, Flachbank",
-            "difficulty": "intermediate",
-            "description": "Isolation exercise for chest",
-            "description_de": "Isolationsübung für die Brust",
-            "instructions": ["Lie on bench with dumbbells", "Arms slightly bent", "Lower to sides", "Squeeze back up"],
-            "instructions_de": ["Mit Kurzhanteln auf Bank legen", "Arme leicht gebeugt", "Zu den Seiten absenken", "Zusammendrücken"],
-            "contraindications": ["shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 6
-        },
-        {
-            "id": "cable-crossover",
-            "name": "Cable Crossover",
-            "name_de": "Kabelzug-Crossover",
-            "category": "strength",
-            "muscle_groups": ["Brust"],
-            "equipment": "Kabelzug",
-            "difficulty": "intermediate",
-            "description": "Cable exercise for chest definition",
-            "description_de": "Kabelübung für Brustdefinition",
-            "instructions": ["Stand between cables", "Grip handles", "Bring arms together in front", "Control return"],
-            "instructions_de": ["Zwischen Kabelzügen stehen", "Griffe fassen", "Arme vor dem Körper zusammenführen", "Kontrolliert zurück"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 5
-        },
-        
-        # STRENGTH - BACK
-        {
-            "id": "lat-pulldown",
-            "name": "Lat Pulldown",
-            "name_de": "Latzug",
-            "category": "strength",
-            "muscle_groups": ["Rücken", "Bizeps"],
-            "equipment": "Latzugmaschine",
-            "difficulty": "beginner",
-            "description": "Machine exercise for back width",
-            "description_de": "Maschinenübung für Rückenbreite",
-            "instructions": ["Sit at machine", "Grip bar wide", "Pull to chest", "Slowly release"],
-            "instructions_de": ["An Maschine setzen", "Stange breit greifen", "Zur Brust ziehen", "Langsam zurück"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 6
-        },
-        {
-            "id": "barbell-row",
-            "name": "Barbell Row",
-            "name_de": "Langhantel-Rudern",
-            "category": "strength",
-            "muscle_groups": ["Rücken", "Bizeps"],
-            "equipment": "Langhantel",
-            "difficulty": "intermediate",
-            "description": "Compound back exercise",
-            "description_de": "Komplexe Rückenübung",
-            "instructions": ["Bend at hips", "Grip bar", "Row to lower chest", "Lower controlled"],
-            "instructions_de": ["In der Hüfte beugen", "Stange greifen", "Zur unteren Brust rudern", "Kontrolliert absenken"],
-            "contraindications": ["back"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 7
-        },
-        {
-            "id": "seated-cable-row",
-            "name": "Seated Cable Row",
-            "name_de": "Sitzendes Kabelrudern",
-            "category": "strength",
-            "muscle_groups": ["Rücken", "Bizeps"],
-            "equipment": "Kabelzug",
-            "difficulty": "beginner",
-            "description": "Seated rowing exercise",
-            "description_de": "Sitzende Ruderübung",
-            "instructions": ["Sit at cable machine", "Grip handle", "Pull to abdomen", "Extend arms"],
-            "instructions_de": ["Am Kabelzug sitzen", "Griff fassen", "Zum Bauch ziehen", "Arme strecken"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 5
-        },
-        {
-            "id": "deadlift",
-            "name": "Deadlift",
-            "name_de": "Kreuzheben",
-            "category": "strength",
-            "muscle_groups": ["Rücken", "Beine", "Gesäß"],
-            "equipment": "Langhantel",
-            "difficulty": "advanced",
-            "description": "Full body compound lift",
-            "description_de": "Ganzkörper-Verbundübung",
-            "instructions": ["Stand with feet hip-width", "Grip bar", "Lift by extending hips and knees", "Lower controlled"],
-            "instructions_de": ["Füße hüftbreit", "Stange greifen", "Durch Hüft- und Kniestreckung heben", "Kontrolliert absenken"],
-            "contraindications": ["back", "knee"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 10
-        },
-        
-        # STRENGTH - SHOULDERS
-        {
-            "id": "overhead-press",
-            "name": "Overhead Press",
-            "name_de": "Schulterdrücken",
-            "category": "strength",
-            "muscle_groups": ["Schultern", "Trizeps"],
-            "equipment": "Langhantel",
-            "difficulty": "intermediate",
-            "description": "Standing shoulder press",
-            "description_de": "Stehendes Schulterdrücken",
-            "instructions": ["Stand with bar at shoulders", "Press overhead", "Lock out arms", "Lower to shoulders"],
-            "instructions_de": ["Mit Stange an Schultern stehen", "Über Kopf drücken", "Arme strecken", "Zu Schultern senken"],
-            "contraindications": ["shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 7
-        },
-        {
-            "id": "lateral-raises",
-            "name": "Lateral Raises",
-            "name_de": "Seitheben",
-            "category": "strength",
-            "muscle_groups": ["Schultern"],
-            "equipment": "Kurzhanteln",
-            "difficulty": "beginner",
-            "description": "Isolation exercise for side delts",
-            "description_de": "Isolationsübung für seitliche Schultern",
-            "instructions": ["Stand with dumbbells", "Raise to sides", "Stop at shoulder height", "Lower slowly"],
-            "instructions_de": ["Mit Kurzhanteln stehen", "Zu den Seiten heben", "Auf Schulterhöhe stoppen", "Langsam senken"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 4
-        },
-        {
-            "id": "face-pulls",
-            "name": "Face Pulls",
-            "name_de": "Face Pulls",
-            "category": "strength",
-            "muscle_groups": ["Schultern", "Rücken"],
-            "equipment": "Kabelzug",
-            "difficulty": "beginner",
-            "description": "Rear delt and rotator cuff exercise",
-            "description_de": "Übung für hintere Schulter und Rotatorenmanschette",
-            "instructions": ["Set cable at face height", "Pull rope to face", "Squeeze shoulder blades", "Return controlled"],
-            "instructions_de": ["Kabel auf Gesichtshöhe", "Seil zum Gesicht ziehen", "Schulterblätter zusammen", "Kontrolliert zurück"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 4
-        },
-        
-        # STRENGTH - ARMS
-        {
-            "id": "bicep-curls",
-            "name": "Bicep Curls",
-            "name_de": "Bizeps-Curls",
-            "category": "strength",
-            "muscle_groups": ["Bizeps"],
-            "equipment": "Kurzhanteln",
-            "difficulty": "beginner",
-            "description": "Basic bicep exercise",
-            "description_de": "Grundlegende Bizepsübung",
-            "instructions": ["Stand with dumbbells", "Curl up", "Squeeze at top", "Lower controlled"],
-            "instructions_de": ["Mit Kurzhanteln stehen", "Nach oben curlen", "Oben anspannen", "Kontrolliert senken"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 4
-        },
-        {
-            "id": "tricep-pushdown",
-            "name": "Tricep Pushdown",
-            "name_de": "Trizeps-Pushdown",
-            "category": "strength",
-            "muscle_groups": ["Trizeps"],
-            "equipment": "Kabelzug",
-            "difficulty": "beginner",
-            "description": "Cable exercise for triceps",
-            "description_de": "Kabelübung für Trizeps",
-            "instructions": ["Stand at cable", "Grip bar or rope", "Push down", "Extend fully"],
-            "instructions_de": ["Am Kabel stehen", "Stange oder Seil greifen", "Nach unten drücken", "Vollständig strecken"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 4
-        },
-        {
-            "id": "hammer-curls",
-            "name": "Hammer Curls",
-            "name_de": "Hammer-Curls",
-            "category": "strength",
-            "muscle_groups": ["Bizeps", "Unterarme"],
-            "equipment": "Kurzhanteln",
-            "difficulty": "beginner",
-            "description": "Neutral grip bicep curl",
-            "description_de": "Bizeps-Curl mit neutralem Griff",
-            "instructions": ["Hold dumbbells with neutral grip", "Curl up", "Keep wrists straight", "Lower controlled"],
-            "instructions_de": ["Kurzhanteln mit neutralem Griff halten", "Nach oben curlen", "Handgelenke gerade", "Kontrolliert senken"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 4
-        },
-        
-        # STRENGTH - LEGS
-        {
-            "id": "squats",
-            "name": "Barbell Squats",
-            "name_de": "Kniebeugen",
-            "category": "strength",
-            "muscle_groups": ["Beine", "Gesäß"],
-            "equipment": "Langhantel, Squat-Rack",
-            "difficulty": "intermediate",
-            "description": "King of leg exercises",
-            "description_de": "König der Beinübungen",
-            "instructions": ["Bar on upper back", "Feet shoulder-width", "Squat down", "Push through heels"],
-            "instructions_de": ["Stange auf oberem Rücken", "Füße schulterbreit", "In die Hocke gehen", "Durch die Fersen drücken"],
-            "contraindications": ["knee", "back"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 9
-        },
-        {
-            "id": "leg-press",
-            "name": "Leg Press",
-            "name_de": "Beinpresse",
-            "category": "strength",
-            "muscle_groups": ["Beine", "Gesäß"],
-            "equipment": "Beinpresse",
-            "difficulty": "beginner",
-            "description": "Machine leg exercise",
-            "description_de": "Maschinelle Beinübung",
-            "instructions": ["Sit in machine", "Feet on platform", "Lower weight", "Press up"],
-            "instructions_de": ["In Maschine setzen", "Füße auf Plattform", "Gewicht absenken", "Nach oben drücken"],
-            "contraindications": ["knee"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 7
-        },
-        {
-            "id": "leg-extension",
-            "name": "Leg Extension",
-            "name_de": "Beinstrecker",
-            "category": "strength",
-            "muscle_groups": ["Beine"],
-            "equipment": "Beinstrecker-Maschine",
-            "difficulty": "beginner",
-            "description": "Quadriceps isolation",
-            "description_de": "Quadrizeps-Isolation",
-            "instructions": ["Sit in machine", "Extend legs", "Squeeze quads", "Lower controlled"],
-            "instructions_de": ["In Maschine setzen", "Beine strecken", "Quadrizeps anspannen", "Kontrolliert senken"],
-            "contraindications": ["knee"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 5
-        },
-        {
-            "id": "leg-curl",
-            "name": "Leg Curl",
-            "name_de": "Beincurl",
-            "category": "strength",
-            "muscle_groups": ["Beine"],
-            "equipment": "Beincurl-Maschine",
-            "difficulty": "beginner",
-            "description": "Hamstring isolation",
-            "description_de": "Beinbeuger-Isolation",
-            "instructions": ["Lie on machine", "Curl heels to glutes", "Squeeze hamstrings", "Lower controlled"],
-            "instructions_de": ["Auf Maschine legen", "Fersen zum Gesäß curlen", "Beinbeuger anspannen", "Kontrolliert senken"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 5
-        },
-        {
-            "id": "lunges",
-            "name": "Lunges",
-            "name_de": "Ausfallschritte",
-            "category": "strength",
-            "muscle_groups": ["Beine", "Gesäß"],
-            "equipment": "Kurzhanteln (optional)",
-            "difficulty": "beginner",
-            "description": "Single leg exercise",
-            "description_de": "Einbeinige Übung",
-            "instructions": ["Step forward", "Lower back knee", "Push back up", "Alternate legs"],
-            "instructions_de": ["Nach vorne treten", "Hinteres Knie senken", "Zurück drücken", "Beine wechseln"],
-            "contraindications": ["knee"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 6
-        },
-        {
-            "id": "calf-raises",
-            "name": "Calf Raises",
-            "name_de": "Wadenheben",
-            "category": "strength",
-            "muscle_groups": ["Waden"],
-            "equipment": "Langhantel oder Maschine",
-            "difficulty": "beginner",
-            "description": "Calf exercise",
-            "description_de": "Wadenübung",
-            "instructions": ["Stand on edge", "Rise on toes", "Squeeze calves", "Lower controlled"],
-            "instructions_de": ["Auf Kante stehen", "Auf Zehenspitzen heben", "Waden anspannen", "Kontrolliert senken"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 4
-        },
-        
-        # STRENGTH - CORE
-        {
-            "id": "cable-crunches",
-            "name": "Cable Crunches",
-            "name_de": "Kabel-Crunches",
-            "category": "strength",
-            "muscle_groups": ["Bauch"],
-            "equipment": "Kabelzug",
-            "difficulty": "intermediate",
-            "description": "Weighted ab exercise",
-            "description_de": "Gewichtete Bauchübung",
-            "instructions": ["Kneel at cable", "Hold rope behind head", "Crunch down", "Return controlled"],
-            "instructions_de": ["Am Kabel knien", "Seil hinter Kopf halten", "Nach unten crunchen", "Kontrolliert zurück"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 5
-        },
-        
-        # BODYWEIGHT
-        {
-            "id": "pushups",
-            "name": "Push-Ups",
-            "name_de": "Liegestütze",
-            "category": "bodyweight",
-            "muscle_groups": ["Brust", "Trizeps", "Schultern"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Classic bodyweight exercise",
-            "description_de": "Klassische Körpergewichtsübung",
-            "instructions": ["Plank position", "Lower chest to floor", "Push up", "Keep core tight"],
-            "instructions_de": ["Plank-Position", "Brust zum Boden senken", "Nach oben drücken", "Rumpf anspannen"],
-            "contraindications": ["shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 7
-        },
-        {
-            "id": "pullups",
-            "name": "Pull-Ups",
-            "name_de": "Klimmzüge",
-            "category": "bodyweight",
-            "muscle_groups": ["Rücken", "Bizeps"],
-            "equipment": "Klimmzugstange",
-            "difficulty": "intermediate",
-            "description": "Upper body pulling exercise",
-            "description_de": "Oberkörper-Zugübung",
-            "instructions": ["Grip bar overhand", "Pull chin over bar", "Lower controlled", "Full extension"],
-            "instructions_de": ["Stange im Obergriff", "Kinn über Stange", "Kontrolliert senken", "Volle Streckung"],
-            "contraindications": ["shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 8
-        },
-        {
-            "id": "dips",
-            "name": "Dips",
-            "name_de": "Dips",
-            "category": "bodyweight",
-            "muscle_groups": ["Brust", "Trizeps", "Schultern"],
-            "equipment": "Dipstation",
-            "difficulty": "intermediate",
-            "description": "Tricep and chest exercise",
-            "description_de": "Trizeps- und Brustübung",
-            "instructions": ["Grip bars", "Lower body", "Elbows back", "Push up"],
-            "instructions_de": ["Stangen greifen", "Körper senken", "Ellbogen nach hinten", "Nach oben drücken"],
-            "contraindications": ["shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 7
-        },
-        {
-            "id": "plank",
-            "name": "Plank",
-            "name_de": "Plank",
-            "category": "bodyweight",
-            "muscle_groups": ["Bauch", "Rücken"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Core stability exercise",
-            "description_de": "Rumpfstabilitätsübung",
-            "instructions": ["Forearms on floor", "Body straight", "Hold position", "Breathe steadily"],
-            "instructions_de": ["Unterarme auf Boden", "Körper gerade", "Position halten", "Gleichmäßig atmen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 4
-        },
-        {
-            "id": "mountain-climbers",
-            "name": "Mountain Climbers",
-            "name_de": "Mountain Climbers",
-            "category": "bodyweight",
-            "muscle_groups": ["Bauch", "Beine", "Ganzkörper"],
-            "equipment": None,
-            "difficulty": "intermediate",
-            "description": "Cardio and core exercise",
-            "description_de": "Cardio- und Rumpfübung",
-            "instructions": ["Plank position", "Drive knees to chest", "Alternate quickly", "Keep hips low"],
-            "instructions_de": ["Plank-Position", "Knie zur Brust", "Schnell wechseln", "Hüfte tief halten"],
-            "contraindications": [],
-            "is_rehabilitation": False,
-            "calories_per_minute": 10
-        },
-        {
-            "id": "burpees",
-            "name": "Burpees",
-            "name_de": "Burpees",
-            "category": "bodyweight",
-            "muscle_groups": ["Ganzkörper"],
-            "equipment": None,
-            "difficulty": "intermediate",
-            "description": "Full body cardio exercise",
-            "description_de": "Ganzkörper-Cardio-Übung",
-            "instructions": ["Squat down", "Jump feet back", "Push-up", "Jump up"],
-            "instructions_de": ["In Hocke gehen", "Füße nach hinten springen", "Liegestütz", "Nach oben springen"],
-            "contraindications": ["knee", "back", "shoulder"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 12
-        },
-        {
-            "id": "bodyweight-squats",
-            "name": "Bodyweight Squats",
-            "name_de": "Kniebeugen ohne Gewicht",
-            "category": "bodyweight",
-            "muscle_groups": ["Beine", "Gesäß"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Basic squat movement",
-            "description_de": "Grundlegende Kniebeugebewegung",
-            "instructions": ["Feet shoulder-width", "Squat down", "Knees over toes", "Stand up"],
-            "instructions_de": ["Füße schulterbreit", "In die Hocke", "Knie über Zehen", "Aufstehen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 6
-        },
-        
-        # CARDIO
-        {
-            "id": "treadmill-run",
-            "name": "Treadmill Running",
-            "name_de": "Laufband",
-            "category": "cardio",
-            "muscle_groups": ["Beine", "Ganzkörper"],
-            "equipment": "Laufband",
-            "difficulty": "beginner",
-            "description": "Cardiovascular exercise",
-            "description_de": "Herz-Kreislauf-Training",
-            "instructions": ["Set speed", "Run at steady pace", "Maintain form", "Cool down"],
-            "instructions_de": ["Geschwindigkeit einstellen", "Gleichmäßig laufen", "Form beibehalten", "Abkühlen"],
-            "contraindications": ["knee", "ankle"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 11
-        },
-        {
-            "id": "cycling",
-            "name": "Stationary Cycling",
-            "name_de": "Fahrrad-Ergometer",
-            "category": "cardio",
-            "muscle_groups": ["Beine"],
-            "equipment": "Fahrrad-Ergometer",
-            "difficulty": "beginner",
-            "description": "Low-impact cardio",
-            "description_de": "Gelenkschonendes Cardio",
-            "instructions": ["Adjust seat height", "Pedal at steady pace", "Vary resistance", "Maintain posture"],
-            "instructions_de": ["Sitzhöhe anpassen", "Gleichmäßig treten", "Widerstand variieren", "Haltung bewahren"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 8
-        },
-        {
-            "id": "rowing-machine",
-            "name": "Rowing Machine",
-            "name_de": "Rudergerät",
-            "category": "cardio",
-            "muscle_groups": ["Rücken", "Beine", "Ganzkörper"],
-            "equipment": "Rudergerät",
-            "difficulty": "beginner",
-            "description": "Full body cardio",
-            "description_de": "Ganzkörper-Cardio",
-            "instructions": ["Sit on machine", "Push with legs", "Pull with arms", "Return controlled"],
-            "instructions_de": ["Auf Gerät setzen", "Mit Beinen drücken", "Mit Armen ziehen", "Kontrolliert zurück"],
-            "contraindications": ["back"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 9
-        },
-        {
-            "id": "elliptical",
-            "name": "Elliptical Trainer",
-            "name_de": "Crosstrainer",
-            "category": "cardio",
-            "muscle_groups": ["Beine", "Ganzkörper"],
-            "equipment": "Crosstrainer",
-            "difficulty": "beginner",
-            "description": "Low-impact full body cardio",
-            "description_de": "Gelenkschonendes Ganzkörper-Cardio",
-            "instructions": ["Step on machine", "Hold handles", "Move in elliptical motion", "Vary resistance"],
-            "instructions_de": ["Auf Gerät steigen", "Griffe halten", "Elliptische Bewegung", "Widerstand variieren"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 7
-        },
-        {
-            "id": "jumping-jacks",
-            "name": "Jumping Jacks",
-            "name_de": "Hampelmänner",
-            "category": "cardio",
-            "muscle_groups": ["Ganzkörper"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Classic cardio exercise",
-            "description_de": "Klassische Cardio-Übung",
-            "instructions": ["Stand straight", "Jump feet out", "Raise arms", "Return to start"],
-            "instructions_de": ["Gerade stehen", "Füße auseinander springen", "Arme heben", "Zurück zur Ausgangsposition"],
-            "contraindications": ["knee", "ankle"],
-            "is_rehabilitation": False,
-            "calories_per_minute": 8
-        },
-        
-        # FLEXIBILITY / STRETCHING
-        {
-            "id": "hamstring-stretch",
-            "name": "Hamstring Stretch",
-            "name_de": "Beinbeuger-Dehnung",
-            "category": "flexibility",
-            "muscle_groups": ["Beine"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Stretches back of legs",
-            "description_de": "Dehnt die Beinrückseite",
-            "instructions": ["Sit on floor", "Extend one leg", "Reach for toes", "Hold 30 seconds"],
-            "instructions_de": ["Auf Boden setzen", "Ein Bein strecken", "Zu Zehen greifen", "30 Sekunden halten"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "quad-stretch",
-            "name": "Quadriceps Stretch",
-            "name_de": "Quadrizeps-Dehnung",
-            "category": "flexibility",
-            "muscle_groups": ["Beine"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Stretches front of thigh",
-            "description_de": "Dehnt die Oberschenkelvorderseite",
-            "instructions": ["Stand on one leg", "Pull heel to glute", "Keep knees together", "Hold 30 seconds"],
-            "instructions_de": ["Auf einem Bein stehen", "Ferse zum Gesäß", "Knie zusammen", "30 Sekunden halten"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "hip-flexor-stretch",
-            "name": "Hip Flexor Stretch",
-            "name_de": "Hüftbeuger-Dehnung",
-            "category": "flexibility",
-            "muscle_groups": ["Beine", "Gesäß"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Opens hip flexors",
-            "description_de": "Öffnet die Hüftbeuger",
-            "instructions": ["Lunge position", "Back knee down", "Push hips forward", "Hold 30 seconds"],
-            "instructions_de": ["Ausfallschritt-Position", "Hinteres Knie unten", "Hüfte nach vorne", "30 Sekunden halten"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "chest-stretch",
-            "name": "Chest Stretch",
-            "name_de": "Brust-Dehnung",
-            "category": "flexibility",
-            "muscle_groups": ["Brust"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Opens chest and shoulders",
-            "description_de": "Öffnet Brust und Schultern",
-            "instructions": ["Stand in doorway", "Arms on frame", "Lean forward", "Hold 30 seconds"],
-            "instructions_de": ["Im Türrahmen stehen", "Arme am Rahmen", "Nach vorne lehnen", "30 Sekunden halten"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "shoulder-stretch",
-            "name": "Shoulder Stretch",
-            "name_de": "Schulter-Dehnung",
-            "category": "flexibility",
-            "muscle_groups": ["Schultern"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Stretches shoulder muscles",
-            "description_de": "Dehnt die Schultermuskulatur",
-            "instructions": ["Cross arm over chest", "Pull with other arm", "Keep shoulders down", "Hold 30 seconds"],
-            "instructions_de": ["Arm vor Brust kreuzen", "Mit anderem Arm ziehen", "Schultern unten", "30 Sekunden halten"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "cat-cow-stretch",
-            "name": "Cat-Cow Stretch",
-            "name_de": "Katze-Kuh-Dehnung",
-            "category": "flexibility",
-            "muscle_groups": ["Rücken"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Spinal mobility exercise",
-            "description_de": "Wirbelsäulen-Mobilisation",
-            "instructions": ["On all fours", "Arch back up (cat)", "Drop belly down (cow)", "Repeat slowly"],
-            "instructions_de": ["Auf allen Vieren", "Rücken nach oben wölben (Katze)", "Bauch nach unten (Kuh)", "Langsam wiederholen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "child-pose",
-            "name": "Child's Pose",
-            "name_de": "Kind-Position",
-            "category": "flexibility",
-            "muscle_groups": ["Rücken", "Schultern"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Relaxation and back stretch",
-            "description_de": "Entspannung und Rückendehnung",
-            "instructions": ["Kneel on floor", "Sit back on heels", "Reach arms forward", "Rest forehead on floor"],
-            "instructions_de": ["Auf Boden knien", "Auf Fersen setzen", "Arme nach vorne", "Stirn auf Boden"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "piriformis-stretch",
-            "name": "Piriformis Stretch",
-            "name_de": "Piriformis-Dehnung",
-            "category": "flexibility",
-            "muscle_groups": ["Gesäß"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Deep glute stretch",
-            "description_de": "Tiefe Gesäß-Dehnung",
-            "instructions": ["Lie on back", "Cross ankle over knee", "Pull thigh toward chest", "Hold 30 seconds"],
-            "instructions_de": ["Auf Rücken liegen", "Knöchel über Knie", "Oberschenkel zur Brust", "30 Sekunden halten"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        
-        # REHABILITATION
-        {
-            "id": "knee-circles",
-            "name": "Knee Circles",
-            "name_de": "Knie-Kreise",
-            "category": "rehabilitation",
-            "muscle_groups": ["Beine"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Gentle knee mobility",
-            "description_de": "Sanfte Knie-Mobilisation",
-            "instructions": ["Stand with feet together", "Hands on knees", "Circle knees slowly", "Both directions"],
-            "instructions_de": ["Füße zusammen stehen", "Hände auf Knie", "Knie langsam kreisen", "Beide Richtungen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "ankle-circles",
-            "name": "Ankle Circles",
-            "name_de": "Fußgelenk-Kreise",
-            "category": "rehabilitation",
-            "muscle_groups": ["Waden"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Ankle mobility exercise",
-            "description_de": "Fußgelenk-Mobilisation",
-            "instructions": ["Sit or stand on one leg", "Rotate ankle", "Full circles", "Both directions"],
-            "instructions_de": ["Sitzen oder auf einem Bein stehen", "Fußgelenk rotieren", "Volle Kreise", "Beide Richtungen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 1
-        },
-        {
-            "id": "wall-slides",
-            "name": "Wall Slides",
-            "name_de": "Wand-Gleiten",
-            "category": "rehabilitation",
-            "muscle_groups": ["Schultern", "Rücken"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Shoulder mobility and posture",
-            "description_de": "Schulter-Mobilität und Haltung",
-            "instructions": ["Back against wall", "Arms in W position", "Slide up to Y", "Lower back down"],
-            "instructions_de": ["Rücken an Wand", "Arme in W-Position", "Nach oben zu Y gleiten", "Wieder runter"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "glute-bridge",
-            "name": "Glute Bridge",
-            "name_de": "Glute Bridge",
-            "category": "rehabilitation",
-            "muscle_groups": ["Gesäß", "Rücken"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Hip and glute strengthening",
-            "description_de": "Hüft- und Gesäß-Kräftigung",
-            "instructions": ["Lie on back", "Feet flat, knees bent", "Lift hips up", "Squeeze glutes at top"],
-            "instructions_de": ["Auf Rücken liegen", "Füße flach, Knie gebeugt", "Hüfte heben", "Gesäß oben anspannen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 4
-        },
-        {
-            "id": "bird-dog",
-            "name": "Bird Dog",
-            "name_de": "Vogel-Hund",
-            "category": "rehabilitation",
-            "muscle_groups": ["Rücken", "Bauch"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Core stability exercise",
-            "description_de": "Rumpfstabilitätsübung",
-            "instructions": ["On all fours", "Extend opposite arm and leg", "Hold briefly", "Return and switch"],
-            "instructions_de": ["Auf allen Vieren", "Gegenüberliegenden Arm und Bein strecken", "Kurz halten", "Zurück und wechseln"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 3
-        },
-        {
-            "id": "dead-bug",
-            "name": "Dead Bug",
-            "name_de": "Toter Käfer",
-            "category": "rehabilitation",
-            "muscle_groups": ["Bauch", "Rücken"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Core stability without back strain",
-            "description_de": "Rumpfstabilität ohne Rückenbelastung",
-            "instructions": ["Lie on back", "Arms up, knees 90 degrees", "Lower opposite arm/leg", "Keep back flat"],
-            "instructions_de": ["Auf Rücken liegen", "Arme hoch, Knie 90 Grad", "Gegenüberliegenden Arm/Bein senken", "Rücken flach halten"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 3
-        },
-        {
-            "id": "clamshells",
-            "name": "Clamshells",
-            "name_de": "Muscheln",
-            "category": "rehabilitation",
-            "muscle_groups": ["Gesäß"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Hip abductor strengthening",
-            "description_de": "Hüftabduktoren-Kräftigung",
-            "instructions": ["Lie on side", "Knees bent, feet together", "Open top knee", "Keep feet together"],
-            "instructions_de": ["Auf Seite liegen", "Knie gebeugt, Füße zusammen", "Oberes Knie öffnen", "Füße zusammen lassen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 3
-        },
-        {
-            "id": "single-leg-balance",
-            "name": "Single Leg Balance",
-            "name_de": "Einbein-Stand",
-            "category": "rehabilitation",
-            "muscle_groups": ["Beine"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Balance and stability training",
-            "description_de": "Balance- und Stabilitätstraining",
-            "instructions": ["Stand on one foot", "Hold position", "Keep hips level", "Progress by closing eyes"],
-            "instructions_de": ["Auf einem Fuß stehen", "Position halten", "Hüfte gerade", "Fortschritt: Augen schließen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "seated-knee-extension",
-            "name": "Seated Knee Extension",
-            "name_de": "Sitzendes Kniestrecken",
-            "category": "rehabilitation",
-            "muscle_groups": ["Beine"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Gentle quad activation",
-            "description_de": "Sanfte Quadrizeps-Aktivierung",
-            "instructions": ["Sit on chair", "Straighten one leg", "Hold briefly", "Lower controlled"],
-            "instructions_de": ["Auf Stuhl sitzen", "Ein Bein strecken", "Kurz halten", "Kontrolliert senken"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        },
-        {
-            "id": "standing-hip-circles",
-            "name": "Standing Hip Circles",
-            "name_de": "Stehende Hüftkreise",
-            "category": "rehabilitation",
-            "muscle_groups": ["Gesäß", "Beine"],
-            "equipment": None,
-            "difficulty": "beginner",
-            "description": "Hip mobility exercise",
-            "description_de": "Hüft-Mobilitätsübung",
-            "instructions": ["Stand on one leg", "Circle other leg", "Small controlled circles", "Both directions"],
-            "instructions_de": ["Auf einem Bein stehen", "Anderes Bein kreisen", "Kleine kontrollierte Kreise", "Beide Richtungen"],
-            "contraindications": [],
-            "is_rehabilitation": True,
-            "calories_per_minute": 2
-        }
-    ]
-    
+    exercises = [dict(ex) for ex in SEED_EXERCISES]  # insert_many adds _id in place
+
     # Clear existing and insert new
     await db.exercises.delete_many({})
     await db.exercises.insert_many(exercises)
     
+    # Other workers pick up the new stamp on their next poll
+    version = await exercise_catalog.bump_version()
+    await exercise_catalog.load()
+    await db.plan_cache.delete_many({"catalog_version": {"$ne": version}})
+    
     return {"message": f"{len(exercises)} Übungen erfolgreich eingefügt", "count": len(exercises)}
 
 # ============== HEALTH CHECK ==============
@@ -1576,6 +4161,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+cache_version_poller: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def load_caches():
+    global cache_version_poller
+    await bootstrap_indexes()
+    try:
+        await exercise_catalog.load()
+        await user_cache.refresh_if_stale()
+    except Exception as e:
+        logger.error(f"Caches could not be loaded at startup: {str(e)}")
+    cache_version_poller = asyncio.create_task(poll_cache_versions())
+    plan_jobs.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if cache_version_poller:
+        cache_version_poller.cancel()
+    await plan_jobs.stop()
+    await plan_hedger.stop()
+    password_hasher.shutdown()
+    if openai_client is not None:
+        await openai_client.close()
     client.close()
+
+# ============== MAINTENANCE CLI ==============
+
+async def _run_command(args):
+    if args.command == "rebuild-stats":
+        written = await rebuild_workout_stats(args.user_id)
+        logger.info(f"Rebuilt workout stats for {written} user(s)")
+    elif args.command == "rebuild-progress":
+        written = await rebuild_exercise_progress(args.user_id)
+        logger.info(f"Rebuilt {written} exercise progress entries")
+    elif args.command == "plan-table":
+        await _plan_table_command(args)
+
+async def _current_plan_table() -> dict:
+    await exercise_catalog.load()
+    await plan_templates.ready()
+    return {"catalog_version": exercise_catalog.version, "entries": plan_templates.export()}
+
+async def _plan_table_command(args):
+    if args.action == "dump":
+        dump = await _current_plan_table()
+        with open(args.output, "w", encoding="utf-8") if args.output else contextlib.nullcontext(sys.stdout) as out:
+            json.dump(dump, out, ensure_ascii=False, indent=1, sort_keys=True)
+            out.write("\n")
+        return
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    if args.new:
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+    else:
+        new = await _current_plan_table()
+    changed = 0
+    for label in sorted(set(old["entries"]) | set(new["entries"])):
+        before, after = old["entries"].get(label), new["entries"].get(label)
+        if before == after:
+            continue
+        changed += 1
+        removed = [ex for ex in before or [] if ex not in (after or [])]
+        added = [ex for ex in after or [] if ex not in (before or [])]
+        print(f"{label}: -{','.join(removed) or '(order)'} +{','.join(added) or '(order)'}")
+    logger.info(
+        f"Plan table diff catalog version {old['catalog_version']} -> {new['catalog_version']}: "
+        f"{changed} of {len(new['entries'])} entries changed"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FitGym maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild_stats = commands.add_parser("rebuild-stats", help="Recompute workout_stats from workout_logs")
+    rebuild_stats.add_argument("--user-id", help="Only rebuild this user")
+    rebuild_progress = commands.add_parser("rebuild-progress", help="Recreate exercise_progress from workout_logs")
+    rebuild_progress.add_argument("--user-id", help="Only rebuild this user")
+    plan_table = commands.add_parser("plan-table", help="Inspect the precomputed rule-based plan table")
+    plan_table_actions = plan_table.add_subparsers(dest="action", required=True)
+    plan_table_dump = plan_table_actions.add_parser("dump", help="Write the table for the current catalog as JSON")
+    plan_table_dump.add_argument("--output", help="File to write instead of stdout")
+    plan_table_diff = plan_table_actions.add_parser("diff", help="Compare two dumps, or a dump with the current catalog")
+    plan_table_diff.add_argument("old", help="Earlier dump")
+    plan_table_diff.add_argument("new", nargs="?", help="Later dump (default: current catalog)")
+    asyncio.run(_run_command(parser.parse_args()))
@@ -11,7 +11,7 @@ import {
 import { useRouter } from 'expo-router';
 import { useSafeAreaInsets } from 'react-native-safe-area-context';
 import { Ionicons } from '@expo/vector-icons';
-import { getExercises, getCategories, Exercise } from '../../utils/api';
+import { getExerciseList, getCategories, ExerciseListItem } from '../../utils/api';
 import { ExerciseCard } from '../../components/ExerciseCard';
 
 interface Category {
@@ -24,7 +24,7 @@ export default function Exercises() {
   const router = useRouter();
   const insets = useSafeAreaInsets();
   
-  const [exercises, setExercises] = useState<Exercise[]>([]);
+  const [exercises, setExercises] = useState<ExerciseListItem[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
   const [selectedCategory, setSelectedCategory] = useState<string | null>(null);
   const [searchQuery, setSearchQuery] = useState('');
@@ -34,7 +34,7 @@ export default function Exercises() {
   const loadData = useCallback(async () => {
     try {
       const [exercisesData, categoriesData] = await Promise.all([
-        getExercises(selectedCategory ? { category: selectedCategory } : undefined),
+        getExerciseList(selectedCategory ? { category: selectedCategory } : undefined),
         getCategories(),
       ]);
       setExercises(Array.isArray(exercisesData) ? exercisesData : []);
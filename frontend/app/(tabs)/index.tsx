@@ -11,7 +11,7 @@ import { useRouter } from 'expo-router';
 import { useSafeAreaInsets } from 'react-native-safe-area-context';
 import { Ionicons } from '@expo/vector-icons';
 import { useAuthStore } from '../../store/authStore';
-import { getWorkoutStats, getPlans, WorkoutStats, TrainingPlan } from '../../utils/api';
+import { getDashboard, WorkoutStats, TrainingPlan } from '../../utils/api';
 import { Button } from '../../components/Button';
 
 export default function Home() {
@@ -25,12 +25,9 @@ export default function Home() {
 
   const loadData = async () => {
     try {
-      const [statsData, plansData] = await Promise.all([
-        getWorkoutStats(),
-        getPlans(),
-      ]);
-      setStats(statsData);
-      setPlans(Array.isArray(plansData) ? plansData : []);
+      const dashboard = await getDashboard(['stats', 'plans']);
+      setStats(dashboard.stats ?? null);
+      setPlans(Array.isArray(dashboard.plans) ? dashboard.plans : []);
     } catch (error) {
       console.error('Error loading data:', error);
       setPlans([]);
@@ -9,7 +9,7 @@ import {
 import { useLocalSearchParams } from 'expo-router';
 import { useSafeAreaInsets } from 'react-native-safe-area-context';
 import { Ionicons } from '@expo/vector-icons';
-import { getExercise, Exercise } from '../../utils/api';
+import { getExercise, GermanExercise } from '../../utils/api';
 import { Header } from '../../components/Header';
 
 const categoryIcons: Record<string, keyof typeof Ionicons.glyphMap> = {
@@ -44,7 +44,7 @@ export default function ExerciseDetail() {
   const { id } = useLocalSearchParams<{ id: string }>();
   const insets = useSafeAreaInsets();
   
-  const [exercise, setExercise] = useState<Exercise | null>(null);
+  const [exercise, setExercise] = useState<GermanExercise | null>(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -12,7 +12,7 @@ import { useSafeAreaInsets } from 'react-native-safe-area-context';
 import { Ionicons } from '@expo/vector-icons';
 import { Header } from '../../components/Header';
 import { Button } from '../../components/Button';
-import { getPlan, getExercise, TrainingPlan, Exercise } from '../../utils/api';
+import { getPlanWithExercises, TrainingPlan, GermanExercise } from '../../utils/api';
 
 export default function PlanDetail() {
   const { id } = useLocalSearchParams<{ id: string }>();
@@ -20,23 +20,21 @@ export default function PlanDetail() {
   const insets = useSafeAreaInsets();
   
   const [plan, setPlan] = useState<TrainingPlan | null>(null);
-  const [exerciseDetails, setExerciseDetails] = useState<Record<string, Exercise>>({});
+  const [exerciseDetails, setExerciseDetails] = useState<Record<string, GermanExercise>>({});
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     const loadPlan = async () => {
       try {
-        const planData = await getPlan(id);
+        const planData = await getPlanWithExercises(id);
         setPlan(planData);
         
-        // Load exercise details
-        const details: Record<string, Exercise> = {};
+        // Exercise details come embedded in the plan
+        const details: Record<string, GermanExercise> = {};
         for (const ex of planData.exercises) {
-          try {
-            const exerciseData = await getExercise(ex.exercise_id);
-            details[ex.exercise_id] = exerciseData;
-          } catch {
-            // Exercise might not exist
+          // Exercise might not exist
+          if (ex.exercise) {
+            details[ex.exercise_id] = ex.exercise;
           }
         }
         setExerciseDetails(details);
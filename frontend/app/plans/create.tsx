@@ -15,7 +15,7 @@ import { Ionicons } from '@expo/vector-icons';
 import { Header } from '../../components/Header';
 import { Button } from '../../components/Button';
 import { ExerciseCard } from '../../components/ExerciseCard';
-import { getExercises, createPlan, Exercise, WorkoutExercise } from '../../utils/api';
+import { getExerciseList, createPlan, ExerciseListItem, WorkoutExercise } from '../../utils/api';
 
 export default function CreatePlan() {
   const router = useRouter();
@@ -28,14 +28,14 @@ export default function CreatePlan() {
   const [daysPerWeek, setDaysPerWeek] = useState(3);
   const [durationWeeks, setDurationWeeks] = useState(4);
   const [selectedExercises, setSelectedExercises] = useState<WorkoutExercise[]>([]);
-  const [availableExercises, setAvailableExercises] = useState<Exercise[]>([]);
+  const [availableExercises, setAvailableExercises] = useState<ExerciseListItem[]>([]);
   const [searchQuery, setSearchQuery] = useState('');
   const [saving, setSaving] = useState(false);
 
   useEffect(() => {
     const loadExercises = async () => {
       try {
-        const data = await getExercises();
+        const data = await getExerciseList();
         setAvailableExercises(Array.isArray(data) ? data : []);
       } catch (error) {
         console.error('Error loading exercises:', error);
@@ -57,7 +57,7 @@ export default function CreatePlan() {
     ex.name_de.toLowerCase().includes(searchQuery.toLowerCase())
   );
 
-  const addExercise = (exercise: Exercise) => {
+  const addExercise = (exercise: ExerciseListItem) => {
     if (selectedExercises.some((e) => e.exercise_id === exercise.id)) {
       return;
     }
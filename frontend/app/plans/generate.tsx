@@ -12,7 +12,7 @@ import { useSafeAreaInsets } from 'react-native-safe-area-context';
 import { Ionicons } from '@expo/vector-icons';
 import { Header } from '../../components/Header';
 import { Button } from '../../components/Button';
-import { generateAIPlan } from '../../utils/api';
+import { generateAIPlanJob } from '../../utils/api';
 import { useAuthStore } from '../../store/authStore';
 
 export default function GenerateAIPlan() {
@@ -72,7 +72,7 @@ export default function GenerateAIPlan() {
       const primaryGoal = goals[0];
       const additionalGoals = goals.slice(1);
       
-      const plan = await generateAIPlan({
+      const plan = await generateAIPlanJob({
         goal: primaryGoal,
         goals: goals, // Pass all goals
         days_per_week: daysPerWeek,
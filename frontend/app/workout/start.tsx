@@ -14,10 +14,9 @@ import { Ionicons } from '@expo/vector-icons';
 import { Header } from '../../components/Header';
 import { Button } from '../../components/Button';
 import {
-  getPlan,
-  getExercise,
+  getPlanWithExercises,
   logWorkout,
-  getExercises,
+  getExerciseList,
   TrainingPlan,
   Exercise,
 } from '../../utils/api';
@@ -49,22 +48,21 @@ export default function StartWorkout() {
     const loadWorkout = async () => {
       try {
         if (planId) {
-          const plan = await getPlan(planId);
+          const plan = await getPlanWithExercises(planId);
           const loadedExercises: ActiveExercise[] = [];
           
           for (const ex of plan.exercises) {
-            try {
-              const exerciseData = await getExercise(ex.exercise_id);
+            if (ex.exercise) {
               loadedExercises.push({
                 exercise_id: ex.exercise_id,
-                name: exerciseData.name_de,
+                name: ex.exercise.name_de,
                 sets: ex.sets,
                 reps: ex.reps,
                 rest_seconds: ex.rest_seconds,
                 completedSets: 0,
                 weight: ex.weight_kg,
               });
-            } catch {
+            } else {
               loadedExercises.push({
                 exercise_id: ex.exercise_id,
                 name: ex.exercise_id,
@@ -78,7 +76,7 @@ export default function StartWorkout() {
           setExercises(loadedExercises);
         } else {
           // Quick workout - load some default exercises
-          const allExercises = await getExercises({ category: 'bodyweight' });
+          const allExercises = await getExerciseList({ category: 'bodyweight' });
           const defaultExercises: ActiveExercise[] = allExercises.slice(0, 5).map((ex) => ({
             exercise_id: ex.id,
             name: ex.name_de,
@@ -1,10 +1,10 @@
 import React from 'react';
 import { View, Text, StyleSheet, TouchableOpacity } from 'react-native';
 import { Ionicons } from '@expo/vector-icons';
-import { Exercise } from '../utils/api';
+import { ExerciseListItem } from '../utils/api';
 
 interface ExerciseCardProps {
-  exercise: Exercise;
+  exercise: ExerciseListItem;
   onPress: () => void;
   selected?: boolean;
   showAddButton?: boolean;
@@ -25,6 +25,16 @@ export interface Exercise {
   calories_per_minute?: number;
 }
 
+// The app only displays German, so screens request lang=de and drop the English twins
+export type GermanExercise = Omit<Exercise, 'name' | 'description' | 'instructions'>;
+
+// What ExerciseCard renders; list screens request only these fields
+export const EXERCISE_LIST_FIELDS = ['name', 'category', 'difficulty', 'muscle_groups', 'is_rehabilitation'];
+export type ExerciseListItem = Pick<
+  Exercise,
+  'id' | 'name_de' | 'category' | 'difficulty' | 'muscle_groups' | 'is_rehabilitation'
+>;
+
 export interface WorkoutExercise {
   exercise_id: string;
   sets: number;
@@ -48,6 +58,14 @@ export interface TrainingPlan {
   created_at: string;
 }
 
+export interface HydratedWorkoutExercise extends WorkoutExercise {
+  exercise: GermanExercise | null;
+}
+
+export interface HydratedTrainingPlan extends Omit<TrainingPlan, 'exercises'> {
+  exercises: HydratedWorkoutExercise[];
+}
+
 export interface WorkoutLog {
   id: string;
   user_id: string;
@@ -68,19 +86,45 @@ export interface WorkoutStats {
   progress_data: { date: string; workouts: number; duration: number }[];
 }
 
+export interface Dashboard {
+  me?: any;
+  stats?: WorkoutStats;
+  workouts?: WorkoutLog[];
+  plans?: TrainingPlan[];
+}
+
+// Home tab data in one request; pass the sections the screen renders
+export const getDashboard = async (
+  sections?: ('me' | 'stats' | 'workouts' | 'plans')[]
+): Promise<Dashboard> => {
+  const response = await api.get('/dashboard', {
+    params: { sections: sections?.join(',') },
+  });
+  return response.data;
+};
+
 // Exercises
-export const getExercises = async (params?: {
+export interface ExerciseFilters {
   category?: string;
   muscle_group?: string;
   difficulty?: string;
   is_rehabilitation?: boolean;
-}): Promise<Exercise[]> => {
+}
+
+export const getExercises = async (params?: ExerciseFilters): Promise<Exercise[]> => {
   const response = await api.get('/exercises', { params });
   return response.data;
 };
 
-export const getExercise = async (id: string): Promise<Exercise> => {
-  const response = await api.get(`/exercises/${id}`);
+export const getExerciseList = async (params?: ExerciseFilters): Promise<ExerciseListItem[]> => {
+  const response = await api.get('/exercises', {
+    params: { ...params, fields: EXERCISE_LIST_FIELDS.join(','), lang: 'de' },
+  });
+  return response.data;
+};
+
+export const getExercise = async (id: string): Promise<GermanExercise> => {
+  const response = await api.get(`/exercises/${id}`, { params: { lang: 'de' } });
   return response.data;
 };
 
@@ -100,6 +144,14 @@ export const getPlan = async (id: string): Promise<TrainingPlan> => {
   return response.data;
 };
 
+// Plan with every exercise's catalog document embedded, in one request
+export const getPlanWithExercises = async (id: string): Promise<HydratedTrainingPlan> => {
+  const response = await api.get(`/plans/${id}`, {
+    params: { include_exercises: true, lang: 'de' },
+  });
+  return response.data;
+};
+
 export const createPlan = async (plan: Partial<TrainingPlan>): Promise<TrainingPlan> => {
   const response = await api.post('/plans', plan);
   return response.data;
@@ -114,23 +166,70 @@ export const deletePlan = async (id: string): Promise<void> => {
   await api.delete(`/plans/${id}`);
 };
 
-export const generateAIPlan = async (request: {
+export interface AIPlanRequest {
   goal: string;
   goals?: string[];
   days_per_week: number;
   duration_weeks: number;
   focus_areas?: string[];
-}): Promise<TrainingPlan> => {
+}
+
+export interface PlanJob {
+  id: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  plan_id: string;
+  attempts: number;
+  error?: string;
+  created_at: string;
+  finished_at?: string;
+  plan?: TrainingPlan;
+}
+
+export const generateAIPlan = async (request: AIPlanRequest): Promise<TrainingPlan> => {
   const response = await api.post('/plans/generate', request);
   return response.data;
 };
 
+export const startPlanJob = async (request: AIPlanRequest): Promise<PlanJob> => {
+  const response = await api.post('/plans/generate', request, { params: { mode: 'job' } });
+  return response.data;
+};
+
+// Long-polls for up to `wait` seconds; stays below the client timeout
+export const getPlanJob = async (id: string, wait: number = 20): Promise<PlanJob> => {
+  const response = await api.get(`/plans/jobs/${id}`, { params: { wait } });
+  return response.data;
+};
+
+// Queues the generation and waits for it, so slow LLM answers don't hit the request timeout
+export const generateAIPlanJob = async (request: AIPlanRequest): Promise<TrainingPlan> => {
+  let job = await startPlanJob(request);
+  while (job.status === 'queued' || job.status === 'running') {
+    job = await getPlanJob(job.id);
+  }
+  if (job.status !== 'done' || !job.plan) {
+    throw new Error(job.error || 'Plan-Generierung fehlgeschlagen');
+  }
+  return job.plan;
+};
+
 // Workout Logs
 export const getWorkouts = async (limit?: number, skip?: number): Promise<WorkoutLog[]> => {
   const response = await api.get('/workouts', { params: { limit, skip } });
   return response.data;
 };
 
+export interface WorkoutPage {
+  items: WorkoutLog[];
+  next_cursor: string | null;
+}
+
+// Cursor paging: pass '' for the first page, then the returned next_cursor
+export const getWorkoutsPage = async (cursor: string = '', limit?: number): Promise<WorkoutPage> => {
+  const response = await api.get('/workouts', { params: { cursor, limit } });
+  return response.data;
+};
+
 export const logWorkout = async (workout: Partial<WorkoutLog>): Promise<WorkoutLog> => {
   const response = await api.post('/workouts', workout);
   return response.data;
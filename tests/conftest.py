@@ -0,0 +1,41 @@
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# server.py reads MONGO_URL at import time; the client only connects on first use
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    """server.db backed by mongomock; tests using it are skipped without mongomock-motor"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import server
+    database = mongomock_motor.AsyncMongoMockClient()["fitgym_test"]
+    monkeypatch.setattr(server, "db", database)
+    return database
+
+
+@pytest.fixture
+def seed_catalog(monkeypatch):
+    """get_catalog() answers with the seed exercises, without a database"""
+    import server
+    exercises = [dict(ex) for ex in server.SEED_EXERCISES]
+    catalog = SimpleNamespace(
+        version=1,
+        exercises=exercises,
+        by_id={ex["id"]: ex for ex in exercises},
+        positions={ex["id"]: i for i, ex in enumerate(exercises)},
+        arrays=server.ExerciseArrays(exercises),
+    )
+
+    async def get_catalog():
+        return catalog
+
+    monkeypatch.setattr(server, "get_catalog", get_catalog)
+    monkeypatch.setattr(server.plan_templates, "state", None)
+    return catalog
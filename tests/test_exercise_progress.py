@@ -0,0 +1,58 @@
+import asyncio
+
+import server
+
+
+def workout(workout_id, user_id, date, *exercise_ids):
+    return {
+        "id": workout_id,
+        "user_id": user_id,
+        "date": date,
+        "exercises": [{"exercise_id": ex, "weight_used": 50, "sets_completed": 3} for ex in exercise_ids],
+    }
+
+
+def test_progress_entries_are_written_once_when_a_rebuild_races_a_live_insert(mock_db):
+    async def scenario():
+        old = workout("w1", "u1", "2026-01-01", "squats", "plank")
+        new = workout("w2", "u1", "2026-01-02", "squats")
+        await mock_db.workout_logs.insert_many([dict(old), dict(new)])
+        # The live insert for w2 lands before and after the rebuild's scan
+        await server.insert_progress_entries(server.exercise_progress_entries(new))
+        await server.rebuild_exercise_progress("u1")
+        await server.insert_progress_entries(server.exercise_progress_entries(new))
+        return await mock_db.exercise_progress.count_documents({"user_id": "u1"})
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_progress_backfill_runs_once_per_user_without_blocking_others(mock_db, monkeypatch):
+    backfill = server.ProgressBackfill(10)
+    monkeypatch.setattr(server, "progress_backfill", backfill)
+    started = []
+
+    async def scenario():
+        slow_user_running = asyncio.Event()
+        release_slow_user = asyncio.Event()
+
+        async def rebuild(user_id):
+            started.append(user_id)
+            if user_id == "slow":
+                slow_user_running.set()
+                await release_slow_user.wait()
+            await backfill.mark({user_id})
+            return 0
+
+        monkeypatch.setattr(server, "rebuild_exercise_progress", rebuild)
+        slow = [asyncio.create_task(backfill.ensure("slow")) for _ in range(3)]
+        await slow_user_running.wait()
+        # Another user's backfill finishes while the slow one is still running
+        await asyncio.wait_for(backfill.ensure("fast"), timeout=1)
+        assert not any(task.done() for task in slow)
+        release_slow_user.set()
+        await asyncio.gather(*slow)
+        await backfill.ensure("slow")
+
+    asyncio.run(scenario())
+    assert sorted(started) == ["fast", "slow"]
+    assert backfill.backfilled == 2
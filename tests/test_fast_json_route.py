@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+
+import server
+
+
+def make_client():
+    def tag_response(response: Response):
+        response.headers["X-Dependency"] = "yes"
+
+    router = APIRouter(route_class=server.FastJSONRoute)
+
+    @router.post("/created", status_code=201)
+    async def created():
+        return {"ok": True}
+
+    @router.get("/cookie")
+    async def cookie(response: Response):
+        response.set_cookie("session", "abc")
+        response.status_code = 202
+        return {"ok": True}
+
+    @router.get("/dependency", dependencies=[Depends(tag_response)])
+    async def dependency():
+        return [1, 2]
+
+    app = FastAPI(default_response_class=server.FastJSONResponse)
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_fast_route_keeps_the_route_status_code():
+    response = make_client().post("/created")
+    assert response.status_code == 201
+    assert response.json() == {"ok": True}
+
+
+def test_fast_route_merges_an_injected_response():
+    response = make_client().get("/cookie")
+    assert response.status_code == 202
+    assert response.cookies["session"] == "abc"
+    assert response.json() == {"ok": True}
+
+
+def test_fast_route_merges_headers_set_by_dependencies():
+    response = make_client().get("/dependency")
+    assert response.status_code == 200
+    assert response.headers["x-dependency"] == "yes"
+    assert response.json() == [1, 2]
@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+
+def completion(content):
+    async def complete(**kwargs):
+        return content
+    return complete
+
+
+def test_validate_llm_plan_keeps_usable_exercises(seed_catalog):
+    plan = server.validate_llm_plan({
+        "name": "Plan",
+        "description": 42,
+        "exercises": [
+            {"exercise_id": "squats", "sets": 3, "reps": 10},
+            {"exercise_id": "no-such-exercise", "sets": 3},
+            {"exercise_id": "plank", "sets": "many"},
+            "plank",
+        ],
+    }, seed_catalog)
+    assert plan["name"] == "Plan"
+    assert "description" not in plan
+    assert [ex["exercise_id"] for ex in plan["exercises"]] == ["squats"]
+
+
+@pytest.mark.parametrize("plan_data", [
+    "Plan",
+    ["squats"],
+    {"name": "Plan"},
+    {"exercises": []},
+    {"exercises": [{"exercise_id": "no-such-exercise"}]},
+])
+def test_validate_llm_plan_rejects_unusable_plans(seed_catalog, plan_data):
+    with pytest.raises(ValueError):
+        server.validate_llm_plan(plan_data, seed_catalog)
+
+
+@pytest.mark.parametrize("content", [
+    '"Hier ist dein Plan"',
+    '{"name": "Plan", "exercises": []}',
+    '{"name": "Plan", "exercises": [{"exercise_id": "no-such-exercise", "sets": 3}]}',
+])
+def test_unusable_llm_plan_falls_back_and_is_not_cached(mock_db, seed_catalog, monkeypatch, content):
+    monkeypatch.setattr(server.llm_gateway, "complete", completion(content))
+    monkeypatch.setattr(server.plan_cache, "memory", server.LRUCache(16))
+    request = server.AITrainingPlanRequest(goal="mobility")
+
+    async def run():
+        sync_plan = await server.create_ai_plan(request, "user-1", {}, {})
+        hedged_plan = await server.plan_hedger.create(request, "user-1", {}, {})
+        return sync_plan, hedged_plan, await mock_db.plan_cache.count_documents({})
+
+    sync_plan, hedged_plan, cached = asyncio.run(run())
+    expected = asyncio.run(server.generate_smart_plan(request, {}, {}))
+    assert sync_plan["exercises"] == expected["exercises"]
+    assert hedged_plan["exercises"] == expected["exercises"]
+    assert not hedged_plan["is_ai_generated"]
+    assert cached == 0
+    assert len(server.plan_cache.memory._data) == 0
+
+
+def test_valid_llm_plan_is_stored_and_cached(mock_db, seed_catalog, monkeypatch):
+    content = json.dumps({"name": "KI-Plan", "exercises": [{"exercise_id": "squats", "sets": 4, "reps": 8}]})
+    monkeypatch.setattr(server.llm_gateway, "complete", completion(content))
+    monkeypatch.setattr(server.plan_cache, "memory", server.LRUCache(16))
+    request = server.AITrainingPlanRequest(goal="muscle_gain")
+
+    plan = asyncio.run(server.create_ai_plan(request, "user-1", {}, {}))
+    assert plan["name"] == "KI-Plan"
+    assert plan["exercises"][0]["exercise_id"] == "squats"
+    assert plan["exercises"][0]["rest_seconds"] == 60
+
+
+def delayed_completion(content, seconds):
+    async def complete(**kwargs):
+        await asyncio.sleep(seconds)
+        return content
+    return complete
+
+
+LLM_PLAN = json.dumps({"name": "KI-Plan", "exercises": [{"exercise_id": "squats", "sets": 4, "reps": 8}]})
+
+
+@pytest.mark.parametrize("edit_before_upgrade", [False, True])
+def test_hedger_serves_rule_based_plan_and_upgrades_it_later(mock_db, seed_catalog, monkeypatch, edit_before_upgrade):
+    monkeypatch.setattr(server.llm_gateway, "complete", delayed_completion(LLM_PLAN, 0.2))
+    monkeypatch.setattr(server.plan_cache, "memory", server.LRUCache(16))
+    hedger = server.PlanHedger(0.05)
+    request = server.AITrainingPlanRequest(goal="muscle_gain")
+
+    async def run():
+        served = await hedger.create(request, "user-1", {}, {})
+        if edit_before_upgrade:
+            await mock_db.training_plans.update_one({"id": served["id"]}, {"$set": {"name": "Mein Plan"}})
+        await asyncio.gather(*hedger._upgrades)
+        return served, await mock_db.training_plans.find_one({"id": served["id"]}, {"_id": 0})
+
+    served, stored = asyncio.run(run())
+    assert not served["is_ai_generated"]
+    assert hedger.rule_based_served == 1
+    if edit_before_upgrade:
+        assert stored["name"] == "Mein Plan"
+        assert not stored["is_ai_generated"]
+        assert hedger.stats()["upgrade_skipped"] == 1
+    else:
+        assert stored["name"] == "KI-Plan"
+        assert stored["is_ai_generated"]
+        assert hedger.stats()["upgraded"] == 1
+    assert hedger.stats()["pending_upgrades"] == 0
+
+
+def test_hedger_returns_llm_plan_answered_in_time(mock_db, seed_catalog, monkeypatch):
+    monkeypatch.setattr(server.llm_gateway, "complete", delayed_completion(LLM_PLAN, 0))
+    monkeypatch.setattr(server.plan_cache, "memory", server.LRUCache(16))
+    hedger = server.PlanHedger(5)
+
+    plan = asyncio.run(hedger.create(server.AITrainingPlanRequest(goal="muscle_gain"), "user-1", {}, {}))
+    assert plan["is_ai_generated"]
+    assert plan["name"] == "KI-Plan"
+    assert hedger.llm_in_time == 1
+    assert not hedger._upgrades
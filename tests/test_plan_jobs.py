@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+
+import server
+
+GENERATION_SECONDS = 0.6
+
+
+@pytest.fixture
+def job_queue(mock_db, monkeypatch):
+    """Two-worker queue with a 0.3 s lease and a generation that outlasts it"""
+    monkeypatch.setattr(server, "PLAN_JOB_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(server, "PLAN_JOB_POLL_SECONDS", 0.02)
+    runs = []
+
+    async def create_ai_plan(request, user_id, profile, anamnesis, plan_id=None):
+        run = {"start": time.monotonic(), "end": None, "completed": False}
+        runs.append(run)
+        try:
+            await asyncio.sleep(GENERATION_SECONDS)
+            await server.db.training_plans.insert_one({"id": plan_id, "user_id": user_id})
+            run["completed"] = True
+        finally:
+            run["end"] = time.monotonic()
+
+    monkeypatch.setattr(server, "create_ai_plan", create_ai_plan)
+    queue = server.PlanJobQueue(2)
+    queue.runs = runs
+    return queue
+
+
+def fail_lease_renewals(mock_db, monkeypatch, failures):
+    """Make the next `failures` lease renewals raise, like a Mongo failover"""
+    collection_type = type(mock_db.plan_jobs)
+    update_one = collection_type.update_one
+    remaining = [failures]
+
+    async def flaky_update_one(self, filter, update, *args, **kwargs):
+        if set(update.get("$set", {})) == {"lease_until"} and remaining[0] > 0:
+            remaining[0] -= 1
+            raise server.OperationFailure("not primary")
+        return await update_one(self, filter, update, *args, **kwargs)
+
+    monkeypatch.setattr(collection_type, "update_one", flaky_update_one)
+
+
+async def run_until_finished(queue, mock_db, timeout=10):
+    queue.start()
+    try:
+        job = await queue.enqueue(server.AITrainingPlanRequest(goal="mobility"), {"id": "user-1"})
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = await mock_db.plan_jobs.find_one({"id": job["id"]})
+            if job["status"] not in server.PLAN_JOB_ACTIVE:
+                return job
+            await asyncio.sleep(0.02)
+        raise AssertionError("plan job did not finish")
+    finally:
+        await queue.stop()
+
+
+def assert_runs_never_overlap(runs):
+    runs = sorted(runs, key=lambda run: run["start"])
+    for earlier, later in zip(runs, runs[1:]):
+        assert earlier["end"] <= later["start"]
+
+
+def test_transient_renewal_failure_keeps_the_lease(job_queue, mock_db, monkeypatch):
+    fail_lease_renewals(mock_db, monkeypatch, failures=1)
+    job = asyncio.run(run_until_finished(job_queue, mock_db))
+    assert job["status"] == "done"
+    assert len(job_queue.runs) == 1
+    assert job_queue.abandoned == 0
+
+
+def test_lost_lease_stops_generation_before_another_worker_reclaims(job_queue, mock_db, monkeypatch):
+    fail_lease_renewals(mock_db, monkeypatch, failures=2)
+    job = asyncio.run(run_until_finished(job_queue, mock_db))
+    assert job["status"] == "done"
+    assert job_queue.abandoned == 1
+    assert [run["completed"] for run in job_queue.runs] == [False, True]
+    assert_runs_never_overlap(job_queue.runs)
+
+
+def test_renewal_that_never_succeeds_gives_up_after_max_attempts(job_queue, mock_db, monkeypatch):
+    fail_lease_renewals(mock_db, monkeypatch, failures=10 ** 6)
+    job = asyncio.run(run_until_finished(job_queue, mock_db))
+    assert job["status"] == "failed"
+    assert len(job_queue.runs) == server.PLAN_JOB_MAX_ATTEMPTS
+    assert not any(run["completed"] for run in job_queue.runs)
+    assert_runs_never_overlap(job_queue.runs)
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = server.SingleFlight()
+    executions = []
+
+    async def call(key):
+        executions.append(key)
+        await asyncio.sleep(0.01)
+        return {"key": key}
+
+    async def scenario():
+        return await asyncio.gather(
+            *(flight.do(("endpoint", "a"), lambda: call("a")) for _ in range(5)),
+            flight.do(("endpoint", "b"), lambda: call("b")),
+        )
+
+    results = asyncio.run(scenario())
+    assert results == [{"key": "a"}] * 5 + [{"key": "b"}]
+    assert sorted(executions) == ["a", "b"]
+    assert flight.stats() == {
+        "in_flight": 0,
+        "endpoints": {"endpoint": {"calls": 6, "executions": 2, "coalesced": 4}},
+    }
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = server.SingleFlight()
+    release = None
+
+    async def call():
+        await release.wait()
+        return "done"
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        leaving = asyncio.create_task(flight.do(("endpoint",), call))
+        staying = asyncio.create_task(flight.do(("endpoint",), call))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leaving, await staying
+
+    leaving, result = asyncio.run(scenario())
+    assert leaving.cancelled()
+    assert result == "done"
+
+
+def test_errors_reach_every_caller_and_are_not_remembered():
+    flight = server.SingleFlight()
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    async def scenario():
+        results = await asyncio.gather(
+            flight.do(("endpoint",), call), flight.do(("endpoint",), call), return_exceptions=True
+        )
+        with pytest.raises(ValueError):
+            await flight.do(("endpoint",), call)
+        return results
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert len(attempts) == 2
@@ -0,0 +1,186 @@
+"""The vectorized rule-based generator must pick exactly what the original loop picked"""
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+CATEGORIES = ["strength", "bodyweight", "cardio", "flexibility", "rehabilitation", "balance"]
+DIFFICULTIES = ["beginner", "intermediate", "advanced", None, "expert"]
+CONDITIONS = list(server.JOINT_PROBLEMS) + ["wrist"]
+GOALS = list(server.PLAN_GOALS) + ["general"]
+LEVELS = list(server.EXPERIENCE_LEVELS) + ["expert"]
+
+
+def baseline_smart_plan(exercises, request, profile, anamnesis):
+    """generate_smart_plan as it was before vectorization, frozen"""
+    joint_problems = anamnesis.get('joint_problems', [])
+    heart_conditions = anamnesis.get('heart_conditions', False)
+
+    safe_exercises = []
+    for ex in exercises:
+        contra = ex.get('contraindications', [])
+        has_contra = any(jp in contra for jp in joint_problems)
+        if heart_conditions and ex.get('category') == 'cardio' and ex.get('difficulty') == 'advanced':
+            continue
+        if not has_contra:
+            safe_exercises.append(ex)
+
+    experience_level = profile.get('experience_level', 'beginner')
+    difficulty_map = {
+        'beginner': ['beginner'],
+        'intermediate': ['beginner', 'intermediate'],
+        'advanced': ['beginner', 'intermediate', 'advanced']
+    }
+    allowed_difficulties = difficulty_map.get(experience_level, ['beginner', 'intermediate'])
+
+    all_goals = request.goals if request.goals else [request.goal]
+    all_goals = all_goals[:3]
+
+    goal_categories = {
+        'weight_loss': ['cardio', 'bodyweight', 'strength'],
+        'muscle_gain': ['strength', 'bodyweight'],
+        'mobility': ['flexibility', 'bodyweight', 'rehabilitation'],
+        'endurance': ['cardio', 'bodyweight'],
+        'rehabilitation': ['rehabilitation', 'flexibility', 'bodyweight']
+    }
+    combined_categories = []
+    for goal in all_goals:
+        for cat in goal_categories.get(goal, ['strength', 'bodyweight', 'cardio']):
+            if cat not in combined_categories:
+                combined_categories.append(cat)
+    if 'flexibility' not in combined_categories:
+        combined_categories.append('flexibility')
+
+    selected = []
+    if joint_problems:
+        for ex in safe_exercises:
+            if ex.get('is_rehabilitation') and ex.get('difficulty') in allowed_difficulties:
+                if len(selected) < 3:
+                    selected.append(ex)
+
+    max_exercises = 8 + (len(all_goals) - 1) * 2
+    exercises_per_category = max(2, max_exercises // len(combined_categories))
+    for category in combined_categories:
+        cat_count = 0
+        for ex in safe_exercises:
+            if (ex.get('category') == category and
+                    ex.get('difficulty') in allowed_difficulties and
+                    ex not in selected):
+                selected.append(ex)
+                cat_count += 1
+                if cat_count >= exercises_per_category or len(selected) >= max_exercises:
+                    break
+        if len(selected) >= max_exercises:
+            break
+
+    if len(selected) < 6:
+        for ex in safe_exercises:
+            if ex not in selected and ex.get('difficulty') in allowed_difficulties:
+                selected.append(ex)
+                if len(selected) >= 6:
+                    break
+
+    primary_goal = all_goals[0] if all_goals else 'general'
+    workout_exercises = []
+    for ex in selected:
+        if primary_goal == 'muscle_gain':
+            sets, reps = (4, 8) if experience_level != 'beginner' else (3, 10)
+            rest = 90
+        elif primary_goal == 'endurance':
+            sets, reps = (3, 15)
+            rest = 45
+        elif primary_goal == 'rehabilitation':
+            sets, reps = (2, 12)
+            rest = 60
+        elif primary_goal == 'weight_loss':
+            sets, reps = (3, 12)
+            rest = 30
+        else:
+            sets, reps = (3, 10)
+            rest = 60
+        workout_exercises.append({
+            "exercise_id": ex['id'],
+            "sets": sets,
+            "reps": reps,
+            "rest_seconds": rest,
+            "notes": "Achte auf korrekte Ausführung"
+        })
+
+    goal_names = {
+        'weight_loss': 'Fettverbrennung',
+        'muscle_gain': 'Muskelaufbau',
+        'mobility': 'Mobilität',
+        'endurance': 'Ausdauer',
+        'rehabilitation': 'Rehabilitation'
+    }
+    if len(all_goals) == 1:
+        plan_name = f"Personalisierter {goal_names.get(all_goals[0], 'Fitness')}-Plan"
+        description = f"Maßgeschneiderter Plan für {goal_names.get(all_goals[0], 'Fitness')} basierend auf deinem Profil und gesundheitlichen Einschränkungen."
+    else:
+        goal_labels = [goal_names.get(g, g) for g in all_goals]
+        plan_name = f"Kombinierter Plan: {' + '.join(goal_labels)}"
+        description = f"Maßgeschneiderter Kombinationsplan für {', '.join(goal_labels[:-1])} und {goal_labels[-1]} basierend auf deinem Profil."
+
+    return {"name": plan_name, "description": description, "exercises": workout_exercises}
+
+
+def random_catalog(rng):
+    exercises = []
+    for i in range(rng.randint(0, 60)):
+        exercise = {
+            "id": f"ex-{i}",
+            "category": rng.choice(CATEGORIES),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "is_rehabilitation": rng.random() < 0.25,
+        }
+        if rng.random() < 0.9:
+            exercise["contraindications"] = rng.sample(CONDITIONS, rng.randint(0, 2))
+        exercises.append(exercise)
+    return exercises
+
+
+def random_case(rng):
+    goals = rng.sample(GOALS, rng.randint(1, 4))
+    request = server.AITrainingPlanRequest(goal=goals[0], goals=goals if rng.random() < 0.7 else None)
+    profile = {"experience_level": rng.choice(LEVELS)} if rng.random() < 0.9 else {}
+    anamnesis = {
+        "joint_problems": rng.sample(CONDITIONS, rng.randint(0, 3)),
+        "heart_conditions": rng.random() < 0.3,
+    }
+    return request, profile, anamnesis
+
+
+def assert_matches_baseline(monkeypatch, seed, catalogs, cases_per_catalog, with_table):
+    rng = random.Random(seed)
+
+    async def run():
+        for _ in range(catalogs):
+            exercises = random_catalog(rng)
+            catalog = SimpleNamespace(exercises=exercises, arrays=server.ExerciseArrays(exercises))
+
+            async def get_catalog():
+                return catalog
+
+            monkeypatch.setattr(server, "get_catalog", get_catalog)
+            state = (catalog.arrays, server.build_plan_table(catalog.arrays), 0.0) if with_table else None
+            monkeypatch.setattr(server.plan_templates, "state", state)
+            for _ in range(cases_per_catalog):
+                request, profile, anamnesis = random_case(rng)
+                expected = baseline_smart_plan(exercises, request, profile, anamnesis)
+                assert await server.generate_smart_plan(request, profile, anamnesis) == expected, (request, profile, anamnesis)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_smart_plan_matches_baseline(monkeypatch, seed):
+    assert_matches_baseline(monkeypatch, seed, catalogs=25, cases_per_catalog=100, with_table=False)
+
+
+def test_smart_plan_table_matches_baseline(monkeypatch):
+    hits = server.plan_templates.hits
+    assert_matches_baseline(monkeypatch, 100, catalogs=3, cases_per_catalog=1000, with_table=True)
+    assert server.plan_templates.hits > hits
@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+SAMPLE_UPLOADS = [
+    '[]',
+    '  [ ]  ',
+    '[1, 2.5, -3e2, 40]',
+    '[{"date": "2026-01-01", "duration_minutes": 30, "exercises": []}, {"date": "2026-01-02", "notes": "a, b ] {"}]',
+    '[true, false, null, "text with \\" quote", [1, [2]], {"nested": {"x": [1, 2]}}]',
+    '\n[\n  {"date": "2026-01-03", "exercises": [{"exercise_id": "squats", "weight_used": 62.5}]},\n  12345\n]\n',
+]
+
+
+def parse_chunks(chunks, max_element_chars=1000):
+    parser = server.JSONArrayStreamParser(max_element_chars)
+    values = []
+    for i, chunk in enumerate(chunks):
+        values.extend(parser.feed(chunk, final=i == len(chunks) - 1))
+    return values
+
+
+@pytest.mark.parametrize("upload", SAMPLE_UPLOADS)
+def test_array_parser_every_split(upload):
+    expected = json.loads(upload)
+    for offset in range(len(upload) + 1):
+        assert parse_chunks([upload[:offset], upload[offset:]]) == expected, offset
+
+
+@pytest.mark.parametrize("upload", SAMPLE_UPLOADS)
+def test_array_parser_one_char_chunks(upload):
+    assert parse_chunks(list(upload) + [""]) == json.loads(upload)
+
+
+def test_array_parser_number_split_at_decimal_point():
+    assert parse_chunks(["[1,2.", "5]"]) == [1, 2.5]
+    assert parse_chunks(["[1,2", "e3]"]) == [1, 2000]
+
+
+@pytest.mark.parametrize("upload", ['{"a": 1}', '[1 2]', '[1,', '[{"a": 1}', '[1x]'])
+def test_array_parser_rejects_invalid_json(upload):
+    for offset in range(len(upload) + 1):
+        with pytest.raises(server.ImportFormatError):
+            parse_chunks([upload[:offset], upload[offset:]])
+
+
+def test_array_parser_keeps_elements_before_an_error():
+    parser = server.JSONArrayStreamParser(1000)
+    values = []
+    with pytest.raises(server.ImportFormatError):
+        for value in parser.feed('[{"a": 1}, {"b": 2}, oops]', final=True):
+            values.append(value)
+    assert values == [{"a": 1}, {"b": 2}]
+
+
+def test_array_parser_limits_element_size():
+    parser = server.JSONArrayStreamParser(10)
+    with pytest.raises(server.ImportFormatError):
+        list(parser.feed('[{"notes": "' + "x" * 50))
+
+
+class FakeUpload:
+    def __init__(self, body: bytes, chunk_size: int):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+
+def import_entries(body: bytes, chunk_size: int):
+    async def collect():
+        return [entry async for entry in server.iter_import_entries(FakeUpload(body, chunk_size), 1000)]
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_import_entries_ndjson_and_array_agree(chunk_size):
+    workouts = [{"date": f"2026-01-0{i}", "notes": "Kniebeugen ü", "duration_minutes": i} for i in range(1, 5)]
+    ndjson = "\n".join(json.dumps(w, ensure_ascii=False) for w in workouts).encode("utf-8")
+    array = json.dumps(workouts, ensure_ascii=False).encode("utf-8")
+    for body in (ndjson, array):
+        entries = import_entries(body, chunk_size)
+        assert [value for _, value, _ in entries] == workouts
+        assert [line for line, _, _ in entries] == [1, 2, 3, 4]
+
+
+def test_import_entries_ndjson_errors_stay_on_their_line():
+    entries = import_entries(b'{"a": 1}\nnot json\n\n{"b": 2}\n', 3)
+    assert [(line, value) for line, value, error in entries if error is None] == [(1, {"a": 1}), (4, {"b": 2})]
+    assert [line for line, _, error in entries if error is not None] == [2]
+
+
+def test_llm_plan_stream_parser_every_split():
+    plan = {
+        "name": "Plan",
+        "description": "Push [and] pull",
+        "exercises": [
+            {"exercise_id": "squats", "sets": 3, "reps": 10, "rest_seconds": 60, "notes": ""},
+            {"exercise_id": "plank", "sets": 3, "reps": None, "duration_seconds": 30},
+        ],
+    }
+    completion = "```json\n" + json.dumps(plan) + "\n```"
+    for offset in range(len(completion) + 1):
+        parser = server.LLMPlanStreamParser()
+        exercises = [*parser.feed(completion[:offset]), *parser.feed(completion[offset:])]
+        assert exercises == plan["exercises"], offset
+        assert parser.finish() == {"name": "Plan", "description": "Push [and] pull"}
+
+
+def test_llm_plan_stream_parser_truncated_completion():
+    parser = server.LLMPlanStreamParser()
+    list(parser.feed('{"name": "Plan", "exercises": [{"exercise_id": "squats"}, {"exer'))
+    with pytest.raises(ValueError):
+        parser.finish()
@@ -0,0 +1,30 @@
+import pytest
+from fastapi import HTTPException
+
+import server
+
+
+def test_cursor_round_trip():
+    cursor = server.encode_cursor(["2026-01-02", "abc"])
+    assert server.decode_cursor(cursor) == ["2026-01-02", "abc"]
+
+
+@pytest.mark.parametrize("values", [
+    {"date": "2026-01-02"},
+    ["2026-01-02"],
+    ["2026-01-02", "abc", "extra"],
+    [{"$gt": ""}, "abc"],
+    ["2026-01-02", 5],
+    [20260102, "abc"],
+])
+def test_cursor_rejects_anything_but_two_strings(values):
+    with pytest.raises(HTTPException) as e:
+        server.decode_cursor(server.encode_cursor(values))
+    assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm90IGpzb24"])
+def test_cursor_rejects_garbage(cursor):
+    with pytest.raises(HTTPException) as e:
+        server.decode_cursor(cursor)
+    assert e.value.status_code == 400